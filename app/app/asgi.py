@@ -9,8 +9,20 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
-application = get_asgi_application()
+# What get_asgi_application() does, with a handler that can also stream
+# async responses such as the recipe export (see core.asgi).
+django.setup(set_prefix=False)
+
+from core.asgi import ASGIHandler  # noqa: E402
+
+application = ASGIHandler()
+
+# Start the password hashing workers now, so the first logins do not wait
+# for them to start and set up Django.
+from user.hashing import start_workers  # noqa: E402
+
+start_workers()
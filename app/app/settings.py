@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -31,7 +32,7 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    'core.apps.LazyAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -46,11 +47,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.metrics_middleware',
+    'core.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.replica_routing_middleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -81,14 +85,84 @@ WSGI_APPLICATION = 'app.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # PostgreSQL with the lazy connection health checks of core.db.
+        'ENGINE': os.environ.get('DB_ENGINE', 'core.backends.postgresql'),
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'PORT': os.environ.get('DB_PORT', ''),
+        # Seconds to keep a connection open for later requests; 0 closes it
+        # at the end of each request.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        # Check a persistent connection still works when a request first
+        # uses it (see core.db; built into Django from 4.1), unless it was
+        # used within the last CONN_HEALTH_CHECK_IDLE seconds.
+        'CONN_HEALTH_CHECKS': (
+            os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1'
+        ),
+        'CONN_HEALTH_CHECK_IDLE': float(
+            os.environ.get('DB_CONN_HEALTH_CHECK_IDLE', 5)
+        ),
+        # Set when connecting through a transaction-pooling PgBouncer, which
+        # cannot keep server-side cursors open across transactions.
+        'DISABLE_SERVER_SIDE_CURSORS': (
+            os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', '0') == '1'
+        ),
     }
 }
 
+# Read replicas of the default database, as comma separated hosts. Safe
+# requests read from them unless the user wrote within the last
+# DB_REPLICA_PIN_SECONDS (see core.routers and core.middleware). The pins are
+# kept in the default cache, which must then be shared by every process.
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+    host for host in os.environ.get('DB_REPLICA_HOSTS', '').split(',')
+    if host.strip()
+):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Use a shared backend (e.g. memcached or Redis) when running more than one
+# process, since recipe data versions and cached responses live here. The
+# default LocMemCache is per process: set SINGLE_PROCESS=1 to declare that
+# only one process serves requests (e.g. runserver), or check recipe.W001.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+SINGLE_PROCESS = os.environ.get('SINGLE_PROCESS', '0') == '1'
+
+# Seconds a user's recipe data version is kept, bounding how long a version
+# bump lost by the cache can go unnoticed.
+RECIPE_DATA_VERSION_TIMEOUT = int(
+    os.environ.get('RECIPE_DATA_VERSION_TIMEOUT', 300)
+)
+
+# Seconds rendered recipe and tag responses stay cached; 0 disables it.
+RECIPE_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get('RECIPE_RESPONSE_CACHE_TIMEOUT', 300)
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -108,6 +182,12 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Worker processes that hash passwords for the async user views. Set to 0
+# to hash in a thread instead.
+PASSWORD_HASHING_WORKERS = int(
+    os.environ.get('PASSWORD_HASHING_WORKERS', os.cpu_count() or 1)
+)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -135,4 +215,72 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # The core classes use orjson when installed and fall back to the
+    # stdlib; use DRF's JSONRenderer/JSONParser to always use the stdlib.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# OpenAPI schema pre-rendered by core.schema. Documents are cached under
+# SCHEMA_VERSION (e.g. the deployed commit), or a fingerprint of the source
+# when unset, and saved in SCHEMA_CACHE_DIR; set it to an empty string to
+# keep them in memory only. Run "manage.py pregenerate_schema" at build or
+# release time so no request pays for generating it.
+SCHEMA_CACHE = {
+    'DIR': os.environ.get(
+        'SCHEMA_CACHE_DIR',
+        os.path.join(tempfile.gettempdir(), 'recipe-api-schema'),
+    ),
+    'VERSION': os.environ.get('SCHEMA_VERSION', ''),
+}
+
+# Token lookups cached by user.authentication.CachedTokenAuthentication.
+# Set TOKEN_AUTH_CACHE_ALIAS to a shared cache (e.g. Redis) when running
+# several processes so invalidations reach all of them.
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 60)),
+    'CACHE_ALIAS': os.environ.get('TOKEN_AUTH_CACHE_ALIAS'),
+}
+
+# Per-request timing by core.middleware.RequestTimingMiddleware, off unless
+# REQUEST_TIMING=1. A REQUEST_TIMING_SAMPLE_RATE fraction of requests gets
+# a Server-Timing header and a record on the core.timing logger.
+REQUEST_TIMING = {
+    'ENABLED': os.environ.get('REQUEST_TIMING', '0') == '1',
+    'SAMPLE_RATE': float(os.environ.get('REQUEST_TIMING_SAMPLE_RATE', 1)),
+}
+
+# Request latency histograms served at /api/metrics/ by core.metrics, on
+# unless METRICS=0. With several worker processes, point
+# METRICS_MULTIPROCESS_DIR at a directory they share so each scrape covers
+# all of them; set METRICS_TOKEN to require it as a bearer token.
+METRICS = {
+    'ENABLED': os.environ.get('METRICS', '1') != '0',
+    'MULTIPROCESS_DIR': os.environ.get('METRICS_MULTIPROCESS_DIR', ''),
+    'FLUSH_INTERVAL': float(os.environ.get('METRICS_FLUSH_INTERVAL', 5)),
+    'TOKEN': os.environ.get('METRICS_TOKEN', ''),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
 }
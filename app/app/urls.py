@@ -14,21 +14,29 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-)
-from django.contrib import admin
 from django.urls import path, include
 
+from core.lazy import lazy_include, lazy_view
+from core.metrics import metrics_view
+
+# The admin and the schema views are imported on first use, keeping them
+# out of process startup (see core.lazy).
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
+    lazy_include('admin/', 'core.admin_urls', 'admin', 'admin'),
+    path(
+        'api/schema/',
+        lazy_view('core.schema.CachedSpectacularAPIView'),
+        name='api-schema',
+        ),
     path(
         'api/docs/',
-        SpectacularSwaggerView.as_view(url_name='api-schema'),
+        lazy_view(
+            'drf_spectacular.views.SpectacularSwaggerView',
+            url_name='api-schema',
+        ),
         name='api-docs',
         ),
+    path('api/metrics/', metrics_view, name='api-metrics'),
     path('api/user/', include('user.urls')),
     path('api/recipe/', include('recipe.urls')),
 ]
@@ -0,0 +1,11 @@
+"""
+URL configuration for the admin site.
+
+Imported by app.urls on the first admin request, which is also when the
+apps' admin modules are discovered (see core.apps.LazyAdminConfig).
+"""
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
@@ -1,6 +1,27 @@
 from django.apps import AppConfig
+from django.contrib.admin.apps import SimpleAdminConfig
+from django.contrib.admin.checks import check_dependencies
+from django.core.checks import Tags, register
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from core import checks  # noqa: F401
+
+
+class LazyAdminConfig(SimpleAdminConfig):
+    """
+    Admin app that discovers admin modules on the first admin request.
+
+    See core.admin_urls. System checks discover them first so that the
+    ModelAdmin checks still run.
+    """
+
+    def ready(self):
+        from core.checks import check_admin
+
+        register(check_dependencies, Tags.admin)
+        register(check_admin, Tags.admin)
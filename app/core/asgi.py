@@ -0,0 +1,48 @@
+"""
+ASGI support for responses streamed from async iterators.
+
+Django 3.2 iterates a streaming response's content on the event loop, where
+database queries raise SynchronousOnlyOperation. A view whose stream
+queries as it goes can instead return an AsyncStreamingHttpResponse over
+an async iterator that runs its queries through sync_to_async. Django
+supports this natively from 4.2.
+"""
+from django.core.handlers import asgi
+from django.http import StreamingHttpResponse
+
+
+class AsyncStreamingHttpResponse(StreamingHttpResponse):
+    """
+    Streaming response whose content is an async iterator of bytes.
+
+    Only ASGIHandler below sends the content, so return it from requests
+    served over ASGI.
+    """
+    is_async = True
+
+    def __init__(self, async_content, *args, **kwargs):
+        super().__init__((), *args, **kwargs)
+        self.async_content = async_content
+
+
+class ASGIHandler(asgi.ASGIHandler):
+    """ASGIHandler that also sends AsyncStreamingHttpResponse content."""
+
+    async def send_response(self, response, send):
+        if not getattr(response, 'is_async', False):
+            return await super().send_response(response, send)
+
+        async def send_with_content(message):
+            # Django ends a streaming body with an empty final message.
+            if message['type'] == 'http.response.body' and \
+                    not message.get('more_body'):
+                async for part in response.async_content:
+                    for chunk, _ in self.chunk_bytes(part):
+                        await send({
+                            'type': 'http.response.body',
+                            'body': chunk,
+                            'more_body': True,
+                        })
+            await send(message)
+
+        await super().send_response(response, send_with_content)
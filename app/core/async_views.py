@@ -0,0 +1,89 @@
+"""
+Helpers for serving DRF views from async code.
+"""
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from core.caches import caches_in_memory
+
+
+def async_read_view(view_class, fast_handler, actions=None, **initkwargs):
+    """
+    Return an async view answering GET requests with fast_handler.
+
+    fast_handler(view, request) runs with the view set up as dispatch()
+    would and the user authenticated from the token cache, and returns a
+    response or None. It must not query the database. It runs on the event
+    loop only when every cache is held in memory: Django 3.2's cache API is
+    sync-only, so with Redis or memcached each call would block the loop,
+    and it runs in a worker thread instead. Any request it does not answer,
+    and every other method, is handled by the sync view in a thread, so
+    responses match the sync endpoint.
+    """
+    if actions is None:
+        sync_view = view_class.as_view(**initkwargs)
+    else:
+        sync_view = view_class.as_view(actions, **initkwargs)
+    sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        response = None
+        if request.method == 'GET':
+            fast_args = (view_class, actions, initkwargs, fast_handler,
+                         request, args, kwargs)
+            if caches_in_memory():
+                response = _fast_response(*fast_args)
+            else:
+                response = await sync_to_async(
+                    _fast_response, thread_sensitive=False,
+                )(*fast_args)
+        if response is None:
+            response = await sync_view(request, *args, **kwargs)
+        return response
+
+    view.csrf_exempt = True
+    return view
+
+
+def _fast_response(view_class, actions, initkwargs, fast_handler,
+                   request, args, kwargs):
+    """Run fast_handler as APIView.dispatch() would, or return None."""
+    view = view_class(**initkwargs)
+    if actions is None:
+        view.setup(request, *args, **kwargs)
+    else:
+        # Bind the actions the way ViewSetMixin.as_view() does.
+        view.action_map = dict(actions)
+        if 'get' in actions:
+            view.action_map.setdefault('head', actions['get'])
+        for method, action in view.action_map.items():
+            setattr(view, method, getattr(view, action))
+        view.args, view.kwargs = args, kwargs
+    request = view.request = view.initialize_request(request, *args, **kwargs)
+    view.headers = view.default_response_headers
+
+    authenticator = next(iter(request.authenticators), None)
+    if not hasattr(authenticator, 'authenticate_from_cache'):
+        return None
+    credentials = authenticator.authenticate_from_cache(request._request)
+    if credentials is None:
+        return None
+
+    try:
+        view.format_kwarg = view.get_format_suffix(**kwargs)
+        neg = view.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+        request.user, request.auth = credentials
+        view.check_permissions(request)
+        view.check_throttles(request)
+        response = fast_handler(view, request)
+    except APIException:
+        return None
+    if response is None:
+        return None
+
+    response = view.finalize_response(request, response, *args, **kwargs)
+    if isinstance(response, Response):
+        response.render()
+    return response
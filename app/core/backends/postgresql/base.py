@@ -0,0 +1,10 @@
+"""
+PostgreSQL backend with lazy connection health checks (see core.db).
+"""
+from django.db.backends.postgresql import base
+
+from core.db import HealthCheckMixin
+
+
+class DatabaseWrapper(HealthCheckMixin, base.DatabaseWrapper):
+    pass
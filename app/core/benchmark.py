@@ -0,0 +1,280 @@
+"""
+Load and latency benchmark of the REST API.
+
+seed() fills the database with users and their tags and recipes, and run()
+drives the recipe, tag, token and me endpoints from concurrent threads,
+each with its own in-process test client, so neither a server nor the
+network is involved. Reports are plain JSON; compare() lists where a report
+regressed from a baseline report. "manage.py benchmark_api" runs it all on
+a throwaway test database.
+"""
+import math
+import platform
+import threading
+import time
+from collections import namedtuple
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from core.models import Recipe, Tag
+
+EMAIL = 'bench-{}@example.com'
+PASSWORD = 'benchpass123'
+TAGS_PER_RECIPE = 3
+
+SeedUser = namedtuple('SeedUser', ['email', 'token', 'recipe_ids'])
+
+
+def seed(users, recipes, tags):
+    """
+    Create users, each with recipes and tags, and return their SeedUsers.
+
+    Rows are bulk inserted and every user shares one password hash, so
+    seeding large volumes is quick.
+    """
+    User = get_user_model()
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        User(email=EMAIL.format(i), name=f'User {i}', password=password)
+        for i in range(users)
+    )
+    seeded = list(User.objects.filter(
+        email__in=[EMAIL.format(i) for i in range(users)],
+    ).order_by('id'))
+
+    Token.objects.bulk_create(
+        Token(user=user, key=Token.generate_key()) for user in seeded
+    )
+    Tag.objects.bulk_create(
+        Tag(user=user, name=f'Tag {i}') for user in seeded
+        for i in range(tags)
+    )
+    Recipe.objects.bulk_create(
+        Recipe(
+            user=user,
+            title=f'Recipe {i}',
+            time_in_minutes=5 + i % 60,
+            price=f'{1 + i % 20}.50',
+        )
+        for user in seeded for i in range(recipes)
+    )
+
+    tag_ids, recipe_ids = {}, {}
+    for tag_id, user_id in Tag.objects.filter(
+        user__in=seeded,
+    ).values_list('id', 'user_id').order_by('id'):
+        tag_ids.setdefault(user_id, []).append(tag_id)
+    for recipe_id, user_id in Recipe.objects.filter(
+        user__in=seeded,
+    ).values_list('id', 'user_id').order_by('id'):
+        recipe_ids.setdefault(user_id, []).append(recipe_id)
+
+    Recipe.tags.through.objects.bulk_create(
+        Recipe.tags.through(recipe_id=recipe_id, tag_id=tag_id)
+        for user_id, ids in recipe_ids.items()
+        for index, recipe_id in enumerate(ids)
+        for tag_id in {
+            tag_ids[user_id][(index + offset) % len(tag_ids[user_id])]
+            for offset in range(TAGS_PER_RECIPE)
+        } if user_id in tag_ids
+    )
+
+    tokens = dict(Token.objects.filter(
+        user__in=seeded,
+    ).values_list('user_id', 'key'))
+    return [
+        SeedUser(user.email, tokens[user.id], recipe_ids.get(user.id, []))
+        for user in seeded
+    ]
+
+
+def _auth(user):
+    return {'HTTP_AUTHORIZATION': f'Token {user.token}'}
+
+
+def _recipe_list(client, user, i):
+    return client.get(reverse('recipe:recipe-list'), **_auth(user))
+
+
+def _recipe_detail(client, user, i):
+    recipe_id = user.recipe_ids[i % len(user.recipe_ids)]
+    return client.get(
+        reverse('recipe:recipe-detail', args=[recipe_id]),
+        **_auth(user),
+    )
+
+
+def _tag_list(client, user, i):
+    return client.get(reverse('recipe:tag-list'), **_auth(user))
+
+
+def _token(client, user, i):
+    return client.post(
+        reverse('user:token'),
+        {'email': user.email, 'password': PASSWORD},
+        content_type='application/json',
+    )
+
+
+def _me(client, user, i):
+    return client.get(reverse('user:me'), **_auth(user))
+
+
+# Each scenario makes request i of a run as user i % len(users).
+SCENARIOS = {
+    'recipe-list': _recipe_list,
+    'recipe-detail': _recipe_detail,
+    'tag-list': _tag_list,
+    'token': _token,
+    'me': _me,
+}
+
+
+class QueryCounter:
+    """Execute wrapper counting the queries run through it."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _worker(scenario, users, indexes, results):
+    """Make the requests numbered indexes, adding a result for each."""
+    client = Client()
+    counter = QueryCounter()
+    try:
+        with connection.execute_wrapper(counter):
+            for i in indexes:
+                user = users[i % len(users)]
+                queries = counter.count
+                start = time.perf_counter()
+                response = scenario(client, user, i // len(users))
+                latency = time.perf_counter() - start
+                results.append((
+                    latency,
+                    counter.count - queries,
+                    response.status_code,
+                ))
+    finally:
+        connections.close_all()
+
+
+def _percentile(ordered, q):
+    """Return the nearest-rank q percentile of a sorted list."""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def run_scenario(name, users, requests, concurrency):
+    """Run a scenario's requests across threads and return its results."""
+    scenario = SCENARIOS[name]
+    results = []
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(scenario, users, range(k, requests, concurrency), results),
+        )
+        for k in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency * 1000 for latency, _, _ in results)
+    return {
+        'requests': len(results),
+        'errors': sum(status >= 400 for _, _, status in results),
+        'throughput_rps': round(len(results) / elapsed, 1),
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 3),
+            'p50': round(_percentile(latencies, 0.5), 3),
+            'p95': round(_percentile(latencies, 0.95), 3),
+            'p99': round(_percentile(latencies, 0.99), 3),
+            'max': round(latencies[-1], 3),
+        },
+        'queries_per_request': round(
+            sum(queries for _, queries, _ in results) / len(results), 2,
+        ),
+    }
+
+
+def run(users, requests, concurrency, warmup=0, scenarios=SCENARIOS):
+    """
+    Run each scenario and return {name: results}.
+
+    The first warmup requests of a scenario are made beforehand, from a
+    single thread, and are not measured.
+    """
+    report = {}
+    for name in scenarios:
+        if warmup:
+            _worker(SCENARIOS[name], users, range(warmup), [])
+        report[name] = run_scenario(name, users, requests, concurrency)
+    return report
+
+
+def environment():
+    """Return the versions a report was measured with."""
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """
+    Return descriptions of how report regressed from baseline.
+
+    A scenario regresses when its p95 latency or its queries per request
+    grow, or its throughput drops, by more than the tolerance fraction, or
+    when it has more errors. Reports of different configurations are not
+    compared.
+    """
+    if report['config'] != baseline['config']:
+        return [
+            f"configuration {report['config']} differs from the "
+            f"baseline's {baseline['config']}",
+        ]
+
+    regressions = []
+    for name, base in baseline['scenarios'].items():
+        result = report['scenarios'].get(name)
+        if result is None:
+            continue
+        checks = [
+            ('p95 latency', result['latency_ms']['p95'],
+             base['latency_ms']['p95'], 'ms'),
+            ('queries per request', result['queries_per_request'],
+             base['queries_per_request'], ''),
+        ]
+        for label, value, expected, unit in checks:
+            if value > expected * (1 + tolerance):
+                regressions.append(
+                    f'{name}: {label} {value:g}{unit} > '
+                    f'{expected:g}{unit} baseline',
+                )
+        if result['throughput_rps'] < base['throughput_rps'] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{name}: throughput {result['throughput_rps']:g}/s < "
+                f"{base['throughput_rps']:g}/s baseline",
+            )
+        if result['errors'] > base['errors']:
+            regressions.append(
+                f"{name}: {result['errors']} errors > "
+                f"{base['errors']} baseline",
+            )
+    return regressions
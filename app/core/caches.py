@@ -0,0 +1,32 @@
+"""
+Where the configured Django caches keep their entries.
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+# Cache backends held in the memory of each process: their calls never wait
+# on I/O, and no other process sees their entries.
+IN_MEMORY_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_is_shared():
+    """
+    Return True if every process serving requests uses the same cache.
+
+    Otherwise an entry set while serving one request, such as a version
+    bump or a replica pin, is missed by requests other processes serve.
+    """
+    backend = caches['default'].__class__
+    path = f'{backend.__module__}.{backend.__qualname__}'
+    return settings.SINGLE_PROCESS or path not in IN_MEMORY_CACHE_BACKENDS
+
+
+def caches_in_memory():
+    """Return True if every configured cache is held in process memory."""
+    return all(
+        config['BACKEND'] in IN_MEMORY_CACHE_BACKENDS
+        for config in settings.CACHES.values()
+    )
@@ -0,0 +1,81 @@
+"""
+System checks for the core app.
+"""
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.checks import check_admin_app
+from django.core.checks import Error, Tags, Warning, register
+from django.db import connections
+
+from core.caches import cache_is_shared
+
+
+@register()
+def check_connection_settings(app_configs, **kwargs):
+    """Check the persistent connection settings of each database."""
+    errors = []
+    for alias in connections:
+        settings_dict = connections[alias].settings_dict
+        max_age = settings_dict['CONN_MAX_AGE']
+        if max_age is not None and max_age < 0:
+            errors.append(Error(
+                f'CONN_MAX_AGE of database {alias!r} must be None or at '
+                f'least 0.',
+                id='core.E001',
+            ))
+        elif settings_dict.get('CONN_HEALTH_CHECKS') and max_age == 0:
+            errors.append(Warning(
+                f'CONN_HEALTH_CHECKS has no effect on database {alias!r} '
+                f'because CONN_MAX_AGE is 0.',
+                hint='Set DB_CONN_MAX_AGE to keep connections open.',
+                id='core.W001',
+            ))
+    return errors
+
+
+@register()
+def check_replica_pin_cache(app_configs, **kwargs):
+    """Check every process sees the read replica pins."""
+    if not settings.DATABASE_REPLICAS or cache_is_shared():
+        return []
+    return [Error(
+        'Read replicas need a default cache shared by every process. '
+        'Read-your-writes pins are kept in it, so with a cache private to '
+        'each process other processes would read a writer\'s data from a '
+        'lagging replica.',
+        hint='Set CACHE_BACKEND to a shared cache such as Redis or '
+             'memcached, or SINGLE_PROCESS=1 if one process serves all '
+             'requests.',
+        id='core.E003',
+    )]
+
+
+@register(Tags.database)
+def check_database_connections(app_configs, databases=None, **kwargs):
+    """
+    Check each database accepts queries and passes the health check.
+
+    Connection failures are raised, not reported, so callers such as
+    wait_for_db can retry them. Runs with check --database and wait_for_db.
+    """
+    errors = []
+    for alias in databases or []:
+        conn = connections[alias]
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        health_checks = conn.settings_dict.get('CONN_HEALTH_CHECKS')
+        if health_checks and not conn.is_usable():
+            errors.append(Error(
+                f'Database {alias!r} answered a query but failed the '
+                f'connection health check.',
+                hint='Disable DB_CONN_HEALTH_CHECKS if the database or '
+                     'pooler rejects the check query.',
+                id='core.E002',
+            ))
+    return errors
+
+
+def check_admin(app_configs, **kwargs):
+    """Run the admin site checks after discovering the admin modules."""
+    admin.autodiscover()
+    return check_admin_app(app_configs, **kwargs)
@@ -0,0 +1,58 @@
+"""
+Database connection management.
+"""
+import time
+
+
+class HealthCheckMixin:
+    """
+    Database wrapper mixin backporting Django 4.1's CONN_HEALTH_CHECKS.
+
+    A persistent connection is checked with is_usable() the first time a
+    request uses it, and replaced if the check fails, so a connection the
+    server dropped while it sat idle (restart, idle timeout, failover) does
+    not fail the request. Databases a request does not use are not checked,
+    nor are connections used within the last CONN_HEALTH_CHECK_IDLE
+    seconds.
+    """
+    health_check_done = False
+    last_used = None
+
+    @property
+    def health_check_enabled(self):
+        return bool(self.settings_dict.get('CONN_HEALTH_CHECKS'))
+
+    def connect(self):
+        # New connections are healthy.
+        self.health_check_done = True
+        super().connect()
+
+    def close_if_unusable_or_obsolete(self):
+        # Runs when each request starts and finishes. Its get_autocommit()
+        # call is not a use of the connection, so it neither runs the
+        # health check nor counts as activity.
+        last_used = self.last_used
+        self.health_check_done = True
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+        self.last_used = last_used
+
+    def ensure_connection(self):
+        if not self.health_check_done:
+            self.close_if_health_check_failed()
+        super().ensure_connection()
+        self.last_used = time.monotonic()
+
+    def close_if_health_check_failed(self):
+        """Close the connection if it fails a health check."""
+        if (self.connection is None or not self.health_check_enabled or
+                self.in_atomic_block):
+            return
+
+        self.health_check_done = True
+        idle = self.settings_dict.get('CONN_HEALTH_CHECK_IDLE', 0)
+        if self.last_used is not None and \
+                time.monotonic() - self.last_used < idle:
+            return
+        if not self.is_usable():
+            self.close()
@@ -0,0 +1,15 @@
+"""
+HTTP helpers shared by the APIs.
+"""
+from django.utils.http import parse_etags
+
+
+def etag_matches(request, etag):
+    """Return True if the request's If-None-Match header matches etag."""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or any(
+        candidate.replace('W/', '', 1) == etag for candidate in etags
+    )
@@ -0,0 +1,78 @@
+"""
+Routes whose views are imported when they are first used.
+
+Serving API requests does not need the schema generator or the admin, so
+their modules are left out of process startup.
+"""
+import threading
+
+from django.urls import URLResolver
+from django.urls.resolvers import RoutePattern
+from django.utils.module_loading import import_string
+
+
+def lazy_view(view_path, **initkwargs):
+    """
+    Return a view that imports the class-based view at view_path on its
+    first request and then calls its as_view(**initkwargs).
+    """
+    lock = threading.Lock()
+    views = []
+
+    def view(request, *args, **kwargs):
+        if not views:
+            with lock:
+                if not views:
+                    views.append(
+                        import_string(view_path).as_view(**initkwargs)
+                    )
+        return views[0](request, *args, **kwargs)
+
+    # DRF views are CSRF exempt and enforce CSRF in SessionAuthentication.
+    view.csrf_exempt = True
+    return view
+
+
+class LazyURLResolver(URLResolver):
+    """
+    URLResolver that imports its urlconf only when it is used.
+
+    Django populates every nested resolver when any URL is first reversed;
+    this one waits until a URL is resolved or reversed through it.
+    """
+    loaded = False
+
+    def _populate(self):
+        if self.loaded:
+            super()._populate()
+
+    def _load(self):
+        self.loaded = True
+
+    @property
+    def reverse_dict(self):
+        self._load()
+        return super().reverse_dict
+
+    @property
+    def namespace_dict(self):
+        self._load()
+        return super().namespace_dict
+
+    @property
+    def app_dict(self):
+        self._load()
+        return super().app_dict
+
+
+def lazy_include(route, urlconf, app_name, namespace):
+    """
+    Return path(route, include((urlconf, app_name), namespace)) without
+    importing urlconf until a URL under route is resolved or reversed.
+    """
+    return LazyURLResolver(
+        RoutePattern(route, is_endpoint=False),
+        urlconf,
+        app_name=app_name,
+        namespace=namespace,
+    )
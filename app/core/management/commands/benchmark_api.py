@@ -0,0 +1,154 @@
+"""
+Django command to benchmark the API on a throwaway database.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from core import benchmark
+
+
+def positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise ValueError(value)
+    return value
+
+
+def fraction(value):
+    value = float(value)
+    if value < 0:
+        raise ValueError(value)
+    return value
+
+
+class Command(BaseCommand):
+    """
+    Django command to measure API throughput, latency and queries.
+
+    The data is seeded into test databases created for the run and dropped
+    afterwards, as the test runner does, so any configured database works,
+    including SQLite in memory.
+    """
+
+    help = 'Benchmark the recipe, tag, token and me endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=positive_int, default=10,
+            help='Users to seed.',
+        )
+        parser.add_argument(
+            '--recipes', type=positive_int, default=20,
+            help='Recipes to seed per user.',
+        )
+        parser.add_argument(
+            '--tags', type=positive_int, default=5,
+            help='Tags to seed per user.',
+        )
+        parser.add_argument(
+            '--requests', type=positive_int, default=200,
+            help='Measured requests per scenario.',
+        )
+        parser.add_argument(
+            '--concurrency', type=positive_int, default=4,
+            help='Threads making the requests of a scenario.',
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=10,
+            help='Unmeasured requests made before each scenario.',
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            choices=list(benchmark.SCENARIOS),
+            help='Scenario to run; repeat for several. Defaults to all.',
+        )
+        parser.add_argument(
+            '--no-response-cache',
+            action='store_false',
+            dest='response_cache',
+            help='Disable the recipe response cache, so every read queries.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Save the JSON report to this file instead of printing it.',
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON report to compare against; fails on regressions.',
+        )
+        parser.add_argument(
+            '--tolerance', type=fraction, default=0.2,
+            help='Fraction a metric may worsen by before it is a regression.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Could not read the baseline: {exc}')
+
+        config = {
+            key: options[key]
+            for key in ['users', 'recipes', 'tags', 'requests',
+                        'concurrency', 'warmup', 'response_cache']
+        }
+        scenarios = options['scenario'] or list(benchmark.SCENARIOS)
+        # Every request is served by this process.
+        overrides = {'SINGLE_PROCESS': True}
+        if not options['response_cache']:
+            overrides['RECIPE_RESPONSE_CACHE_TIMEOUT'] = 0
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(**overrides):
+                users = benchmark.seed(
+                    options['users'], options['recipes'], options['tags'],
+                )
+                report = {
+                    'config': config,
+                    'environment': benchmark.environment(),
+                    'scenarios': benchmark.run(
+                        users,
+                        options['requests'],
+                        options['concurrency'],
+                        options['warmup'],
+                        scenarios,
+                    ),
+                }
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+        if baseline is not None:
+            regressions = benchmark.compare(
+                report, baseline, options['tolerance'],
+            )
+            if regressions:
+                raise CommandError(
+                    'Regressions from the baseline:\n  ' +
+                    '\n  '.join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS(
+                'No regressions from the baseline.'
+            ))
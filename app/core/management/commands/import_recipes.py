@@ -0,0 +1,188 @@
+"""Django command to import recipes and tags for a user from a file.
+"""
+import csv
+import json
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Recipe, Tag
+
+RECIPE_FIELDS = ['title', 'description', 'time_in_minutes', 'price', 'link']
+
+
+class Command(BaseCommand):
+    """
+    Django command to bulk import recipes from a CSV or JSONL file.
+
+    The file is streamed and rows are written in batches, each in its own
+    transaction. With --state-file, the number of committed rows is saved
+    after every batch so an interrupted import can be resumed with --resume.
+    """
+
+    help = 'Import recipes and tags for a user from a CSV or JSONL file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file to import.')
+        parser.add_argument(
+            '--user',
+            required=True,
+            help='Email of the user who will own the recipes.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='Input format. Defaults to the file extension.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per insert and transaction.',
+        )
+        parser.add_argument(
+            '--tag-separator',
+            default='|',
+            help='Separator between tag names in the CSV tags column.',
+        )
+        parser.add_argument(
+            '--state-file',
+            help='File recording committed rows, for resuming.',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Skip the rows recorded as committed in --state-file.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'File not found: {path}')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+        if options['resume'] and not options['state_file']:
+            raise CommandError('--resume requires --state-file.')
+
+        try:
+            user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User not found: {options['user']}")
+
+        fmt = options['format'] or path.suffix.lstrip('.').lower()
+        if fmt not in ('csv', 'jsonl'):
+            raise CommandError('Cannot infer format, pass --format.')
+
+        state_file = options['state_file'] and Path(options['state_file'])
+        skip = self._read_state(state_file) if options['resume'] else 0
+        if skip:
+            self.stdout.write(f'Resuming after row {skip}...')
+
+        tag_ids = {
+            (user.id, name): tag_id
+            for tag_id, name in Tag.objects.filter(user=user).values_list(
+                'id', 'name',
+            )
+        }
+
+        start = time.monotonic()
+        committed = skip
+        batch = []
+        with path.open(newline='', encoding='utf-8') as stream:
+            rows = self._read_rows(stream, fmt, options['tag_separator'])
+            for number, row in enumerate(rows, start=1):
+                if number <= skip:
+                    continue
+                batch.append(self._build_recipe(user, number, row))
+                if len(batch) >= options['batch_size']:
+                    committed = self._flush(batch, tag_ids, committed)
+                    self._report(committed, skip, start, state_file)
+                    batch = []
+            if batch:
+                committed = self._flush(batch, tag_ids, committed)
+                self._report(committed, skip, start, state_file)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {committed - skip} recipes for {user.email}.'
+        ))
+
+    def _read_rows(self, stream, fmt, tag_separator):
+        """Yield rows as dicts with tags as a list of names."""
+        if fmt == 'csv':
+            for row in csv.DictReader(stream):
+                tags = row.get('tags') or ''
+                row['tags'] = [
+                    name.strip()
+                    for name in tags.split(tag_separator)
+                    if name.strip()
+                ]
+                yield row
+            return
+
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                raise CommandError(f'Line {number}: invalid JSON ({exc}).')
+            if not isinstance(row, dict):
+                raise CommandError(f'Line {number}: expected a JSON object.')
+            tags = row.get('tags') or []
+            if not isinstance(tags, list):
+                raise CommandError(f'Line {number}: tags must be a list.')
+            row['tags'] = [
+                tag.get('name') if isinstance(tag, dict) else tag
+                for tag in tags
+            ]
+            yield row
+
+    def _build_recipe(self, user, number, row):
+        """Return a validated (recipe, tag names) pair for a row."""
+        values = {
+            field: row[field] for field in RECIPE_FIELDS if field in row
+        }
+        recipe = Recipe(user=user, **values)
+        try:
+            recipe.full_clean(exclude=['user'], validate_unique=False)
+        except ValidationError as exc:
+            raise CommandError(f'Row {number}: {exc.message_dict}')
+
+        name_field = Tag._meta.get_field('name')
+        names = []
+        for name in row['tags']:
+            try:
+                names.append(name_field.clean(name, None))
+            except ValidationError as exc:
+                raise CommandError(
+                    f'Row {number}: invalid tag {name!r}: {exc.messages}'
+                )
+        return recipe, names
+
+    def _flush(self, batch, tag_ids, committed):
+        """Write a batch in one transaction and return rows committed."""
+        Recipe.objects.bulk_create_with_tags(
+            [recipe for recipe, _ in batch],
+            [names for _, names in batch],
+            tag_ids=tag_ids,
+        )
+        return committed + len(batch)
+
+    def _read_state(self, state_file):
+        if not state_file.exists():
+            return 0
+        return json.loads(state_file.read_text())['committed_rows']
+
+    def _report(self, committed, skip, start, state_file):
+        """Record and print progress after a committed batch."""
+        if state_file:
+            state_file.write_text(json.dumps({'committed_rows': committed}))
+        elapsed = time.monotonic() - start
+        rate = (committed - skip) / elapsed if elapsed else 0
+        self.stdout.write(
+            f'Committed {committed} rows ({rate:.0f} rows/s)'
+        )
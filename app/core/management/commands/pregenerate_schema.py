@@ -0,0 +1,53 @@
+"""Django command to pre-render the OpenAPI schema.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import translation
+
+from core import schema
+
+
+class Command(BaseCommand):
+    """
+    Django command to render the OpenAPI schema into the schema cache.
+
+    Run it at build or release time: the API then serves the saved
+    documents and no request has to generate the schema.
+    """
+
+    help = 'Render the OpenAPI schema into SCHEMA_CACHE_DIR.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lang',
+            action='append',
+            dest='languages',
+            help='Language to render. Defaults to LANGUAGE_CODE.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        if not settings.SCHEMA_CACHE['DIR']:
+            raise CommandError('SCHEMA_CACHE_DIR is not set.')
+
+        renderers = {}
+        for renderer_class in schema.CachedSpectacularAPIView.renderer_classes:
+            renderers.setdefault(renderer_class.format, renderer_class())
+
+        languages = options['languages'] or [settings.LANGUAGE_CODE]
+        for language in languages:
+            if not translation.check_for_language(language):
+                raise CommandError(f'Unknown language: {language}')
+
+        version = schema.schema_version()
+        for language in languages:
+            for fmt, renderer in renderers.items():
+                schema.get_schema_document(renderer, language)
+                path = schema.schema_path((version, fmt, language))
+                if not path.exists():
+                    raise CommandError(f'Could not write {path}.')
+                self.stdout.write(f'Wrote {path}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Schema version {version} is ready.'
+        ))
@@ -0,0 +1,85 @@
+"""Django command to profile the startup of an entry point.
+"""
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import ENTRY_POINTS, profile_startup
+
+PHASES = ['settings', 'app configs', 'models', 'ready', 'middleware',
+          'urlconf', 'other']
+
+
+class Command(BaseCommand):
+    """
+    Django command to report where an entry point spends its startup.
+
+    The entry point is started in a fresh interpreter, so the report covers
+    a cold start rather than this already set up process.
+    """
+
+    help = 'Report django.setup() phase timings and an import-time tree.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entry',
+            choices=list(ENTRY_POINTS),
+            default='wsgi',
+            help='Entry point to start: manage.py, app.wsgi or app.asgi.',
+        )
+        parser.add_argument(
+            '--min-ms',
+            type=float,
+            default=5,
+            help='Hide imports with a cumulative time below this.',
+        )
+        parser.add_argument(
+            '--depth',
+            type=int,
+            default=4,
+            help='Nesting levels of the import tree to show.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        try:
+            profile = profile_startup(options['entry'])
+        except subprocess.CalledProcessError as exc:
+            raise CommandError(
+                f"Could not start {options['entry']}:\n{exc.stderr}"
+            )
+
+        self.stdout.write(
+            f'Startup of {profile.entry}: {profile.wall_ms:.1f} ms '
+            f"(setup and URLconf {profile.phases['total']:.1f} ms)"
+        )
+        self.stdout.write('Phases:')
+        for phase in PHASES:
+            if phase in profile.phases:
+                self.stdout.write(
+                    f'  {phase:<12} {profile.phases[phase]:8.1f} ms'
+                )
+
+        self.stdout.write(
+            f"Imports (cumulative ms, at least {options['min_ms']:g} ms):"
+        )
+        min_us = options['min_ms'] * 1000
+        for node in sorted(
+            profile.imports,
+            key=lambda node: node.cumulative_us,
+            reverse=True,
+        ):
+            self._write_import(node, 0, min_us, options['depth'])
+
+    def _write_import(self, node, depth, min_us, max_depth):
+        if node.cumulative_us < min_us or depth >= max_depth:
+            return
+        self.stdout.write(
+            f"  {node.cumulative_us / 1000:8.1f}  {'  ' * depth}{node.name}"
+        )
+        for child in sorted(
+            node.children,
+            key=lambda node: node.cumulative_us,
+            reverse=True,
+        ):
+            self._write_import(child, depth + 1, min_us, max_depth)
@@ -1,26 +1,132 @@
 """Django command to wait for DB to be available.
 """
+import math
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from psycopg2 import OperationalError as Psycogp2Error
 
+from django.db import connections
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 
 class Command(BaseCommand):
-    """Django command to wait for the database to become available."""
+    """
+    Django command to wait for the databases to become available.
+
+    Every database alias is probed in its own thread. Failed probes are
+    retried with jittered exponential backoff, starting at a few
+    milliseconds so the command returns soon after a database comes up.
+    Each PostgreSQL connection attempt is given a connect_timeout of at
+    most the time left, so an unreachable host cannot block past --timeout.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            action='append',
+            dest='databases',
+            help='Database alias to wait for. Defaults to all of them.',
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=60,
+            help='Seconds to wait before failing, 0 to wait forever.',
+        )
+        parser.add_argument(
+            '--initial-delay',
+            type=float,
+            default=0.005,
+            help='Seconds to wait after the first failed probe.',
+        )
+        parser.add_argument(
+            '--max-delay',
+            type=float,
+            default=1,
+            help='Upper bound in seconds of the wait between probes.',
+        )
 
     def handle(self, *args, **options):
         """Entry point for command."""
+        aliases = options['databases'] or list(connections)
+        unknown = set(aliases) - set(connections)
+        if unknown:
+            raise CommandError(
+                f"Unknown database: {', '.join(sorted(unknown))}"
+            )
+
         self.stdout.write('Waiting for database...')
-        db_up = False
-        while not db_up:
-            try:
-                self.check(databases=['default'])
-                db_up = True
-            except (Psycogp2Error, OperationalError):
-                self.stdout.write('Database unavailable, waiting 1 second...')
-                time.sleep(1)
-
-        self.stdout.write(self.style.SUCCESS('Database is ready!'))
+        self._lock = threading.Lock()
+        start = time.monotonic()
+        deadline = start + options['timeout'] if options['timeout'] else None
+        with ThreadPoolExecutor(max_workers=len(aliases)) as executor:
+            ready = dict(zip(aliases, executor.map(
+                lambda alias: self._wait_for(alias, start, deadline, options),
+                aliases,
+            )))
+
+        unavailable = [alias for alias, elapsed in ready.items()
+                       if elapsed is None]
+        if unavailable:
+            raise CommandError(
+                f"Database unavailable after {options['timeout']:g}s: "
+                f"{', '.join(unavailable)}"
+            )
+        if len(aliases) > 1:
+            for alias, elapsed in ready.items():
+                self.stdout.write(f'Database {alias} ready in {elapsed:.3f}s')
+        self.stdout.write(self.style.SUCCESS(
+            f'Database is ready! ({max(ready.values()):.3f}s)'
+        ))
+
+    def _wait_for(self, alias, start, deadline, options):
+        """Probe alias until it is up; return seconds taken or None."""
+        delay = options['initial_delay']
+        try:
+            while True:
+                try:
+                    self._probe(alias, deadline)
+                    return time.monotonic() - start
+                except (Psycogp2Error, OperationalError):
+                    pass
+
+                # Sleep between half and all of the current delay so
+                # processes started together do not retry in lockstep.
+                wait = random.uniform(delay / 2, delay)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    wait = min(wait, remaining)
+                with self._lock:
+                    self.stdout.write(
+                        f'Database {alias} unavailable, '
+                        f'waiting {wait:.3f} seconds...'
+                    )
+                time.sleep(wait)
+                delay = min(delay * 2, options['max_delay'])
+        finally:
+            connections[alias].close()
+
+    def _probe(self, alias, deadline):
+        """Check alias, bounding the connection attempt by the deadline."""
+        conn = connections[alias]
+        settings_dict = conn.settings_dict
+        if deadline is not None and conn.vendor == 'postgresql':
+            # libpq takes whole seconds and treats 0 as no timeout.
+            timeout = max(1, math.ceil(deadline - time.monotonic()))
+            options = settings_dict['OPTIONS']
+            if 'connect_timeout' in options:
+                timeout = min(timeout, int(options['connect_timeout']))
+            conn.settings_dict = {
+                **settings_dict,
+                'OPTIONS': {**options, 'connect_timeout': timeout},
+            }
+        try:
+            self.check(databases=[alias])
+        finally:
+            conn.settings_dict = settings_dict
@@ -0,0 +1,384 @@
+"""
+In-process metrics with a Prometheus text exposition endpoint.
+
+Each thread updates its own shard of the registry, so recording takes no
+lock; shards are merged when the metrics are scraped, and folded into one
+when their thread exits. With
+settings.METRICS['MULTIPROCESS_DIR'] set, every process also saves its
+values to a file there at most every FLUSH_INTERVAL seconds, and a scrape
+of any process adds up the files of all the others.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+# Upper bounds in seconds of the request latency buckets.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1, 2.5, 5, 10)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Metric:
+    """Base class of the metrics held by a Registry."""
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def values(self):
+        """Return this process's values by label values."""
+        return self.registry.collect().get(self.name, {})
+
+    def clear(self):
+        """Drop this metric's values in this process."""
+        self.registry.clear(self.name)
+
+
+class Counter(Metric):
+    """A count that only goes up, such as requests served."""
+    type = 'counter'
+
+    def inc(self, *labelvalues, amount=1):
+        shard = self.registry.shard()
+        key = (self.name, labelvalues)
+        shard[key] = shard.get(key, 0) + amount
+
+    def merge(self, total, value):
+        return (total or 0) + value
+
+
+class Histogram(Metric):
+    """
+    Observations counted in buckets, such as request latencies.
+
+    Values are stored as the count of each bucket, the last one for values
+    above every bound, followed by the sum of the observations.
+    """
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames,
+                 buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    @property
+    def quantile_name(self):
+        """Name of the gauges estimating quantiles, before the unit."""
+        base, _, unit = self.name.rpartition('_')
+        return f'{base}_quantile_{unit}'
+
+    def observe(self, value, *labelvalues):
+        shard = self.registry.shard()
+        key = (self.name, labelvalues)
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0] * (len(self.buckets) + 2)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def merge(self, total, values):
+        if total is None:
+            return list(values)
+        return [a + b for a, b in zip(total, values)]
+
+    def quantile(self, q, values):
+        """
+        Estimate the q quantile from bucket counts, interpolating linearly
+        within the bucket that holds it.
+        """
+        counts = values[:-1]
+        rank = q * sum(counts)
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return 0.0
+
+
+class _ShardOwner:
+    """Kept in a thread's locals to notice when the thread exits."""
+
+
+class Registry:
+    """
+    Metrics whose values are kept in one shard per thread.
+
+    The shard of a thread that exits is folded into a shared retired shard,
+    so servers starting a thread per request do not grow without bound.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self._local = threading.local()
+        self._shards = {}
+        self._retired = {}
+        # Reentrant in case a thread's locals are dropped while it holds it.
+        self._lock = threading.RLock()
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(
+            Counter(self, name, documentation, labelnames),
+        )
+
+    def histogram(self, name, documentation, labelnames=(),
+                  buckets=DEFAULT_BUCKETS):
+        return self._register(
+            Histogram(self, name, documentation, labelnames, buckets),
+        )
+
+    def shard(self):
+        """Return the calling thread's shard, creating it on first use."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards[id(shard)] = shard
+            # Thread locals are dropped when their thread exits.
+            owner = self._local.owner = _ShardOwner()
+            weakref.finalize(owner, self._retire, shard)
+            return shard
+
+    def _retire(self, shard):
+        """Fold the shard of an exited thread into the retired shard."""
+        with self._lock:
+            del self._shards[id(shard)]
+            for key, value in shard.items():
+                # Replace rather than update values, so a copy taken by
+                # collect() is never changed under it.
+                self._retired[key] = self.metrics[key[0]].merge(
+                    self._retired.get(key),
+                    value,
+                )
+
+    def collect(self):
+        """Return this process's values as {name: {labelvalues: value}}."""
+        with self._lock:
+            shards = [*self._shards.values(), self._retired.copy()]
+        result = defaultdict(dict)
+        for shard in shards:
+            # dict.copy() is atomic, so owners can keep writing meanwhile.
+            for (name, labelvalues), value in shard.copy().items():
+                metric = self.metrics[name]
+                result[name][labelvalues] = metric.merge(
+                    result[name].get(labelvalues),
+                    value,
+                )
+        return result
+
+    def clear(self, name=None):
+        """Drop the values of metric name, or of every metric."""
+        with self._lock:
+            for shard in [*self._shards.values(), self._retired]:
+                for key in list(shard):
+                    if name is None or key[0] == name:
+                        shard.pop(key, None)
+
+
+class FileStore:
+    """
+    Metric values of the processes sharing a directory.
+
+    Each process writes its values to its own file, named after its pid and
+    a random token so that a restarted worker reusing a pid does not
+    overwrite the totals of the one before it. Clear the directory when
+    deploying to reset the totals.
+    """
+
+    def __init__(self, registry, directory, interval):
+        self.registry = registry
+        self.directory = Path(directory)
+        self.interval = interval
+        self.path = self.directory / (
+            f'metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json'
+        )
+        self._next_flush = 0
+        self._lock = threading.Lock()
+
+    def flush_due(self):
+        """Return True if the saved values are older than interval."""
+        return time.monotonic() >= self._next_flush
+
+    def maybe_flush(self):
+        """Save this process's values if they are older than interval."""
+        if self.flush_due() and self._lock.acquire(blocking=False):
+            try:
+                self.flush()
+            finally:
+                self._lock.release()
+
+    def flush(self):
+        self._next_flush = time.monotonic() + self.interval
+        data = [
+            [name, list(labelvalues), value]
+            for name, values in self.registry.collect().items()
+            for labelvalues, value in values.items()
+        ]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        temp_path.write_text(json.dumps(data))
+        os.replace(temp_path, self.path)
+
+    def collect(self):
+        """Return the values of every process, this one's live."""
+        result = self.registry.collect()
+        for path in self.directory.glob('metrics-*.json'):
+            if path == self.path:
+                continue
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, labelvalues, value in data:
+                metric = self.registry.metrics.get(name)
+                if metric is None:
+                    continue
+                labelvalues = tuple(labelvalues)
+                result[name][labelvalues] = metric.merge(
+                    result[name].get(labelvalues),
+                    value,
+                )
+        return result
+
+
+registry = Registry()
+
+request_duration = registry.histogram(
+    'http_request_duration_seconds',
+    'Time to handle requests, by view, action and status code.',
+    ['view', 'action', 'status'],
+)
+
+_store = None
+
+
+def get_store():
+    """Return the FileStore of this process, or None if not configured."""
+    global _store
+    directory = settings.METRICS['MULTIPROCESS_DIR']
+    if not directory:
+        return None
+    if _store is None or _store.directory != Path(directory):
+        _store = FileStore(
+            registry, directory, settings.METRICS['FLUSH_INTERVAL'],
+        )
+    return _store
+
+
+@atexit.register
+def _flush_at_exit():
+    store = get_store()
+    if store is not None:
+        store.flush()
+
+
+def collect():
+    """Return the values to expose, across processes when configured."""
+    store = get_store()
+    return store.collect() if store else registry.collect()
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace(
+        '"', r'\"',
+    )
+
+
+def _labels(names, values, **extra):
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{%s}' % ','.join(
+        f'{name}="{_escape(value)}"' for name, value in pairs
+    )
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _counter_lines(metric, series):
+    for labelvalues, value in series:
+        labels = _labels(metric.labelnames, labelvalues)
+        yield f'{metric.name}{labels} {_number(value)}'
+
+
+def _histogram_lines(metric, series):
+    bounds = [*metric.buckets, '+Inf']
+    for labelvalues, values in series:
+        cumulative = 0
+        for bound, count in zip(bounds, values[:-1]):
+            cumulative += count
+            labels = _labels(metric.labelnames, labelvalues, le=bound)
+            yield f'{metric.name}_bucket{labels} {cumulative}'
+        labels = _labels(metric.labelnames, labelvalues)
+        yield f'{metric.name}_sum{labels} {_number(values[-1])}'
+        yield f'{metric.name}_count{labels} {cumulative}'
+
+    if series:
+        yield (f'# HELP {metric.quantile_name} Quantiles of {metric.name} '
+               f'estimated from its buckets.')
+        yield f'# TYPE {metric.quantile_name} gauge'
+    for labelvalues, values in series:
+        for q in QUANTILES:
+            labels = _labels(metric.labelnames, labelvalues, quantile=q)
+            estimate = _number(metric.quantile(q, values))
+            yield f'{metric.quantile_name}{labels} {estimate}'
+
+
+def exposition(values=None):
+    """Return the metrics in the Prometheus text exposition format."""
+    values = collect() if values is None else values
+    lines = []
+    for name, metric in sorted(registry.metrics.items()):
+        series = sorted(values.get(name, {}).items())
+        lines += [
+            f'# HELP {name} {metric.documentation}',
+            f'# TYPE {name} {metric.type}',
+        ]
+        if metric.type == 'counter':
+            lines += _counter_lines(metric, series)
+        else:
+            lines += _histogram_lines(metric, series)
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """
+    Serve the metrics for scraping.
+
+    Requires "Authorization: Bearer <METRICS_TOKEN>" when a token is set.
+    """
+    token = settings.METRICS['TOKEN']
+    if token and not constant_time_compare(
+        request.META.get('HTTP_AUTHORIZATION', ''),
+        f'Bearer {token}',
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(exposition(), content_type=CONTENT_TYPE)
@@ -0,0 +1,229 @@
+"""
+Middleware for the APIs.
+"""
+import asyncio
+import random
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.authentication import get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from core import metrics
+from core.routers import replica_reads
+from core.timing import RequestTiming, current_timing, install_query_timer
+from user.authentication import CachedTokenAuthentication
+
+PIN_KEY = 'replica-pin:{}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _credentials_user_id(request):
+    """
+    Return the id of the user whose token or session the request carries.
+
+    Tokens are resolved through the token authentication cache, which
+    also saves the view's authentication a query, and sessions from the
+    user id they store, so no user is loaded for them.
+    """
+    auth = get_authorization_header(request).split()
+    if len(auth) == 2 and auth[0].lower() == b'token':
+        try:
+            user, _ = CachedTokenAuthentication().authenticate_credentials(
+                auth[1].decode(),
+            )
+        except (UnicodeError, AuthenticationFailed):
+            return None
+        return user.pk
+
+    session = getattr(request, 'session', None)
+    return session.get(SESSION_KEY) if session is not None else None
+
+
+def _use_replicas(request):
+    """Return True if a safe request may read from replicas."""
+    user_id = _credentials_user_id(request)
+    return user_id is None or not cache.get(PIN_KEY.format(user_id), False)
+
+
+def _pin(request):
+    """Send the writing user's reads to the primary for a while."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        cache.set(PIN_KEY.format(user.pk), True,
+                  settings.REPLICA_PIN_SECONDS)
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response):
+    """
+    Let safe requests read from replicas unless the user wrote recently.
+
+    After an unsafe request, its authenticated user is pinned to the
+    primary for settings.REPLICA_PIN_SECONDS, so they read their own writes
+    from every token and session while the replicas catch up. Pins are
+    kept in the default cache, which must be shared by every process (see
+    core.checks). Must come after AuthenticationMiddleware. Works natively
+    with sync and async views; under ASGI the pin lookups run in a thread,
+    as the cache API and the ORM are sync-only.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            if not settings.DATABASE_REPLICAS:
+                return await get_response(request)
+
+            if request.method not in SAFE_METHODS:
+                response = await get_response(request)
+                await sync_to_async(_pin)(request)
+                return response
+
+            use_replicas = await sync_to_async(_use_replicas)(request)
+            with replica_reads(use_replicas):
+                return await get_response(request)
+    else:
+        def middleware(request):
+            if not settings.DATABASE_REPLICAS:
+                return get_response(request)
+
+            if request.method not in SAFE_METHODS:
+                response = get_response(request)
+                _pin(request)
+                return response
+
+            with replica_reads(_use_replicas(request)):
+                return get_response(request)
+
+    return middleware
+
+
+def _view_labels(request, response):
+    """Return the view, action and status labels of a handled request."""
+    match = request.resolver_match
+    if match is None:
+        return 'unmatched', request.method.lower(), str(response.status_code)
+
+    view = getattr(match.func, 'cls', None) or \
+        getattr(match.func, 'view_class', None)
+    actions = getattr(match.func, 'actions', None) or {}
+    return (
+        view.__name__ if view else match.view_name,
+        actions.get(request.method.lower(), request.method.lower()),
+        str(response.status_code),
+    )
+
+
+def _observe(request, response, start):
+    metrics.request_duration.observe(
+        time.perf_counter() - start,
+        *_view_labels(request, response),
+    )
+
+
+def _store_to_flush():
+    """Return the metrics FileStore if it is due to be saved, or None."""
+    store = metrics.get_store()
+    return store if store is not None and store.flush_due() else None
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Record request latencies by view, viewset action and status code.
+
+    Enabled by settings.METRICS['ENABLED']. Keep it first in MIDDLEWARE so
+    the latencies cover the whole stack.
+    """
+    if not settings.METRICS['ENABLED']:
+        raise MiddlewareNotUsed
+
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            start = time.perf_counter()
+            response = await get_response(request)
+            _observe(request, response, start)
+            store = _store_to_flush()
+            if store is not None:
+                # Saving writes a file, so keep it off the event loop.
+                await sync_to_async(
+                    store.maybe_flush, thread_sensitive=False,
+                )()
+            return response
+    else:
+        def middleware(request):
+            start = time.perf_counter()
+            response = get_response(request)
+            _observe(request, response, start)
+            store = _store_to_flush()
+            if store is not None:
+                store.maybe_flush()
+            return response
+
+    return middleware
+
+
+class RequestTimingMiddleware(MiddlewareMixin):
+    """
+    Time the queries, view and rendering of a sample of requests.
+
+    Enabled by settings.REQUEST_TIMING['ENABLED']; otherwise Django drops
+    it from the stack. A SAMPLE_RATE fraction of requests is timed and gets
+    a Server-Timing header and a log record on the core.timing logger.
+    Keep it first in MIDDLEWARE so the total covers the whole stack.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING['ENABLED']:
+            raise MiddlewareNotUsed
+        self.sample_rate = settings.REQUEST_TIMING['SAMPLE_RATE']
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self._finish(request, response, timing)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self._finish(request, response, timing)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = current_timing.get()
+        if timing is not None:
+            install_query_timer()
+            timing.view_started()
+
+    def process_template_response(self, request, response):
+        timing = current_timing.get()
+        if timing is not None:
+            timing.render_started()
+            response.add_post_render_callback(timing.render_finished)
+        return response
+
+    def _finish(self, request, response, timing):
+        timing.finish()
+        response['Server-Timing'] = timing.server_timing()
+        timing.log(request, response)
+        return response
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-17 06:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_recipe_tags"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(
+                fields=["user", "-id"],
+                name="recipe_user_id_desc_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["user", "-name", "-id"],
+                name="tag_user_name_desc_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 3.2.25 on 2026-10-17 07:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def merge_duplicate_tags(apps, schema_editor):
+    """Merge tags sharing a (user, name) pair into the oldest one."""
+    Tag = apps.get_model("core", "Tag")
+    Through = apps.get_model("core", "Recipe").tags.through
+    duplicates = (
+        Tag.objects.values("user_id", "name")
+        .annotate(count=models.Count("id"), keep_id=models.Min("id"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        keep_id = duplicate["keep_id"]
+        extra = Tag.objects.filter(
+            user_id=duplicate["user_id"],
+            name=duplicate["name"],
+        ).exclude(id=keep_id)
+        tagged = set(
+            Through.objects.filter(tag_id=keep_id).values_list(
+                "recipe_id", flat=True
+            )
+        )
+        for recipe_id in Through.objects.filter(tag__in=extra).values_list(
+            "recipe_id", flat=True
+        ):
+            if recipe_id not in tagged:
+                Through.objects.create(recipe_id=recipe_id, tag_id=keep_id)
+                tagged.add(recipe_id)
+        extra.delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("core", "0006_recipe_tag_user_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_tags,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="tag",
+            constraint=models.UniqueConstraint(
+                fields=("user", "name"),
+                name="unique_tag_name_per_user",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="recipe",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tag",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 3.2.25 on 2026-10-17 09:20
+
+from django.db import migrations
+
+# Full-text search structures used by recipe.search. They are invisible to
+# the ORM, so they are created with raw SQL for the vendors that support
+# them. On SQLite, a later migration that rebuilds core_recipe (most field
+# changes) drops the triggers and must create them again.
+FORWARD_SQL = {
+    "postgresql": [
+        """
+        ALTER TABLE core_recipe ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+        """,
+        """
+        CREATE INDEX recipe_search_vector_idx ON core_recipe
+        USING GIN (search_vector)
+        """,
+    ],
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE core_recipe_fts USING fts5(
+            title, description,
+            content='core_recipe', content_rowid='id',
+            tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER core_recipe_fts_insert AFTER INSERT ON core_recipe
+        BEGIN
+            INSERT INTO core_recipe_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER core_recipe_fts_delete AFTER DELETE ON core_recipe
+        BEGIN
+            INSERT INTO core_recipe_fts (
+                core_recipe_fts, rowid, title, description
+            ) VALUES ('delete', old.id, old.title, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER core_recipe_fts_update
+        AFTER UPDATE OF title, description ON core_recipe
+        BEGIN
+            INSERT INTO core_recipe_fts (
+                core_recipe_fts, rowid, title, description
+            ) VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO core_recipe_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """,
+        "INSERT INTO core_recipe_fts (core_recipe_fts) VALUES ('rebuild')",
+    ],
+}
+
+REVERSE_SQL = {
+    "postgresql": [
+        "DROP INDEX IF EXISTS recipe_search_vector_idx",
+        "ALTER TABLE core_recipe DROP COLUMN IF EXISTS search_vector",
+    ],
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS core_recipe_fts_insert",
+        "DROP TRIGGER IF EXISTS core_recipe_fts_delete",
+        "DROP TRIGGER IF EXISTS core_recipe_fts_update",
+        "DROP TABLE IF EXISTS core_recipe_fts",
+    ],
+}
+
+
+def create_search_index(apps, schema_editor):
+    """Create the full-text index for the database vendor, if any."""
+    for sql in FORWARD_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    """Drop the full-text index for the database vendor, if any."""
+    for sql in REVERSE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_tag_unique_name_per_user"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
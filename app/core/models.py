@@ -7,7 +7,9 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
-from django.db import models
+from django.db import connections, models, transaction
+
+from core.signals import recipes_bulk_changed
 
 
 class UserManager(BaseUserManager):
@@ -45,12 +47,125 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
 
 
+class RecipeManager(models.Manager):
+    """Manager for recipes."""
+
+    def _set_tags(
+        self,
+        recipes,
+        tag_names,
+        batch_size=None,
+        replace=True,
+        tag_ids=None,
+    ):
+        """
+        Set the tags of recipes whose tag_names entry is not None.
+
+        tag_ids optionally maps (user_id, name) to tag ids already known to
+        the caller; it is consulted first and filled in with resolved tags.
+        """
+        Through = self.model.tags.through
+        changed = [
+            (recipe, names)
+            for recipe, names in zip(recipes, tag_names)
+            if names is not None
+        ]
+        if not changed:
+            return
+
+        tag_ids = {} if tag_ids is None else tag_ids
+        missing_by_user = {}
+        for recipe, names in changed:
+            for name in names:
+                if (recipe.user_id, name) not in tag_ids:
+                    missing_by_user.setdefault(recipe.user_id, set()).add(name)
+        for user_id, names in missing_by_user.items():
+            for tag in Tag.objects.db_manager(self.db).get_or_create_many(
+                user_id,
+                sorted(names),
+            ):
+                tag_ids[(user_id, tag.name)] = tag.id
+
+        if replace:
+            Through.objects.using(self.db).filter(
+                recipe_id__in=[recipe.id for recipe, _ in changed],
+            ).delete()
+        Through.objects.using(self.db).bulk_create(
+            [
+                Through(
+                    recipe_id=recipe.id,
+                    tag_id=tag_ids[(recipe.user_id, name)],
+                )
+                for recipe, names in changed
+                for name in dict.fromkeys(names)
+            ],
+            batch_size=batch_size,
+        )
+
+    def bulk_create_with_tags(
+        self,
+        recipes,
+        tag_names,
+        batch_size=None,
+        tag_ids=None,
+    ):
+        """
+        Insert recipes and attach tags to them in one transaction.
+
+        tag_names[i] lists the tag names for recipes[i]. Tags are resolved
+        for the whole batch at once, using and updating the optional tag_ids
+        map (see _set_tags), and every recipe-tag row is written in a single
+        bulk insert. On backends that cannot return primary keys from bulk
+        inserts (SQLite), recipes are inserted one by one instead.
+        """
+        connection = connections[self.db]
+        with transaction.atomic(using=self.db):
+            if connection.features.can_return_rows_from_bulk_insert:
+                self.bulk_create(recipes, batch_size=batch_size)
+            else:
+                for recipe in recipes:
+                    recipe.save(force_insert=True, using=self.db)
+            self._set_tags(
+                recipes,
+                tag_names,
+                batch_size=batch_size,
+                replace=False,
+                tag_ids=tag_ids,
+            )
+
+        recipes_bulk_changed.send(
+            sender=self.model,
+            user_ids={recipe.user_id for recipe in recipes},
+        )
+        return recipes
+
+    def bulk_update_with_tags(self, recipes, fields, tag_names):
+        """
+        Save fields of existing recipes and replace their tags in bulk.
+
+        tag_names[i] lists the new tag names for recipes[i], or is None to
+        leave that recipe's tags unchanged.
+        """
+        with transaction.atomic(using=self.db):
+            if fields:
+                self.bulk_update(recipes, fields)
+            self._set_tags(recipes, tag_names)
+
+        recipes_bulk_changed.send(
+            sender=self.model,
+            user_ids={recipe.user_id for recipe in recipes},
+        )
+        return recipes
+
+
 class Recipe(models.Model):
     """Represents a Recipe object."""
 
+    # Covered by the composite indexes below, which all lead with user.
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
     )
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -59,18 +174,81 @@ class Recipe(models.Model):
     link = models.CharField(max_length=255)
     tags = models.ManyToManyField("Tag")
 
+    objects = RecipeManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-id"],
+                name="recipe_user_id_desc_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class TagManager(models.Manager):
+    """Manager for tags."""
+
+    def get_or_create_many(self, user, names):
+        """
+        Return the user's tags matching names, creating missing ones in bulk.
+
+        Uses a fixed number of queries regardless of how many names are
+        given. Duplicate names are collapsed and the result keeps the order
+        of first appearance. user may be a User or its primary key.
+        """
+        user_id = getattr(user, "pk", user)
+        names = list(dict.fromkeys(names))
+        if not names:
+            return []
+
+        existing = self.filter(user_id=user_id, name__in=names)
+        tags = {tag.name: tag for tag in existing}
+        missing = [name for name in names if name not in tags]
+        if missing:
+            # Tags created concurrently by another request hit the unique
+            # (user, name) constraint and are skipped rather than failing.
+            self.bulk_create(
+                [self.model(user_id=user_id, name=name) for name in missing],
+                ignore_conflicts=True,
+            )
+            # Primary keys are not populated when conflicts are ignored,
+            # so fetch the rows that were just inserted.
+            tags.update(
+                (tag.name, tag)
+                for tag in self.filter(user_id=user_id, name__in=missing)
+            )
+        return [tags[name] for name in names]
+
+
 class Tag(models.Model):
     """Represents a Tag model."""
 
+    # Covered by the composite indexes below, which all lead with user.
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
     )
     name = models.CharField(max_length=255)
 
+    objects = TagManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-name", "-id"],
+                name="tag_user_name_desc_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "name"],
+                name="unique_tag_name_per_user",
+            ),
+        ]
+
     def __str__(self):
         return self.name
@@ -0,0 +1,78 @@
+"""
+Renderers for the APIs.
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson else 0
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Values orjson cannot encode natively (Decimal, lazy strings, dates and
+    times) are passed to DRF's JSONEncoder, so the output matches
+    JSONRenderer. Indented, non-compact and ASCII-only output, and any data
+    orjson rejects, are rendered by JSONRenderer itself. Unlike the strict
+    stdlib encoder, orjson renders NaN and infinite floats as null.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if (orjson is None or indent is not None or not self.compact or
+                self.ensure_ascii):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape the line and paragraph separators like JSONRenderer does,
+        # since they are not valid in JavaScript string literals.
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028',
+        ).replace(
+            '\u2029'.encode(), b'\\u2029',
+        )
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer for newline-delimited JSON.
+
+    Streaming views render one line per item with render_line(); render()
+    covers ordinary responses such as errors, which become a single line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+    json_renderer_class = FastJSONRenderer
+
+    def __init__(self):
+        self.json_renderer = self.json_renderer_class()
+
+    def render_line(self, data):
+        """Return data encoded as a single line of JSON."""
+        return self.json_renderer.render(data) + b'\n'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self.render_line(data)
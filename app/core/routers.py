@@ -0,0 +1,59 @@
+"""
+Database routers.
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Allow (or, with enabled=False, forbid) reads from replicas."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reads_from_replicas():
+    """Return True if reads in the current context may use a replica."""
+    return bool(settings.DATABASE_REPLICAS) and _replica_reads.get()
+
+
+class PrimaryReplicaRouter:
+    """
+    Route reads to settings.DATABASE_REPLICAS inside replica_reads().
+
+    Everything else, including all writes, goes to the default (primary)
+    database, so code outside a request always sees its own writes.
+    Tokens are always read from the primary so a token created moments
+    ago authenticates even if the replicas lag behind.
+    """
+    primary_only_apps = {'authtoken'}
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (not replicas or not _replica_reads.get() or
+                model._meta.app_label in self.primary_only_apps):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,177 @@
+"""
+Pre-rendered OpenAPI schema.
+
+Generating the schema introspects every view and serializer, so it is
+rendered once per code version, format and language, kept in memory and
+written to settings.SCHEMA_CACHE['DIR'] for other processes and restarts.
+The version is settings.SCHEMA_CACHE['VERSION'] (e.g. the deployed commit)
+or, when unset, a fingerprint of the project's source files.
+"""
+import functools
+import gzip
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+import drf_spectacular
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+from core.http import etag_matches
+
+logger = logging.getLogger(__name__)
+
+SchemaDocument = namedtuple('SchemaDocument', ['content', 'gzipped', 'etag'])
+
+accepts_gzip = re.compile(r'\bgzip\b')
+
+_documents = {}
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def schema_version():
+    """Return the version that schema documents are cached under."""
+    if settings.SCHEMA_CACHE['VERSION']:
+        return settings.SCHEMA_CACHE['VERSION']
+
+    digest = hashlib.sha256(drf_spectacular.__version__.encode())
+    base_dir = Path(settings.BASE_DIR)
+    for path in sorted(base_dir.rglob('*.py')):
+        relative_path = path.relative_to(base_dir)
+        if any(part.startswith('.') for part in relative_path.parts):
+            continue
+        digest.update(str(relative_path).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def generate_schema(renderer):
+    """Generate the schema and render it with renderer."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(
+        urlconf=spectacular_settings.SERVE_URLCONF,
+    )
+    schema = generator.get_schema(
+        request=None,
+        public=spectacular_settings.SERVE_PUBLIC,
+    )
+    return renderer.render(schema, renderer.media_type, {})
+
+
+def _document(content):
+    etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+    return SchemaDocument(content, gzip.compress(content, mtime=0), etag)
+
+
+def schema_path(key):
+    version, fmt, language = key
+    return Path(settings.SCHEMA_CACHE['DIR']) / (
+        f'schema-{version}-{language}.{fmt}'
+    )
+
+
+def _read(key):
+    if not settings.SCHEMA_CACHE['DIR']:
+        return None
+    try:
+        return schema_path(key).read_bytes()
+    except OSError:
+        return None
+
+
+def _write(key, content):
+    """Atomically write content to the disk cache, if it is writable."""
+    if not settings.SCHEMA_CACHE['DIR']:
+        return
+    path = schema_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent,
+            delete=False,
+        ) as stream:
+            stream.write(content)
+        os.chmod(stream.name, 0o644)
+        os.replace(stream.name, path)
+    except OSError as exc:
+        logger.warning('Could not write schema cache %s: %s', path, exc)
+
+
+def get_schema_document(renderer, language=None):
+    """
+    Return the SchemaDocument for renderer's format and language.
+
+    Documents are generated at most once per process and code version; the
+    first process to generate one saves it for the others.
+    """
+    key = (
+        schema_version(),
+        renderer.format,
+        language or settings.LANGUAGE_CODE,
+    )
+    document = _documents.get(key)
+    if document is not None:
+        return document
+
+    with _lock:
+        if key not in _documents:
+            content = _read(key)
+            if content is None:
+                with translation.override(key[2]):
+                    content = generate_schema(renderer)
+                _write(key, content)
+            _documents[key] = _document(content)
+        return _documents[key]
+
+
+def clear_schema_cache():
+    """Forget the schema documents held in memory."""
+    _documents.clear()
+    schema_version.cache_clear()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    Serve the pre-rendered schema with an ETag, gzipped when accepted.
+
+    Unsupported ?lang values render like the default language, so they share
+    its document instead of each generating a new one.
+    """
+
+    def _get_schema_response(self, request):
+        language = translation.get_language()
+        if not language or not translation.check_for_language(language):
+            language = settings.LANGUAGE_CODE
+        document = get_schema_document(request.accepted_renderer, language)
+
+        if etag_matches(request, document.etag):
+            response = HttpResponseNotModified()
+        elif accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            response = HttpResponse(
+                document.gzipped,
+                content_type=self._content_type(request),
+            )
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(
+                document.content,
+                content_type=self._content_type(request),
+            )
+        response['ETag'] = document.etag
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+    def _content_type(self, request):
+        renderer = request.accepted_renderer
+        if renderer.charset:
+            return f'{renderer.media_type}; charset={renderer.charset}'
+        return renderer.media_type
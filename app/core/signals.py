@@ -0,0 +1,9 @@
+"""
+Custom signals sent by the core models.
+"""
+from django.dispatch import Signal
+
+# Sent after recipes or their tags are written in bulk, which bypasses the
+# per-instance save and m2m_changed signals. Receivers get user_ids, the set
+# of users whose recipes changed.
+recipes_bulk_changed = Signal()
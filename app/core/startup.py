@@ -0,0 +1,148 @@
+"""
+Startup profiling for the app's entry points.
+
+profile_startup() runs an entry point in a fresh interpreter with
+"python -X importtime -m core.startup <entry>". That child process times
+each phase of django.setup() and the first URLconf load, and the parent
+reads the phases from its stdout and the import tree from its stderr.
+
+-X importtime only reports import statements: modules loaded with
+importlib.import_module (app configs, URLconfs) are missing from the tree
+and their own imports show up as roots. StartupProfile.modules lists every
+module that was loaded.
+"""
+import functools
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict, namedtuple
+from importlib import import_module
+
+ENTRY_POINTS = {
+    'manage': None,
+    'wsgi': 'app.wsgi',
+    'asgi': 'app.asgi',
+}
+
+ImportNode = namedtuple('ImportNode', ['name', 'self_us', 'cumulative_us',
+                                       'children'])
+StartupProfile = namedtuple('StartupProfile', ['entry', 'wall_ms', 'phases',
+                                               'imports', 'modules'])
+
+
+def parse_import_times(output):
+    """
+    Return the root ImportNodes of python -X importtime output.
+
+    Each module is reported after its imports, indented one level deeper
+    than the module that imported it.
+    """
+    pending = defaultdict(list)
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        pending[depth].append(ImportNode(
+            name.strip(),
+            int(self_us),
+            int(cumulative_us),
+            pending.pop(depth + 1, []),
+        ))
+    return pending[0]
+
+
+def profile_startup(entry='wsgi', urlconf=True):
+    """
+    Start entry in a new interpreter and return its StartupProfile.
+
+    With urlconf=False the URLconf is not loaded, so the 'manage' entry
+    profiles a bare django.setup().
+    """
+    from django.conf import settings
+
+    if entry not in ENTRY_POINTS:
+        raise ValueError(f'Unknown entry point: {entry}')
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'core.startup', entry,
+         *([] if urlconf else ['--no-urlconf'])],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE,
+        },
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    report = json.loads(result.stdout.splitlines()[-1])
+    return StartupProfile(
+        entry,
+        wall_ms,
+        report['phases'],
+        parse_import_times(result.stderr),
+        set(report['modules']),
+    )
+
+
+def _timed(timings, phase, func):
+    """Wrap func to add its duration to timings[phase]."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[phase] += (time.perf_counter() - start) * 1000
+    return wrapper
+
+
+def _measure(entry, urlconf=True):
+    """Start entry in this process and return its phase timings in ms."""
+    start = time.perf_counter()
+    import django
+    from django.apps import AppConfig, apps
+    from django.conf import LazySettings
+    from django.core.handlers.base import BaseHandler
+    from django.urls import get_resolver
+
+    timings = defaultdict(float)
+    LazySettings._setup = _timed(timings, 'settings', LazySettings._setup)
+    AppConfig.create = classmethod(_timed(
+        timings, 'app configs', AppConfig.create.__func__,
+    ))
+    AppConfig.import_models = _timed(
+        timings, 'models', AppConfig.import_models,
+    )
+    apps.populate = _timed(timings, 'apps', apps.populate)
+    BaseHandler.load_middleware = _timed(
+        timings, 'middleware', BaseHandler.load_middleware,
+    )
+
+    if ENTRY_POINTS[entry]:
+        import_module(ENTRY_POINTS[entry])
+    else:
+        django.setup()
+    if urlconf:
+        _timed(timings, 'urlconf', lambda: get_resolver().reverse_dict)()
+    total = (time.perf_counter() - start) * 1000
+
+    timings['ready'] = timings.pop('apps') - (
+        timings['app configs'] + timings['models']
+    )
+    timings['other'] = total - sum(timings.values())
+    timings['total'] = total
+    return timings
+
+
+if __name__ == '__main__':
+    print(json.dumps({
+        'phases': _measure(sys.argv[1], '--no-urlconf' not in sys.argv),
+        'modules': sorted(sys.modules),
+    }))
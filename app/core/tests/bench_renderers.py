@@ -0,0 +1,83 @@
+"""
+Benchmark JSON rendering and parsing of recipe payloads.
+
+Run with: python manage.py test core --pattern="bench_*.py"
+"""
+import io
+import time
+from decimal import Decimal
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from django.test import SimpleTestCase
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+TOTAL = 1000
+ROUNDS = 50
+
+
+def recipe_data(i, price):
+    """Return the list representation of the i-th benchmark recipe."""
+    return {
+        "id": i,
+        "title": f"Recipe {i}",
+        "time_in_minutes": 10 + i % 50,
+        "price": price,
+        "link": "http://example.com/recipe.pdf",
+        "tags": [
+            {"id": i % 20, "name": f"tag{i % 20}"},
+            {"id": 100, "name": "common"},
+        ],
+    }
+
+
+class JSONBenchmark(SimpleTestCase):
+    """Compare recipes per second of the stdlib and fast JSON classes."""
+
+    def _rate(self, func, data):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            func(data)
+        return TOTAL * ROUNDS / (time.perf_counter() - start)
+
+    def _compare(self, label, slow, fast, data):
+        slow_rate = self._rate(slow, data)
+        fast_rate = self._rate(fast, data)
+        print(
+            f"\n{label}: stdlib {slow_rate:.0f} recipes/s, "
+            f"fast {fast_rate:.0f} recipes/s "
+            f"({fast_rate / slow_rate:.1f}x)"
+        )
+
+    def test_render_throughput(self):
+        page = {
+            "next": None,
+            "previous": None,
+            "results": [recipe_data(i, "5.50") for i in range(TOTAL)],
+        }
+        self._compare(
+            "Render list",
+            JSONRenderer().render,
+            FastJSONRenderer().render,
+            page,
+        )
+
+        decimals = [recipe_data(i, Decimal("5.50")) for i in range(TOTAL)]
+        self._compare(
+            "Render Decimal prices",
+            JSONRenderer().render,
+            FastJSONRenderer().render,
+            decimals,
+        )
+
+    def test_parse_throughput(self):
+        content = JSONRenderer().render(
+            [recipe_data(i, "5.50") for i in range(TOTAL)],
+        )
+        self._compare(
+            "Parse list",
+            lambda data: JSONParser().parse(io.BytesIO(data)),
+            lambda data: FastJSONParser().parse(io.BytesIO(data)),
+            content,
+        )
@@ -0,0 +1,121 @@
+"""
+Benchmark the overhead of the request timing middleware.
+
+Run with: python manage.py test core --pattern="bench_*.py"
+"""
+import logging
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from core.middleware import RequestTimingMiddleware
+from core.models import Recipe
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+ROUNDS = 40
+BLOCK = 25
+RECIPES = 50
+CONFIGS = [
+    ("disabled", {"ENABLED": False, "SAMPLE_RATE": 0}),
+    ("enabled, 0% sampled", {"ENABLED": True, "SAMPLE_RATE": 0}),
+    ("enabled, 1% sampled", {"ENABLED": True, "SAMPLE_RATE": 0.01}),
+    ("enabled, 100% sampled", {"ENABLED": True, "SAMPLE_RATE": 1}),
+]
+
+
+@override_settings(RECIPE_RESPONSE_CACHE_TIMEOUT=0)
+class RequestTimingBenchmark(TestCase):
+    """Compare recipe list latency with the middleware off and on."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="bench@example.com",
+            password="testpass123",
+        )
+        for i in range(RECIPES):
+            Recipe.objects.create(
+                user=cls.user,
+                title=f"Recipe {i}",
+                time_in_minutes=10,
+                price=Decimal("1.50"),
+            )
+
+    def setUp(self):
+        logger = logging.getLogger("core.timing")
+        handlers, logger.handlers = logger.handlers, [logging.NullHandler()]
+        self.addCleanup(setattr, logger, "handlers", handlers)
+
+    def _client(self, timing):
+        """Return a client whose middleware was loaded with timing."""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with override_settings(REQUEST_TIMING=timing):
+            client.get(self.url)
+        return client
+
+    def _latency(self, client):
+        """Return the mean microseconds per request of a block."""
+        start = time.perf_counter()
+        for _ in range(BLOCK):
+            client.get(self.url)
+        return (time.perf_counter() - start) * 1e6 / BLOCK
+
+    def test_middleware_overhead(self):
+        self.url = reverse("recipe:recipe-list")
+        clients = {label: self._client(timing) for label, timing in CONFIGS}
+
+        # Interleave short blocks in a random order so drift and ordering
+        # effects hit every configuration alike.
+        results = {label: [] for label in clients}
+        labels = list(clients)
+        for _ in range(ROUNDS):
+            random.shuffle(labels)
+            for label in labels:
+                results[label].append(self._latency(clients[label]))
+
+        baseline = statistics.median(results["disabled"])
+        print(f"\nRecipe list, median of {ROUNDS} blocks of {BLOCK}:")
+        for label, latencies in results.items():
+            latency = statistics.median(latencies)
+            print(
+                f"  {label:<22} {latency:7.0f} us/request "
+                f"({(latency - baseline) / baseline:+.1%})"
+            )
+
+    def test_unsampled_overhead(self):
+        """Time the middleware itself on requests that are not sampled."""
+        request = RequestFactory().get("/")
+        response = HttpResponse()
+
+        def view(request):
+            return response
+
+        with override_settings(
+            REQUEST_TIMING={"ENABLED": True, "SAMPLE_RATE": 0},
+        ):
+            middleware = RequestTimingMiddleware(view)
+
+        def hooks(request):
+            middleware.process_view(request, view, (), {})
+            return middleware.process_template_response(request, response)
+
+        calls = 100000
+        timings = {}
+        for label, handler in [("view", view), ("middleware", middleware),
+                               ("hooks", hooks)]:
+            start = time.perf_counter()
+            for _ in range(calls):
+                handler(request)
+            timings[label] = (time.perf_counter() - start) * 1e6 / calls
+
+        print(
+            f"\nUnsampled request: middleware "
+            f"{timings['middleware'] - timings['view']:.2f} us, "
+            f"view and render hooks {timings['hooks']:.2f} us"
+        )
@@ -0,0 +1,132 @@
+"""
+Tests for the API benchmark suite.
+"""
+import copy
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from core import benchmark
+from core.models import Recipe, Tag
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TransactionTestCase
+
+COMMAND = "core.management.commands.benchmark_api"
+
+
+def make_report(p95=10.0, throughput=100.0, queries=2.0, errors=0):
+    return {
+        "config": {"users": 2, "requests": 10},
+        "scenarios": {
+            "recipe-list": {
+                "requests": 10,
+                "errors": errors,
+                "throughput_rps": throughput,
+                "latency_ms": {"p95": p95},
+                "queries_per_request": queries,
+            },
+        },
+    }
+
+
+class BenchmarkRunTests(TransactionTestCase):
+    """Test seeding and running the benchmark scenarios."""
+
+    def test_seed(self):
+        """Test the requested volumes are seeded."""
+        users = benchmark.seed(users=3, recipes=4, tags=5)
+
+        self.assertEqual(len(users), 3)
+        self.assertEqual(get_user_model().objects.count(), 3)
+        self.assertEqual(Recipe.objects.count(), 12)
+        self.assertEqual(Tag.objects.count(), 15)
+        self.assertEqual(
+            Recipe.tags.through.objects.count(),
+            12 * benchmark.TAGS_PER_RECIPE,
+        )
+        for user in users:
+            self.assertEqual(len(user.recipe_ids), 4)
+            self.assertTrue(
+                get_user_model().objects.get(email=user.email)
+                .check_password(benchmark.PASSWORD)
+            )
+
+    def test_run(self):
+        """Test every scenario succeeds and is reported."""
+        users = benchmark.seed(users=2, recipes=2, tags=2)
+
+        report = benchmark.run(users, requests=4, concurrency=2, warmup=1)
+
+        self.assertEqual(list(report), list(benchmark.SCENARIOS))
+        for name, result in report.items():
+            self.assertEqual(result["requests"], 4, name)
+            self.assertEqual(result["errors"], 0, name)
+            self.assertGreater(result["throughput_rps"], 0, name)
+            latency = result["latency_ms"]
+            self.assertLessEqual(latency["p50"], latency["p95"], name)
+            self.assertLessEqual(latency["p99"], latency["max"], name)
+        self.assertGreater(report["token"]["queries_per_request"], 0)
+
+    def test_command(self):
+        """Test the command saves a report and compares it to a baseline."""
+        out = StringIO()
+        options = {"users": 2, "recipes": 2, "tags": 2, "requests": 2,
+                   "concurrency": 2, "warmup": 0, "scenario": ["tag-list"]}
+
+        # The test runner already set up the environment and databases.
+        with tempfile.TemporaryDirectory() as directory, \
+                patch(f"{COMMAND}.setup_test_environment"), \
+                patch(f"{COMMAND}.teardown_test_environment"), \
+                patch(f"{COMMAND}.setup_databases"), \
+                patch(f"{COMMAND}.teardown_databases"):
+            path = Path(directory) / "baseline.json"
+            call_command("benchmark_api", output=str(path), **options)
+            report = json.loads(path.read_text())
+            self.assertEqual(list(report["scenarios"]), ["tag-list"])
+
+            baseline = copy.deepcopy(report)
+            baseline["scenarios"]["tag-list"]["errors"] = 0
+            baseline["scenarios"]["tag-list"]["throughput_rps"] = 1e9
+            path.write_text(json.dumps(baseline))
+            call_command("flush", interactive=False, verbosity=0)
+            with self.assertRaisesRegex(CommandError, "tag-list: throughput"):
+                call_command(
+                    "benchmark_api", baseline=str(path), stdout=out, **options
+                )
+
+
+class CompareTests(SimpleTestCase):
+    """Test comparing reports with a baseline."""
+
+    def test_within_tolerance(self):
+        """Test changes within the tolerance are not regressions."""
+        report = make_report(p95=11.9, throughput=81, queries=2.0)
+
+        self.assertEqual(benchmark.compare(report, make_report(), 0.2), [])
+
+    def test_regressions(self):
+        """Test slower, less throughput, more queries and errors regress."""
+        report = make_report(p95=13, throughput=70, queries=3, errors=1)
+
+        regressions = benchmark.compare(report, make_report(), 0.2)
+
+        self.assertEqual(regressions, [
+            "recipe-list: p95 latency 13ms > 10ms baseline",
+            "recipe-list: queries per request 3 > 2 baseline",
+            "recipe-list: throughput 70/s < 100/s baseline",
+            "recipe-list: 1 errors > 0 baseline",
+        ])
+
+    def test_different_config(self):
+        """Test reports of different configurations are not compared."""
+        report = make_report()
+        report["config"]["users"] = 3
+
+        regressions = benchmark.compare(report, make_report(), 0.2)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("differs from the baseline", regressions[0])
@@ -1,11 +1,19 @@
 """"Test custom Django management commands."""
+import json
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
 from unittest.mock import patch  # noqa
 
 from psycopg2 import OperationalError as Psycogp2Error
 
+from core.models import Recipe, Tag
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
 
 
 @patch("core.management.commands.wait_for_db.Command.check")
@@ -27,3 +35,224 @@ class CommandTests(SimpleTestCase):
         call_command('wait_for_db')
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+    @patch('time.sleep')
+    def test_wait_for_db_backoff(self, patched_sleep, patched_check):
+        """Test retries back off exponentially with jitter up to a cap."""
+        patched_check.side_effect = [OperationalError] * 8 + [True]
+
+        call_command(
+            'wait_for_db',
+            initial_delay=0.01,
+            max_delay=0.5,
+            stdout=StringIO(),
+        )
+
+        delays = [c.args[0] for c in patched_sleep.call_args_list]
+        self.assertEqual(len(delays), 8)
+        for attempt, wait in enumerate(delays):
+            upper = min(0.01 * 2 ** attempt, 0.5)
+            self.assertTrue(upper / 2 <= wait <= upper, (attempt, wait))
+
+    def test_wait_for_db_timeout(self, patched_check):
+        """Test giving up with an error once the timeout is reached."""
+        patched_check.side_effect = OperationalError
+
+        with self.assertRaisesMessage(CommandError, 'default'):
+            call_command('wait_for_db', timeout=0.05, stdout=StringIO())
+
+    @patch('core.management.commands.wait_for_db.connections')
+    def test_wait_for_db_all_aliases(self, patched_connections,
+                                     patched_check):
+        """Test every database alias is probed and timed."""
+        patched_connections.__iter__.side_effect = lambda: iter(
+            ['default', 'replica']
+        )
+        out = StringIO()
+
+        call_command('wait_for_db', stdout=out)
+
+        probed = {c.kwargs['databases'][0]
+                  for c in patched_check.call_args_list}
+        self.assertEqual(probed, {'default', 'replica'})
+        self.assertIn('Database replica ready in', out.getvalue())
+        self.assertIn('Database is ready! (', out.getvalue())
+
+    @patch('core.management.commands.wait_for_db.connections')
+    def test_wait_for_db_connect_timeout(self, patched_connections,
+                                         patched_check):
+        """Test each connection attempt is bounded by the time left."""
+        patched_connections.__iter__.side_effect = lambda: iter(['default'])
+        conn = patched_connections.__getitem__.return_value
+        conn.vendor = 'postgresql'
+        settings_dict = {'OPTIONS': {'sslmode': 'require'}}
+        conn.settings_dict = settings_dict
+        timeouts = []
+
+        def check(databases):
+            timeouts.append(conn.settings_dict['OPTIONS']['connect_timeout'])
+            self.assertEqual(conn.settings_dict['OPTIONS']['sslmode'],
+                             'require')
+            if len(timeouts) == 1:
+                raise OperationalError
+
+        patched_check.side_effect = check
+
+        call_command('wait_for_db', timeout=2.5, stdout=StringIO())
+
+        self.assertEqual(timeouts[0], 3)
+        self.assertLessEqual(timeouts[1], 3)
+        self.assertIs(conn.settings_dict, settings_dict)
+        self.assertNotIn('connect_timeout', settings_dict['OPTIONS'])
+
+    def test_wait_for_db_unknown_alias(self, patched_check):
+        """Test an unknown database alias is an error."""
+        with self.assertRaisesMessage(CommandError, 'other'):
+            call_command('wait_for_db', databases=['other'])
+        patched_check.assert_not_called()
+
+
+class ImportRecipesCommandTests(TestCase):
+    """Test the import_recipes command."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, content):
+        path = Path(self.tmp.name) / name
+        path.write_text(content)
+        return str(path)
+
+    def _import(self, *args, **options):
+        out = StringIO()
+        call_command('import_recipes', *args, stdout=out, **options)
+        return out.getvalue()
+
+    def test_import_csv(self):
+        """Test importing recipes and tags from a CSV file."""
+        Tag.objects.create(user=self.user, name='Vegan')
+        path = self._write('recipes.csv', (
+            'title,description,time_in_minutes,price,link,tags\n'
+            'Soup,Hot,10,2.50,http://example.com/1,Vegan|Lunch\n'
+            'Salad,,5,1.25,http://example.com/2,Lunch\n'
+            'Bread,Fresh,60,3.00,http://example.com/3,\n'
+        ))
+
+        self._import(path, user=self.user.email, batch_size=2)
+
+        recipes = Recipe.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(
+            [recipe.title for recipe in recipes],
+            ['Soup', 'Salad', 'Bread'],
+        )
+        soup, salad, bread = recipes
+        self.assertEqual(soup.price, Decimal('2.50'))
+        self.assertEqual(soup.time_in_minutes, 10)
+        self.assertEqual(
+            sorted(tag.name for tag in soup.tags.all()),
+            ['Lunch', 'Vegan'],
+        )
+        self.assertEqual([tag.name for tag in salad.tags.all()], ['Lunch'])
+        self.assertFalse(bread.tags.exists())
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+
+    def test_import_jsonl(self):
+        """Test importing recipes from a JSONL file."""
+        path = self._write('recipes.jsonl', (
+            '{"title": "Soup", "time_in_minutes": 10, "price": "2.50", '
+            '"link": "http://example.com/1", "tags": ["Lunch"]}\n'
+            '\n'
+            '{"title": "Salad", "time_in_minutes": 5, "price": 1.25, '
+            '"link": "http://example.com/2", "tags": [{"name": "Lunch"}]}\n'
+        ))
+
+        self._import(path, user=self.user.email)
+
+        tag = Tag.objects.get(user=self.user, name='Lunch')
+        self.assertEqual(tag.recipe_set.count(), 2)
+        self.assertEqual(
+            Recipe.objects.get(title='Salad').price,
+            Decimal('1.25'),
+        )
+
+    def test_invalid_row_reports_row_number(self):
+        """Test an invalid row stops the import after committed batches."""
+        path = self._write('recipes.csv', (
+            'title,time_in_minutes,price,link\n'
+            'Soup,10,2.50,http://example.com/1\n'
+            'Salad,soon,1.25,http://example.com/2\n'
+        ))
+
+        with self.assertRaisesMessage(CommandError, 'Row 2'):
+            self._import(path, user=self.user.email, batch_size=1)
+
+        self.assertEqual(
+            list(Recipe.objects.values_list('title', flat=True)),
+            ['Soup'],
+        )
+
+    def test_invalid_jsonl_structure(self):
+        """Test JSON lines that are not recipe objects are reported."""
+        for line, message in [
+            ('["Soup"]', 'Line 2: expected a JSON object'),
+            ('{"title": "Soup", "tags": "Vegan"}',
+             'Line 2: tags must be a list'),
+        ]:
+            path = self._write('recipes.jsonl', (
+                '{"title": "Salad", "time_in_minutes": 5, "price": "1.25",'
+                ' "link": "http://example.com/1"}\n' + line + '\n'
+            ))
+            with self.subTest(line=line), \
+                    self.assertRaisesMessage(CommandError, message):
+                self._import(path, user=self.user.email)
+
+    def test_invalid_tag_reports_row_number(self):
+        """Test tag names the database would reject are reported."""
+        path = self._write('recipes.jsonl', (
+            '{"title": "Soup", "time_in_minutes": 10, "price": "2.50",'
+            ' "link": "http://example.com/1", "tags": ["%s"]}\n' % ('x' * 256)
+        ))
+
+        with self.assertRaisesMessage(CommandError, 'Row 1: invalid tag'):
+            self._import(path, user=self.user.email)
+
+        self.assertFalse(Tag.objects.exists())
+
+    def test_resume_from_state_file(self):
+        """Test a resumed import skips rows already committed."""
+        path = self._write('recipes.csv', (
+            'title,time_in_minutes,price,link\n'
+            'Soup,10,2.50,http://example.com/1\n'
+            'Salad,5,1.25,http://example.com/2\n'
+            'Bread,60,3.00,http://example.com/3\n'
+        ))
+        state_file = self._write('state.json', '{"committed_rows": 2}')
+
+        out = self._import(
+            path,
+            user=self.user.email,
+            state_file=state_file,
+            resume=True,
+        )
+
+        self.assertIn('Resuming after row 2', out)
+        self.assertEqual(
+            list(Recipe.objects.values_list('title', flat=True)),
+            ['Bread'],
+        )
+        self.assertEqual(
+            json.loads(Path(state_file).read_text()),
+            {'committed_rows': 3},
+        )
+
+    def test_unknown_user(self):
+        """Test importing for an unknown user fails."""
+        path = self._write('recipes.csv', 'title\n')
+
+        with self.assertRaises(CommandError):
+            self._import(path, user='nobody@example.com')
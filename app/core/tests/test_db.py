@@ -0,0 +1,139 @@
+"""
+Tests for database connection management.
+"""
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from core import checks
+from core.db import HealthCheckMixin
+from django.db import connection
+from django.db.backends.sqlite3.base import (
+    DatabaseWrapper as SQLiteDatabaseWrapper,
+)
+from django.test import SimpleTestCase, TestCase
+
+
+def mock_connection(**settings_dict):
+    """Return a mock open connection with the given settings."""
+    conn = MagicMock(in_atomic_block=False)
+    conn.settings_dict = {"CONN_MAX_AGE": 60, **settings_dict}
+    return conn
+
+
+class CheckedSQLiteWrapper(HealthCheckMixin, SQLiteDatabaseWrapper):
+    """SQLite connection with the health checks under test."""
+
+
+class HealthCheckTests(SimpleTestCase):
+    """Test lazily health checking persistent connections."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.name = Path(directory.name) / "db.sqlite3"
+
+    def connect(self, **settings_dict):
+        """Return a connection opened by an earlier request."""
+        conn = CheckedSQLiteWrapper({
+            **connection.settings_dict,
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": str(self.name),
+            "CONN_MAX_AGE": None,
+            "CONN_HEALTH_CHECKS": True,
+            "CONN_HEALTH_CHECK_IDLE": 0,
+            **settings_dict,
+        }, alias="health-check")
+        self.addCleanup(conn.close)
+        conn.ensure_connection()
+        # What close_old_connections() does when the next request starts.
+        conn.close_if_unusable_or_obsolete()
+        return conn
+
+    def query(self, conn):
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+    def test_checked_on_first_use(self):
+        """Test a connection is checked once, when a request first uses it."""
+        conn = self.connect()
+
+        with patch.object(conn, "is_usable", return_value=True) as is_usable:
+            is_usable.assert_not_called()
+            self.query(conn)
+            self.query(conn)
+            is_usable.assert_called_once_with()
+
+            # The request finishes and the next one starts.
+            conn.close_if_unusable_or_obsolete()
+            conn.close_if_unusable_or_obsolete()
+            self.assertEqual(is_usable.call_count, 1)
+            self.query(conn)
+            self.assertEqual(is_usable.call_count, 2)
+
+    def test_unusable_connection_replaced(self):
+        """Test a connection failing the health check is reopened."""
+        conn = self.connect()
+        old = conn.connection
+
+        with patch.object(conn, "is_usable", return_value=False):
+            self.query(conn)
+
+        self.assertIsNotNone(conn.connection)
+        self.assertIsNot(conn.connection, old)
+
+    def test_health_checks_skipped(self):
+        """Test recent, atomic and unchecked connections are not checked."""
+        recent = self.connect(CONN_HEALTH_CHECK_IDLE=60)
+        atomic = self.connect()
+        atomic.in_atomic_block = True
+        unchecked = self.connect(CONN_HEALTH_CHECKS=False)
+
+        for conn in [recent, atomic, unchecked]:
+            with self.subTest(conn=conn), \
+                    patch.object(conn, "is_usable") as is_usable:
+                conn.ensure_connection()
+                is_usable.assert_not_called()
+
+
+class ConnectionChecksTests(TestCase):
+    """Test the database system checks."""
+
+    def test_connection_settings(self):
+        """Test invalid connection settings are reported."""
+        for settings_dict, ids in [
+            ({"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True}, []),
+            ({"CONN_MAX_AGE": None}, []),
+            ({"CONN_MAX_AGE": -1}, ["core.E001"]),
+            ({"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True}, ["core.W001"]),
+        ]:
+            conn = MagicMock(settings_dict=settings_dict)
+            with self.subTest(settings_dict=settings_dict), \
+                    patch("core.checks.connections") as patched_connections:
+                patched_connections.__iter__.return_value = ["default"]
+                patched_connections.__getitem__.return_value = conn
+                errors = checks.check_connection_settings(None)
+                self.assertEqual([error.id for error in errors], ids)
+
+    def test_database_connections(self):
+        """Test the database answers queries and passes the health check."""
+        errors = checks.check_database_connections(
+            None,
+            databases=["default"],
+        )
+
+        self.assertEqual(errors, [])
+
+    @patch("core.checks.connections")
+    def test_database_health_check_failure(self, patched_connections):
+        """Test a connection failing the health check is an error."""
+        conn = mock_connection(CONN_HEALTH_CHECKS=True)
+        conn.is_usable.return_value = False
+        patched_connections.__getitem__.return_value = conn
+
+        errors = checks.check_database_connections(
+            None,
+            databases=["default"],
+        )
+
+        self.assertEqual([error.id for error in errors], ["core.E002"])
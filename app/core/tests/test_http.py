@@ -0,0 +1,24 @@
+"""
+Tests for the shared HTTP helpers.
+"""
+from core.http import etag_matches
+from django.test import RequestFactory, SimpleTestCase
+
+
+class EtagMatchesTests(SimpleTestCase):
+    """Test matching If-None-Match headers against an ETag."""
+
+    def _matches(self, header):
+        request = RequestFactory().get("/", HTTP_IF_NONE_MATCH=header)
+        return etag_matches(request, '"abc"')
+
+    def test_matches(self):
+        """Test exact, weak, listed and wildcard ETags match."""
+        for header in ['"abc"', 'W/"abc"', '"xyz", "abc"', "*"]:
+            with self.subTest(header=header):
+                self.assertTrue(self._matches(header))
+
+    def test_no_match(self):
+        """Test other ETags and a missing header do not match."""
+        self.assertFalse(self._matches('"xyz"'))
+        self.assertFalse(etag_matches(RequestFactory().get("/"), '"abc"'))
@@ -0,0 +1,293 @@
+"""
+Tests for the request metrics and their exposition endpoint.
+"""
+import asyncio
+import gc
+import tempfile
+import threading
+from decimal import Decimal
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from core import metrics
+from core.middleware import metrics_middleware
+from core.models import Recipe
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+METRICS_URL = reverse("api-metrics")
+RECIPES_URL = reverse("recipe:recipe-list")
+TAGS_URL = reverse("recipe:tag-list")
+ME_URL = reverse("user:me")
+
+
+def request_counts():
+    """Return the request counts by (view, action, status)."""
+    return {
+        labelvalues: sum(values[:-1])
+        for labelvalues, values in metrics.request_duration.values().items()
+    }
+
+
+class RegistryTests(SimpleTestCase):
+    """Test recording and aggregating metric values."""
+
+    def setUp(self):
+        self.registry = metrics.Registry()
+        self.requests = self.registry.counter("requests_total", "Requests.",
+                                              ["code"])
+        self.latency = self.registry.histogram(
+            "latency_seconds", "Latency.", ["view"], buckets=[0.1, 0.2, 0.4],
+        )
+
+    def test_thread_shards_merged(self):
+        """Test values recorded by several threads add up when collected."""
+        def work():
+            for _ in range(1000):
+                self.requests.inc("200")
+                self.latency.observe(0.15, "list")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.requests.values(), {("200",): 4000})
+        values = self.latency.values()[("list",)]
+        self.assertEqual(values[:-1], [0, 4000, 0, 0])
+        self.assertAlmostEqual(values[-1], 600)
+
+    def test_exited_thread_shards_retired(self):
+        """Test shards of exited threads are folded into one."""
+        def work():
+            self.requests.inc("200")
+            self.latency.observe(0.15, "list")
+
+        for _ in range(50):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        self.assertEqual(len(self.registry._shards), 0)
+        self.assertEqual(self.requests.values(), {("200",): 50})
+        self.assertEqual(self.latency.values()[("list",)][:-1], [0, 50, 0, 0])
+
+        self.registry.clear()
+        self.assertEqual(self.requests.values(), {})
+
+    def test_histogram_quantiles(self):
+        """Test quantiles are interpolated within their bucket."""
+        for value in [0.05] * 50 + [0.3] * 50:
+            self.latency.observe(value, "list")
+        self.latency.observe(1, "list")
+        values = self.latency.values()[("list",)]
+
+        self.assertEqual(values[:-1], [50, 0, 50, 1])
+        self.assertAlmostEqual(self.latency.quantile(0.5, values), 0.202)
+        self.assertAlmostEqual(self.latency.quantile(0.95, values), 0.3838)
+        self.assertEqual(self.latency.quantile(0.999, values), 0.4)
+        self.assertEqual(self.latency.quantile(0.5, [0, 0, 0, 0, 0]), 0.0)
+
+    def test_clear(self):
+        """Test clearing one metric keeps the others."""
+        self.requests.inc("200")
+        self.latency.observe(0.1, "list")
+
+        self.requests.clear()
+
+        self.assertEqual(self.requests.values(), {})
+        self.assertIn(("list",), self.latency.values())
+
+    def test_file_store_aggregates_processes(self):
+        """Test a scrape adds up the values saved by other processes."""
+        other = metrics.Registry()
+        other_requests = other.counter("requests_total", "Requests.",
+                                       ["code"])
+        other_requests.inc("200", amount=5)
+        other_requests.inc("500")
+        self.requests.inc("200", amount=2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            metrics.FileStore(other, directory, 5).flush()
+            store = metrics.FileStore(self.registry, directory, 5)
+            values = store.collect()["requests_total"]
+            store.maybe_flush()
+            store.maybe_flush()
+            files = len(list(store.directory.iterdir()))
+
+        self.assertEqual(values, {("200",): 7, ("500",): 1})
+        self.assertEqual(files, 2)
+
+
+class ExpositionTests(SimpleTestCase):
+    """Test the text exposition format."""
+
+    def test_exposition(self):
+        """Test histograms expose cumulative buckets and quantiles."""
+        buckets = len(metrics.DEFAULT_BUCKETS)
+        values = {
+            "http_request_duration_seconds": {
+                ("RecipeViewSet", "list", "200"):
+                    [2] + [0] * (buckets - 1) + [1, 0, 3.5],
+            },
+            "recipe_response_cache_requests_total": {
+                ('a"b\\c', ): 4,
+            },
+        }
+
+        text = metrics.exposition(values)
+
+        labels = 'view="RecipeViewSet",action="list",status="200"'
+        self.assertIn(
+            "# TYPE http_request_duration_seconds histogram\n", text,
+        )
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{{labels},le="0.001"}} 2\n',
+            text,
+        )
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{{labels},le="10"}} 2\n',
+            text,
+        )
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3\n',
+            text,
+        )
+        self.assertIn(
+            f"http_request_duration_seconds_sum{{{labels}}} 3.5\n", text,
+        )
+        self.assertIn(
+            f"http_request_duration_seconds_count{{{labels}}} 3\n", text,
+        )
+        self.assertIn(
+            "# TYPE http_request_duration_quantile_seconds gauge\n", text,
+        )
+        self.assertIn(
+            f'http_request_duration_quantile_seconds{{{labels},'
+            f'quantile="0.99"}} 10\n',
+            text,
+        )
+        self.assertIn(
+            'recipe_response_cache_requests_total{result="a\\"b\\\\c"} 4\n',
+            text,
+        )
+
+
+@override_settings(RECIPE_RESPONSE_CACHE_TIMEOUT=0)
+class AsyncMetricsMiddlewareTests(SimpleTestCase):
+    """Test recording metrics of async requests."""
+
+    def test_flush_off_event_loop(self):
+        """Test values are saved to the shared directory from a thread."""
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = metrics_middleware(get_response)
+        flushed_on_loop = []
+
+        def flush(store):
+            try:
+                asyncio.get_running_loop()
+                flushed_on_loop.append(True)
+            except RuntimeError:
+                flushed_on_loop.append(False)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            METRICS={"ENABLED": True, "MULTIPROCESS_DIR": directory,
+                     "FLUSH_INTERVAL": 5, "TOKEN": ""},
+        ), patch.object(metrics.FileStore, "flush", flush):
+            async_to_sync(middleware)(RequestFactory().get("/"))
+        metrics.registry.clear()
+
+        self.assertEqual(flushed_on_loop, [False])
+
+
+class MetricsEndpointTests(TestCase):
+    """Test request metrics recorded by the middleware."""
+
+    def setUp(self):
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_viewset_actions_labelled(self):
+        """Test requests are labelled by viewset, action and status."""
+        recipe = Recipe.objects.create(
+            user=self.user,
+            title="Recipe",
+            time_in_minutes=5,
+            price=Decimal("1.00"),
+        )
+
+        self.client.get(RECIPES_URL)
+        self.client.get(RECIPES_URL)
+        self.client.get(reverse("recipe:recipe-detail", args=[recipe.id]))
+        self.client.post(RECIPES_URL, {"title": ""})
+        self.client.get(TAGS_URL)
+        self.client.patch(ME_URL, {"name": "New name"})
+        self.client.get("/api/does-not-exist/")
+
+        self.assertEqual(request_counts(), {
+            ("RecipeViewSet", "list", "200"): 2,
+            ("RecipeViewSet", "retrieve", "200"): 1,
+            ("RecipeViewSet", "create", "400"): 1,
+            ("TagViewSet", "list", "200"): 1,
+            ("ManageUserView", "patch", "200"): 1,
+            ("unmatched", "get", "404"): 1,
+        })
+
+    def test_metrics_endpoint(self):
+        """Test the endpoint exposes recorded requests."""
+        self.client.get(TAGS_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], metrics.CONTENT_TYPE)
+        self.assertIn(
+            'http_request_duration_seconds_count{view="TagViewSet",'
+            'action="list",status="200"} 1\n',
+            res.content.decode(),
+        )
+
+    @override_settings(METRICS={
+        "ENABLED": True,
+        "MULTIPROCESS_DIR": "",
+        "FLUSH_INTERVAL": 5,
+        "TOKEN": "secret",
+    })
+    def test_metrics_endpoint_token(self):
+        """Test a configured token is required to scrape."""
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS={
+        "ENABLED": False,
+        "MULTIPROCESS_DIR": "",
+        "FLUSH_INTERVAL": 5,
+        "TOKEN": "",
+    })
+    def test_metrics_disabled(self):
+        """Test no latencies are recorded when metrics are disabled."""
+        self.client.get(TAGS_URL)
+
+        self.assertEqual(request_counts(), {})
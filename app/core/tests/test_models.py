@@ -2,9 +2,11 @@
 Tests for models.
 """
 from decimal import Decimal
+from unittest import skipUnless
 
 from core import models
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
 from django.test import TestCase
 
 
@@ -80,3 +82,52 @@ class ModelTests(TestCase):
         )
 
         self.assertEqual(str(tag), tag.name)
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN output is SQLite's.")
+class IndexUsageTests(TestCase):
+    """Test the planner uses the composite indexes for hot queries."""
+
+    def setUp(self):
+        self.user = create_test_user()
+
+    def test_recipe_list_uses_user_id_index(self):
+        """Test listing a user's recipes by -id scans the composite index."""
+        plan = (
+            models.Recipe.objects.filter(user=self.user)
+            .order_by("-id")
+            .explain()
+        )
+
+        self.assertIn("recipe_user_id_desc_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_tag_list_uses_user_name_index(self):
+        """Test listing a user's tags by -name scans the composite index."""
+        plan = (
+            models.Tag.objects.filter(user=self.user)
+            .order_by("-name", "-id")
+            .explain()
+        )
+
+        self.assertIn("tag_user_name_desc_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_tag_lookup_uses_unique_index(self):
+        """Test looking up tags by (user, name) uses the unique index."""
+        plan = models.Tag.objects.filter(
+            user=self.user,
+            name__in=["a", "b"],
+        ).explain()
+
+        self.assertRegex(
+            plan,
+            r"USING (COVERING )?INDEX \S+ \(user_id=\? AND name=\?\)",
+        )
+
+    def test_tag_name_unique_per_user(self):
+        """Test a user cannot have two tags with the same name."""
+        models.Tag.objects.create(user=self.user, name="Vegan")
+
+        with self.assertRaises(IntegrityError):
+            models.Tag.objects.create(user=self.user, name="Vegan")
@@ -0,0 +1,108 @@
+"""
+Tests for renderers and parsers.
+"""
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+PAYLOAD = {
+    "id": 1,
+    "title": "Caf\u00e9 \u2028 \u2029 \"quoted\"",
+    "price": Decimal("5.50"),
+    "created": datetime.datetime(
+        2021, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc,
+    ),
+    "date": datetime.date(2021, 5, 1),
+    "time": datetime.time(12, 30, 15, 123456),
+    "duration": datetime.timedelta(minutes=5),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "label": gettext_lazy("Recipe"),
+    "counts": {1: "one"},
+    "tags": [{"id": 2, "name": "Vegan"}],
+    "link": None,
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Test FastJSONRenderer output matches JSONRenderer."""
+
+    def assertSameOutput(self, data, **kwargs):
+        self.assertEqual(
+            FastJSONRenderer().render(data, **kwargs),
+            JSONRenderer().render(data, **kwargs),
+        )
+
+    def test_render_matches_json_renderer(self):
+        """Test rendering special types matches JSONRenderer."""
+        self.assertSameOutput(PAYLOAD)
+        self.assertIn(b"\\u2028", FastJSONRenderer().render(PAYLOAD))
+
+    def test_render_indent_matches_json_renderer(self):
+        """Test indented output falls back to JSONRenderer."""
+        self.assertSameOutput(
+            PAYLOAD,
+            accepted_media_type="application/json; indent=4",
+        )
+
+    def test_render_none(self):
+        """Test rendering None returns an empty body."""
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_render_unsupported_type_error(self):
+        """Test unsupported types raise like JSONRenderer."""
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({"value": object()})
+
+    def test_render_large_int_falls_back(self):
+        """Test integers orjson cannot encode are rendered."""
+        self.assertSameOutput({"value": 2 ** 70})
+
+    @patch("core.renderers.orjson", None)
+    def test_render_without_orjson(self):
+        """Test rendering works when orjson is not installed."""
+        self.assertSameOutput(PAYLOAD)
+
+
+class FastJSONParserTests(SimpleTestCase):
+    """Test FastJSONParser output matches JSONParser."""
+
+    def assertSameResult(self, content, **kwargs):
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(content), **kwargs),
+            JSONParser().parse(io.BytesIO(content), **kwargs),
+        )
+
+    def test_parse_matches_json_parser(self):
+        """Test parsing matches JSONParser."""
+        content = FastJSONRenderer().render(PAYLOAD)
+
+        self.assertSameResult(content)
+
+    def test_parse_other_encoding(self):
+        """Test non UTF-8 bodies are decoded with their charset."""
+        self.assertSameResult(
+            '{"title": "Caf\u00e9"}'.encode("latin-1"),
+            parser_context={"encoding": "latin-1"},
+        )
+
+    def test_parse_invalid_json_error(self):
+        """Test invalid JSON raises a ParseError."""
+        for content in [b"{", b"[NaN]", b"\xff"]:
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError):
+                    FastJSONParser().parse(io.BytesIO(content))
+
+    @patch("core.parsers.orjson", None)
+    def test_parse_without_orjson(self):
+        """Test parsing works when orjson is not installed."""
+        self.assertSameResult(b'{"title": "Curry", "tags": []}')
@@ -0,0 +1,301 @@
+"""
+Tests for read replica routing.
+"""
+import asyncio
+from unittest import skipUnless
+
+from asgiref.sync import async_to_sync
+from core.checks import check_replica_pin_cache
+from core.middleware import replica_routing_middleware
+from core.models import Recipe, Tag
+from core.routers import PrimaryReplicaRouter, _replica_reads, replica_reads
+from django.contrib.auth import SESSION_KEY, get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+REPLICAS = ["replica_0", "replica_1"]
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    """Test routing queries between the primary and replicas."""
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_use_primary_by_default(self):
+        """Test reads outside replica_reads() go to the primary."""
+        self.assertEqual(self.router.db_for_read(Recipe), "default")
+
+    def test_reads_use_replicas(self):
+        """Test reads inside replica_reads() are spread over replicas."""
+        with replica_reads():
+            used = {self.router.db_for_read(Recipe) for _ in range(50)}
+
+        self.assertEqual(used, set(REPLICAS))
+
+    def test_token_reads_use_primary(self):
+        """Test tokens are always read from the primary."""
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Token), "default")
+
+    def test_writes_use_primary(self):
+        """Test writes always go to the primary."""
+        with replica_reads():
+            self.assertEqual(self.router.db_for_write(Recipe), "default")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        """Test reads use the primary when no replica is configured."""
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Recipe), "default")
+
+    def test_migrations_skip_replicas(self):
+        """Test migrations never run on replicas."""
+        self.assertIsNone(self.router.allow_migrate("default", "core"))
+        self.assertFalse(self.router.allow_migrate("replica_0", "core"))
+
+    def test_relations_across_replicas(self):
+        """Test objects read from a replica relate to primary objects."""
+        recipe, tag = Recipe(), Tag()
+        recipe._state.db, tag._state.db = "replica_1", "default"
+
+        self.assertTrue(self.router.allow_relation(recipe, tag))
+
+
+class ReplicaPinCacheCheckTests(SimpleTestCase):
+    """Test replicas require a cache shared by every process."""
+
+    @override_settings(DATABASE_REPLICAS=REPLICAS, SINGLE_PROCESS=False)
+    def test_per_process_cache_error(self):
+        """Test pins in a cache private to each process are an error."""
+        errors = check_replica_pin_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["core.E003"])
+
+    def test_shared_cache(self):
+        """Test a shared cache, one process or no replicas are fine."""
+        for overrides in [
+            {"DATABASE_REPLICAS": REPLICAS, "SINGLE_PROCESS": True},
+            {"DATABASE_REPLICAS": [], "SINGLE_PROCESS": False},
+        ]:
+            with self.subTest(**overrides), override_settings(**overrides):
+                self.assertEqual(check_replica_pin_cache(None), [])
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS, REPLICA_PIN_SECONDS=60)
+class ReplicaRoutingMiddlewareTests(TestCase):
+    """Test choosing replica reads per request."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123",
+        )
+        self.token = Token.objects.create(user=self.user).key
+        other = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="testpass123",
+        )
+        self.other_token = Token.objects.create(user=other).key
+        self.users = {self.token: self.user, self.other_token: other}
+        self.middleware = replica_routing_middleware(self._view)
+
+    def _view(self, request):
+        # DRF sets the user on the request once it authenticates it.
+        if "HTTP_AUTHORIZATION" in request.META:
+            request.user = self.users.get(
+                request.META["HTTP_AUTHORIZATION"].split()[1],
+                AnonymousUser(),
+            )
+        return _replica_reads.get()
+
+    def _request(self, method, token=None):
+        return self.factory.generic(
+            method,
+            "/api/recipe/recipes/",
+            HTTP_AUTHORIZATION=f"Token {token or self.token}",
+        )
+
+    def _replica_reads(self, method, token=None):
+        """Return whether replica reads were allowed for a request."""
+        return self.middleware(self._request(method, token))
+
+    def test_safe_requests_read_replicas(self):
+        """Test safe requests may read from replicas."""
+        for method in ["GET", "HEAD", "OPTIONS"]:
+            with self.subTest(method=method):
+                self.assertTrue(self._replica_reads(method))
+        self.assertFalse(_replica_reads.get())
+
+    def test_write_pins_user_to_primary(self):
+        """Test reads after a write stay on the primary for that user."""
+        self.assertFalse(self._replica_reads("POST"))
+
+        self.assertFalse(self._replica_reads("GET"))
+        self.assertTrue(self._replica_reads("GET", token=self.other_token))
+
+    def test_pin_covers_sessions(self):
+        """Test the pin applies to the user's sessions, not just a token."""
+        self._replica_reads("POST")
+        request = self.factory.get("/admin/")
+        request.session = {SESSION_KEY: str(self.user.pk)}
+
+        self.assertFalse(self.middleware(request))
+
+    def test_unknown_credentials(self):
+        """Test requests with unknown tokens or no session use replicas."""
+        self._replica_reads("POST")
+
+        self.assertTrue(self._replica_reads("GET", token="unknown"))
+        self.assertTrue(self.middleware(self.factory.get("/admin/")))
+
+    @override_settings(REPLICA_PIN_SECONDS=0)
+    def test_pin_expires(self):
+        """Test reads return to replicas after the pin window."""
+        self._replica_reads("PATCH")
+
+        self.assertTrue(self._replica_reads("GET"))
+
+    def test_no_replicas(self):
+        """Test nothing is routed or pinned without replicas."""
+        with self.settings(DATABASE_REPLICAS=[]):
+            self.assertFalse(self._replica_reads("GET"))
+            self._replica_reads("POST")
+
+        self.assertTrue(self._replica_reads("GET"))
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS, REPLICA_PIN_SECONDS=60)
+class AsyncReplicaRoutingMiddlewareTests(TransactionTestCase):
+    """Test choosing replica reads for async requests."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123",
+        )
+        self.token = Token.objects.create(user=self.user).key
+
+    def test_async_requests(self):
+        """Test async requests are routed and pinned on the event loop."""
+        async def get_response(request):
+            request.user = self.user
+            return _replica_reads.get()
+
+        middleware = replica_routing_middleware(get_response)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+
+        def replica_reads_allowed(method, token=None):
+            request = self.factory.generic(
+                method,
+                "/api/recipe/async/recipes/",
+                HTTP_AUTHORIZATION=f"Token {token or self.token}",
+            )
+            return async_to_sync(middleware)(request)
+
+        self.assertTrue(replica_reads_allowed("GET"))
+        self.assertFalse(replica_reads_allowed("POST"))
+        self.assertFalse(replica_reads_allowed("GET"))
+        self.assertTrue(replica_reads_allowed("GET", token="unknown"))
+
+
+@skipUnless(connection.vendor == "sqlite", "Uses shared SQLite test DBs.")
+@override_settings(DATABASE_REPLICAS=["replica"], REPLICA_PIN_SECONDS=60)
+class ReplicaRoutingAPITests(TransactionTestCase):
+    """
+    Test API requests against a second SQLite alias acting as a replica.
+
+    The alias is added once the test database exists and opens its own
+    connection to it, standing in for a streaming replica.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        connections.settings["replica"] = {
+            **connections["default"].settings_dict,
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        connections["replica"].close()
+        del connections["replica"]
+        del connections.settings["replica"]
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123",
+        )
+        token = Token.objects.create(user=user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def _queries(self, method, url, data=None):
+        """Return the number of queries run on each alias by a request."""
+        with CaptureQueriesContext(connections["default"]) as primary, \
+                CaptureQueriesContext(connections["replica"]) as replica:
+            res = getattr(self.client, method)(url, data, format="json")
+        self.assertLess(res.status_code, 400)
+        return len(primary), len(replica)
+
+    def test_reads_from_replica_until_write(self):
+        """Test list reads use the replica except just after a write."""
+        url = reverse("recipe:recipe-list")
+
+        primary, replica = self._queries("get", url)
+        self.assertEqual(primary, 1)
+        self.assertGreater(replica, 0)
+
+        primary, replica = self._queries("post", url, {
+            "title": "Curry",
+            "time_in_minutes": 10,
+            "price": "5.00",
+            "link": "http://example.com/curry.pdf",
+        })
+        self.assertEqual(replica, 0)
+
+        primary, replica = self._queries("get", url)
+        self.assertGreater(primary, 1)
+        self.assertEqual(replica, 0)
+
+    @override_settings(SINGLE_PROCESS=True)
+    def test_replica_reads_not_cached(self):
+        """Test only bodies read from the primary are cached and tagged."""
+        url = reverse("recipe:recipe-list")
+
+        for _ in range(2):
+            res = self.client.get(url)
+            self.assertNotIn("ETag", res)
+        primary, replica = self._queries("get", url)
+        self.assertGreater(replica, 0)
+
+        self._queries("post", url, {
+            "title": "Curry",
+            "time_in_minutes": 10,
+            "price": "5.00",
+            "link": "http://example.com/curry.pdf",
+        })
+        res = self.client.get(url)
+        self.assertIn("ETag", res)
+        primary, replica = self._queries("get", url)
+        self.assertEqual((primary, replica), (0, 0))
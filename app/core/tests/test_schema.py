@@ -0,0 +1,157 @@
+"""
+Tests for the pre-rendered OpenAPI schema.
+"""
+import gzip
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework import status
+
+from core import schema
+
+SCHEMA_URL = reverse("api-schema")
+
+
+class CachedSchemaTests(SimpleTestCase):
+    """Test serving the schema from the schema cache."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.settings = override_settings(SCHEMA_CACHE={
+            "DIR": self.cache_dir.name,
+            "VERSION": "v1",
+        })
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+        schema.clear_schema_cache()
+        self.addCleanup(schema.clear_schema_cache)
+
+    def test_schema_matches_generated_schema(self):
+        """Test the cached YAML and JSON documents match the generator."""
+        expected = SchemaGenerator().get_schema(request=None, public=True)
+
+        res = self.client.get(SCHEMA_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith(
+            "application/vnd.oai.openapi"
+        ))
+        self.assertEqual(yaml.safe_load(res.content), expected)
+
+        res = self.client.get(SCHEMA_URL, {"format": "json"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(res.content), expected)
+
+    def test_schema_generated_once(self):
+        """Test repeat requests are served without generating the schema."""
+        with patch(
+            "core.schema.generate_schema",
+            wraps=schema.generate_schema,
+        ) as generate:
+            first = self.client.get(SCHEMA_URL)
+            second = self.client.get(SCHEMA_URL)
+
+        generate.assert_called_once()
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_schema_not_modified(self):
+        """Test a matching If-None-Match returns 304."""
+        etag = self.client.get(SCHEMA_URL)["ETag"]
+
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+    def test_schema_gzip(self):
+        """Test the schema is gzipped when the client accepts it."""
+        plain = self.client.get(SCHEMA_URL)
+
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res["Vary"])
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+        self.assertLess(len(res.content), len(plain.content))
+        self.assertEqual(res["ETag"], plain["ETag"])
+
+    def test_schema_loaded_from_disk(self):
+        """Test another process reuses the document saved on disk."""
+        content = self.client.get(SCHEMA_URL).content
+        schema.clear_schema_cache()
+
+        with patch("core.schema.generate_schema") as generate:
+            res = self.client.get(SCHEMA_URL)
+
+        generate.assert_not_called()
+        self.assertEqual(res.content, content)
+
+    def test_schema_regenerated_for_new_version(self):
+        """Test a new version does not reuse the old version's document."""
+        self.client.get(SCHEMA_URL)
+
+        with override_settings(SCHEMA_CACHE={
+            "DIR": self.cache_dir.name,
+            "VERSION": "v2",
+        }), patch(
+            "core.schema.generate_schema",
+            wraps=schema.generate_schema,
+        ) as generate:
+            schema.clear_schema_cache()
+            self.client.get(SCHEMA_URL)
+
+        generate.assert_called_once()
+        self.assertEqual(len(list(Path(self.cache_dir.name).iterdir())), 2)
+
+    @override_settings(SCHEMA_CACHE={"DIR": "", "VERSION": ""})
+    def test_schema_memory_only(self):
+        """Test the schema is served without a disk cache."""
+        res = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(schema.schema_version()), 16)
+
+    def test_unsupported_language_shares_default_document(self):
+        """Test unknown ?lang values reuse the default document."""
+        self.client.get(SCHEMA_URL)
+
+        with patch("core.schema.generate_schema") as generate:
+            res = self.client.get(SCHEMA_URL, {"lang": "not-a-language"})
+
+        generate.assert_not_called()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_pregenerate_schema(self):
+        """Test the command writes the schema documents to disk."""
+        out = StringIO()
+        call_command("pregenerate_schema", stdout=out)
+
+        names = sorted(
+            path.name for path in Path(self.cache_dir.name).iterdir()
+        )
+        self.assertEqual(
+            names,
+            ["schema-v1-en-us.json", "schema-v1-en-us.yaml"],
+        )
+        self.assertIn("Schema version v1 is ready.", out.getvalue())
+
+        schema.clear_schema_cache()
+        with patch("core.schema.generate_schema") as generate:
+            self.client.get(SCHEMA_URL)
+        generate.assert_not_called()
+
+    def test_pregenerate_schema_unknown_language(self):
+        """Test the command rejects unknown languages."""
+        with self.assertRaises(CommandError):
+            call_command("pregenerate_schema", lang=["not-a-language"])
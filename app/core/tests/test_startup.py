@@ -0,0 +1,146 @@
+"""
+Tests for startup profiling and lazily loaded routes.
+"""
+import importlib
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import URLResolver, include, path
+from django.urls.resolvers import RegexPattern
+
+from core.lazy import lazy_include, lazy_view
+from core.startup import parse_import_times, profile_startup
+
+# Modules only needed by the admin and the schema routes.
+DEFERRED_MODULES = [
+    'core.admin',
+    'core.admin_urls',
+    'core.schema',
+    'django.contrib.auth.admin',
+    'drf_spectacular.generators',
+    'drf_spectacular.views',
+]
+
+# Modules app.wsgi may load beyond a bare django.setup(): the URLconf, the
+# views it imports and the middleware.
+MAX_EXTRA_MODULES = 130
+
+# Times the phases of app.wsgi may take relative to a bare django.setup()
+# measured in the same run.
+MAX_SETUP_RATIO = 2
+
+IMPORT_TIMES = """\
+import time: self [us] | cumulative | imported package
+import time:        10 |         10 |     c
+import time:        20 |         30 |   b
+import time:         5 |          5 |   d
+import time:        40 |         75 | a
+import time:         7 |          7 | e
+"""
+
+
+class ParseImportTimesTests(SimpleTestCase):
+    """Test parsing python -X importtime output."""
+
+    def test_parse_import_tree(self):
+        """Test imports are nested under the module importing them."""
+        roots = parse_import_times(IMPORT_TIMES)
+
+        self.assertEqual([node.name for node in roots], ['a', 'e'])
+        a = roots[0]
+        self.assertEqual((a.self_us, a.cumulative_us), (40, 75))
+        self.assertEqual([node.name for node in a.children], ['b', 'd'])
+        self.assertEqual([node.name for node in a.children[0].children], ['c'])
+
+
+class LazyRouteTests(SimpleTestCase):
+    """Test lazy routes import their views when first used."""
+
+    def test_lazy_view_imported_on_first_request(self):
+        """Test the view class is imported once, on the first request."""
+        view_class = MagicMock()
+        request = RequestFactory().get('/api/schema/')
+
+        with patch('core.lazy.import_string',
+                   return_value=view_class) as import_string:
+            view = lazy_view('core.schema.CachedSpectacularAPIView', a=1)
+            import_string.assert_not_called()
+            view(request)
+            view(request)
+
+        import_string.assert_called_once_with(
+            'core.schema.CachedSpectacularAPIView',
+        )
+        view_class.as_view.assert_called_once_with(a=1)
+        self.assertEqual(view_class.as_view.return_value.call_count, 2)
+
+    def test_lazy_include_imported_on_first_use(self):
+        """Test the urlconf is imported when a URL under it is resolved."""
+        resolver = URLResolver(RegexPattern(r'^/'), [
+            lazy_include('admin/', 'core.admin_urls', 'admin', 'admin'),
+            path('api/user/', include('user.urls')),
+        ])
+
+        with patch('django.urls.resolvers.import_module',
+                   wraps=importlib.import_module) as import_module:
+            resolver.reverse_dict
+            resolver.resolve('/api/user/me/')
+            import_module.assert_not_called()
+
+            resolver.resolve('/admin/')
+            import_module.assert_called_once_with('core.admin_urls')
+
+
+class StartupTests(SimpleTestCase):
+    """Test a cold start of the WSGI entry point."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.profile = profile_startup('wsgi')
+        cls.bare = profile_startup('manage', urlconf=False)
+
+    def test_startup_phases(self):
+        """Test every phase of the start is timed within the total."""
+        self.assertLessEqual(
+            {'settings', 'app configs', 'models', 'ready', 'middleware',
+             'urlconf', 'other', 'total'},
+            set(self.profile.phases),
+        )
+        self.assertLessEqual(
+            self.profile.phases['total'],
+            self.profile.wall_ms,
+        )
+
+    def test_admin_and_schema_deferred(self):
+        """Test the admin and schema modules are not imported at startup."""
+        self.assertIn('app.urls', self.profile.modules)
+        for module in DEFERRED_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, self.profile.modules)
+
+    def test_extra_modules_bounded(self):
+        """Test the WSGI start loads few modules beyond django.setup()."""
+        self.assertNotIn('app.urls', self.bare.modules)
+        extra = self.profile.modules - self.bare.modules
+        self.assertLessEqual(len(extra), MAX_EXTRA_MODULES, sorted(extra))
+
+    def test_startup_time_bounded(self):
+        """Test the WSGI start takes little longer than django.setup()."""
+        self.assertLessEqual(
+            self.profile.phases['total'],
+            self.bare.phases['total'] * MAX_SETUP_RATIO,
+        )
+
+    def test_profile_startup_command(self):
+        """Test the command reports phases and the import tree."""
+        out = StringIO()
+        call_command('profile_startup', entry='manage', min_ms=0, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('Startup of manage:', output)
+        for phase in ['settings', 'app configs', 'models', 'ready']:
+            self.assertIn(f'  {phase} ', output)
+        self.assertIn('django.apps', output)
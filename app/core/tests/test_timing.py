@@ -0,0 +1,92 @@
+"""
+Tests for the request timing middleware.
+"""
+import re
+from decimal import Decimal
+
+from core.models import Recipe
+from core.timing import current_timing
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+RECIPES_URL = reverse("recipe:recipe-list")
+
+SERVER_TIMING = re.compile(
+    r'db;dur=[\d.]+;desc="(?P<queries>\d+) queries", '
+    r"view;dur=[\d.]+, render;dur=[\d.]+, total;dur=[\d.]+"
+)
+
+
+@override_settings(
+    REQUEST_TIMING={"ENABLED": True, "SAMPLE_RATE": 1},
+    RECIPE_RESPONSE_CACHE_TIMEOUT=0,
+)
+class RequestTimingTests(TestCase):
+    """Test timing requests with Server-Timing headers and logs."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for i in range(3):
+            Recipe.objects.create(
+                user=self.user,
+                title=f"Recipe {i}",
+                time_in_minutes=5,
+                price=Decimal("1.00"),
+            )
+
+    def test_request_timed(self):
+        """Test a sampled request reports its queries and phase timings."""
+        with CaptureQueriesContext(connection) as queries, \
+                self.assertLogs("core.timing", "INFO") as logs:
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        match = SERVER_TIMING.fullmatch(res["Server-Timing"])
+        self.assertIsNotNone(match, res["Server-Timing"])
+        self.assertEqual(int(match["queries"]), len(queries))
+
+        record = logs.records[0]
+        self.assertEqual(record.method, "GET")
+        self.assertEqual(record.path, RECIPES_URL)
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.queries, len(queries))
+        self.assertGreater(record.render_ms, 0)
+        self.assertGreaterEqual(
+            record.total_ms,
+            record.db_ms + record.view_ms + record.render_ms,
+        )
+        self.assertIsNone(current_timing.get())
+
+    @override_settings(REQUEST_TIMING={"ENABLED": True, "SAMPLE_RATE": 0})
+    def test_request_not_sampled(self):
+        """Test requests outside the sample are not timed."""
+        with self.assertNoLogs("core.timing"):
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", res)
+
+    @override_settings(REQUEST_TIMING={"ENABLED": False, "SAMPLE_RATE": 1})
+    def test_timing_disabled(self):
+        """Test the middleware is not used unless enabled."""
+        res = self.client.get(RECIPES_URL)
+
+        self.assertNotIn("Server-Timing", res)
+
+    async def test_async_request_timed(self):
+        """Test requests through the ASGI handler are timed."""
+        with self.assertLogs("core.timing", "INFO"):
+            res = await self.async_client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIsNotNone(SERVER_TIMING.fullmatch(res["Server-Timing"]))
@@ -0,0 +1,115 @@
+"""
+Per-request timing collected by core.middleware.RequestTimingMiddleware.
+
+The timing of the request being handled is kept in a context variable, so
+query_timer (installed as an execute wrapper on each database connection)
+finds it in sync and async code alike. Requests that are not sampled leave
+it unset and query_timer only looks it up.
+"""
+import logging
+import time
+from contextvars import ContextVar
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+current_timing = ContextVar('current_timing', default=None)
+
+
+def query_timer(execute, sql, params, many, context):
+    """Execute wrapper adding each query to the current request's timing."""
+    timing = current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.queries += 1
+        timing.db += time.perf_counter() - start
+
+
+def install_query_timer():
+    """Add query_timer to this thread's database connections."""
+    for connection in connections.all():
+        if query_timer not in connection.execute_wrappers:
+            connection.execute_wrappers.append(query_timer)
+
+
+class RequestTiming:
+    """
+    Durations, in seconds, of the phases of one request.
+
+    view is the time spent in the view outside of queries, which for the
+    API is mostly serialization; render is the time spent rendering the
+    response, e.g. to JSON.
+    """
+    __slots__ = ('start', 'queries', 'db', 'view', 'render', 'total',
+                 '_phase', '_mark', '_mark_db')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db = self.view = self.render = self.total = 0.0
+        self._phase = None
+
+    def view_started(self):
+        self._phase = 'view'
+        self._mark, self._mark_db = time.perf_counter(), self.db
+
+    def _end_view(self, now):
+        if self._phase == 'view':
+            self.view = now - self._mark - (self.db - self._mark_db)
+            self._phase = None
+
+    def render_started(self):
+        now = time.perf_counter()
+        self._end_view(now)
+        self._phase, self._mark = 'render', now
+
+    def render_finished(self, response):
+        if self._phase == 'render':
+            self.render = time.perf_counter() - self._mark
+            self._phase = None
+        return response
+
+    def finish(self):
+        now = time.perf_counter()
+        self._end_view(now)
+        self.total = now - self.start
+
+    def fields(self):
+        """Return the timings as structured log fields."""
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db * 1000, 3),
+            'view_ms': round(self.view * 1000, 3),
+            'render_ms': round(self.render * 1000, 3),
+            'total_ms': round(self.total * 1000, 3),
+        }
+
+    def server_timing(self):
+        """Return the timings as a Server-Timing header value."""
+        return (
+            f'db;dur={self.db * 1000:.3f};desc="{self.queries} queries", '
+            f'view;dur={self.view * 1000:.3f}, '
+            f'render;dur={self.render * 1000:.3f}, '
+            f'total;dur={self.total * 1000:.3f}'
+        )
+
+    def log(self, request, response):
+        """Log the timings with the request as structured fields."""
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **self.fields(),
+        }
+        logger.info(
+            '%(method)s %(path)s %(status)s: %(total_ms).1f ms, '
+            '%(queries)d queries in %(db_ms).1f ms',
+            fields,
+            extra=fields,
+        )
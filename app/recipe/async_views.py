@@ -0,0 +1,74 @@
+"""
+Async read views for the Recipe APIs.
+
+Polling clients mostly repeat reads whose answer is already known: an
+unchanged ETag or a rendered response in the cache. Under ASGI these views
+serve those without a database query or a hop to the sync thread: from the
+event loop with in-memory caches, or from a worker thread with a network
+cache, whose sync-only calls would block the loop (see
+core.async_views). Anything else runs the RecipeViewSet/TagViewSet view in a
+thread, so apart from links and ETags, which depend on the URL, responses
+are the same as from the sync endpoints.
+"""
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.async_views import async_read_view
+from core.http import etag_matches
+from recipe import views
+from recipe.caching import (
+    cache_is_shared,
+    load_response,
+    record_cache_access,
+    response_cache_key,
+    response_cache_timeout,
+)
+
+
+def cached_response(view, request):
+    """Return a 304 or cached response for a read, or None."""
+    if not cache_is_shared():
+        return None
+
+    etag = view.get_etag(request)
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        if not response_cache_timeout():
+            return None
+        response = load_response(response_cache_key(view, request))
+        if response is None:
+            # Left to the sync view, which counts the miss.
+            return None
+        record_cache_access(True)
+
+    response['ETag'] = etag
+    return response
+
+
+recipe_list = async_read_view(
+    views.RecipeViewSet,
+    cached_response,
+    {'get': 'list', 'post': 'create'},
+    basename='recipe',
+    detail=False,
+)
+recipe_detail = async_read_view(
+    views.RecipeViewSet,
+    cached_response,
+    {
+        'get': 'retrieve',
+        'put': 'update',
+        'patch': 'partial_update',
+        'delete': 'destroy',
+    },
+    basename='recipe',
+    detail=True,
+)
+tag_list = async_read_view(
+    views.TagViewSet,
+    cached_response,
+    {'get': 'list'},
+    basename='tag',
+    detail=False,
+)
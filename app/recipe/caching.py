@@ -0,0 +1,211 @@
+"""
+HTTP caching for the Recipe APIs.
+
+Every change to a user's recipes or tags bumps a per-user data version kept
+in Django's cache (see recipe.signals). Responses derived from that data are
+keyed and tagged with it: a client polling an unchanged list gets a 304, and
+any other repeat request is answered with the cached rendered bytes, without
+the list query or serialization running at all.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.caches import cache_is_shared
+from core.http import etag_matches
+from core.metrics import registry
+from core.routers import reads_from_replicas
+
+VERSION_KEY = "recipe-data-version:{}"
+RESPONSE_KEY = "recipe-response:{}"
+
+cache_requests = registry.counter(
+    "recipe_response_cache_requests_total",
+    "Lookups in the recipe response cache, by result.",
+    ["result"],
+)
+
+
+def get_data_version(user_id):
+    """
+    Return the current data version for a user.
+
+    Versions expire after settings.RECIPE_DATA_VERSION_TIMEOUT, so a
+    process that missed a bump (see cache_is_shared) catches up by then.
+    """
+    key = VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed with the clock so a version lost from the cache is replaced
+        # by one newer than any that was handed out before.
+        version = time.time_ns()
+        if not cache.add(key, version, settings.RECIPE_DATA_VERSION_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_data_version(user_id):
+    """Invalidate everything derived from a user's recipes and tags."""
+    try:
+        cache.incr(VERSION_KEY.format(user_id))
+    except ValueError:
+        # Not cached; the next read seeds a fresh, newer version.
+        pass
+
+
+def invalidate_user_data(user_id):
+    """
+    Bump a user's data version now and again once the transaction commits.
+
+    The second bump stops a concurrent request that read the new version
+    before the change was visible from caching stale data under it.
+    """
+    bump_data_version(user_id)
+    transaction.on_commit(lambda: bump_data_version(user_id))
+
+
+def response_cache_timeout():
+    """
+    Return the seconds to cache responses for, or 0 not to cache them.
+
+    Responses are only cached in a cache shared by every process, since a
+    process missing a write would otherwise serve stale bodies.
+    """
+    if not cache_is_shared():
+        return 0
+    return settings.RECIPE_RESPONSE_CACHE_TIMEOUT
+
+
+def record_cache_access(hit):
+    """Count a response cache hit or miss."""
+    cache_requests.inc("hit" if hit else "miss")
+
+
+def get_cache_stats():
+    """Return the response cache hit and miss counts for this process."""
+    values = cache_requests.values()
+    return {
+        "hits": values.get(("hit",), 0),
+        "misses": values.get(("miss",), 0),
+    }
+
+
+def reset_cache_stats():
+    """Zero the response cache hit and miss counts."""
+    cache_requests.clear()
+
+
+def request_fingerprint(view, request):
+    """
+    Return a digest identifying the response a read request will get.
+
+    It covers the user, their data version, the action, the full path with
+    query parameters, the renderer and the serializer class.
+    """
+    raw = ":".join([
+        str(request.user.pk),
+        str(get_data_version(request.user.pk)),
+        view.action,
+        request.get_full_path(),
+        request.accepted_renderer.format,
+        view.get_serializer_class().__qualname__,
+    ])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def response_cache_key(view, request):
+    """Return the response cache key for a read request."""
+    return RESPONSE_KEY.format(request_fingerprint(view, request))
+
+
+def load_response(key):
+    """Return the response cached under key, or None."""
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    content, content_type = cached
+    return HttpResponse(content, content_type=content_type)
+
+
+class ConditionalGetMixin:
+    """
+    Add ETags to list and retrieve and answer matching requests with 304.
+
+    Bodies read from a replica get no ETag: the replica may not have caught
+    up with the data version the ETag names. Nothing is tagged unless the
+    cache is shared (see cache_is_shared), since a process missing a write
+    would otherwise keep answering 304.
+    """
+
+    def get_etag(self, request):
+        """Return the ETag for the current request's response."""
+        return '"%s"' % request_fingerprint(self, request)
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        if not cache_is_shared():
+            return handler(request, *args, **kwargs)
+
+        etag = self.get_etag(request)
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_304_NOT_MODIFIED or (
+            response.status_code == status.HTTP_200_OK and
+            not reads_from_replicas()
+        ):
+            response["ETag"] = etag
+        return response
+
+
+class CachedResponseMixin:
+    """
+    Cache rendered list and retrieve responses in Django's cache.
+
+    Entries are keyed by request_fingerprint(), so bumping a user's data
+    version makes all of their cached responses unreachable at once. Only
+    responses read from the primary are stored, as a lagging replica could
+    store stale data under the new version.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
+
+    def _cached(self, handler, request, *args, **kwargs):
+        timeout = response_cache_timeout()
+        if not timeout:
+            return handler(request, *args, **kwargs)
+
+        key = response_cache_key(self, request)
+        cached = load_response(key)
+        record_cache_access(cached is not None)
+        if cached is not None:
+            return cached
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and \
+                not reads_from_replicas():
+            def store(rendered):
+                cache.set(
+                    key,
+                    (rendered.content, rendered["Content-Type"]),
+                    timeout,
+                )
+            response.add_post_render_callback(store)
+        return response
@@ -0,0 +1,21 @@
+"""
+System checks for the recipe app.
+"""
+from django.core.checks import Warning, register
+
+from recipe.caching import cache_is_shared
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Check the recipe data versions are shared by all processes."""
+    if cache_is_shared():
+        return []
+    return [Warning(
+        'The default cache is private to each process, so the recipe '
+        'response cache and recipe ETags are off.',
+        hint='Set CACHE_BACKEND to a shared cache such as Redis or '
+             'memcached, or SINGLE_PROCESS=1 if one process serves all '
+             'requests.',
+        id='recipe.W001',
+    )]
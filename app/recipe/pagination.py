@@ -0,0 +1,145 @@
+"""
+Pagination for the Recipe APIs.
+"""
+import binascii
+import json
+from base64 import b64decode, b64encode
+from collections import namedtuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+Cursor = namedtuple('Cursor', ['reverse', 'position'])
+
+
+def _reverse_ordering(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination keyed on every ordering field.
+
+    DRF's CursorPagination keeps only the first ordering field in the
+    cursor and skips rows that tie on it with OFFSET, which never ends once
+    more rows tie than its offset cutoff. Here the cursor holds the values
+    of all the ordering fields of the last row, and the next page starts
+    after it with (a < x) OR (a = x AND b < y)..., so ties cost nothing.
+    The last ordering field must be unique.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [_reverse_ordering(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(
+                self._after(ordering, self.cursor.position),
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def _after(self, ordering, position):
+        """Return the condition for rows ordered after position."""
+        condition, ties = Q(), Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= ties & Q(**{f'{name}__{lookup}': value})
+            ties &= Q(**{name: value})
+        return condition
+
+    def _position(self, instance):
+        """Return the values of the ordering fields of a page row."""
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(instance, dict):
+            return [instance[name] for name in names]
+        return [getattr(instance, name) for name in names]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Nothing precedes the row this reverse page started from, so
+            # it is on the first page.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(Cursor(False, self._position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return self.encode_cursor(Cursor(True, self.cursor.position))
+        return self.encode_cursor(Cursor(True, self._position(self.page[0])))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            reverse, position = json.loads(
+                b64decode(encoded.encode('ascii')).decode('ascii'),
+            )
+            if not isinstance(position, list) or \
+                    len(position) != len(self.ordering):
+                raise ValueError(position)
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(bool(reverse), position)
+
+    def encode_cursor(self, cursor):
+        encoded = b64encode(json.dumps(
+            [int(cursor.reverse), cursor.position],
+            cls=DjangoJSONEncoder,
+        ).encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded,
+        )
+
+
+class RecipeCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination for recipes.
+
+    Pages are fetched with a range condition on the ordering columns, so
+    no OFFSET or COUNT(*) query is issued however deep the client pages.
+    Search results (querysets annotated with a rank) are ordered by rank,
+    with the id breaking ties between equally ranked recipes.
+    """
+    ordering = ('-id',)
+    search_ordering = ('-rank', '-id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        if 'rank' in queryset.query.annotations:
+            return self.search_ordering
+        return super().get_ordering(request, queryset, view)
+
+
+class TagCursorPagination(RecipeCursorPagination):
+    """Keyset pagination for tags, ordered by name with an id tiebreak."""
+    ordering = ('-name', '-id')
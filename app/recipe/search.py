@@ -0,0 +1,116 @@
+"""
+Full-text search for the Recipe APIs.
+
+A search backend filters a recipe queryset by a user's query and annotates
+each match with a "rank", higher meaning more relevant. The backend is
+picked by database vendor; the index structures behind the PostgreSQL and
+SQLite backends are created by core migration 0008.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+
+def get_terms(query):
+    """Return the words of a search query."""
+    return re.findall(r"\w+", query)
+
+
+class SearchBackend:
+    """
+    Fallback backend matching every word in the title or description.
+
+    It scans the table and does not rank matches, so it is only meant for
+    databases without a full-text backend.
+    """
+
+    def search(self, queryset, query):
+        condition = Q()
+        for term in get_terms(query):
+            condition &= (
+                Q(title__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset.filter(condition).annotate(
+            rank=Value(1.0, output_field=FloatField()),
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Search the generated search_vector column through its GIN index.
+
+    Queries use websearch syntax (quoted phrases, "or" and -word) and are
+    ranked with ts_rank, titles weighing more than descriptions.
+    """
+    config = "english"
+
+    def search(self, queryset, query):
+        tsquery = "websearch_to_tsquery(%s::regconfig, %s)"
+        params = [self.config, query]
+        return queryset.filter(
+            RawSQL(
+                f'"core_recipe"."search_vector" @@ {tsquery}',
+                params,
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            # float8 so cursor positions round-trip through Python floats.
+            rank=RawSQL(
+                f'ts_rank("core_recipe"."search_vector", {tsquery})::float8',
+                params,
+                output_field=FloatField(),
+            ),
+        )
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Search the core_recipe_fts FTS5 table kept in sync by triggers.
+
+    Every word of the query must match, and matches are ranked with bm25,
+    titles weighing more than descriptions.
+    """
+    title_weight = 2.0
+    description_weight = 1.0
+
+    def search(self, queryset, query):
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+
+        match = " ".join(f'"{term}"' for term in terms)
+        return queryset.filter(
+            RawSQL(
+                '"core_recipe"."id" IN (SELECT rowid FROM core_recipe_fts '
+                'WHERE core_recipe_fts MATCH %s)',
+                [match],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            rank=RawSQL(
+                "(SELECT -bm25(core_recipe_fts, %s, %s) "
+                "FROM core_recipe_fts WHERE core_recipe_fts MATCH %s "
+                'AND rowid = "core_recipe"."id")',
+                [self.title_weight, self.description_weight, match],
+                output_field=FloatField(),
+            ),
+        )
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def get_search_backend(using):
+    """Return the search backend for a database alias."""
+    vendor = connections[using].vendor
+    return BACKENDS.get(vendor, SearchBackend)()
+
+
+def search_recipes(queryset, query):
+    """Filter a recipe queryset by query and annotate it with rank."""
+    return get_search_backend(queryset.db).search(queryset, query)
@@ -1,8 +1,24 @@
 """Serializers for Recipe APIs."""
+from collections import defaultdict
+
 from core.models import Recipe, Tag
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 
+def tags_prefetch():
+    """
+    Return the prefetch used to load recipe tags for serialization.
+
+    Tags are ordered by id, the same order RecipeRowSerializer uses, so both
+    representations of a recipe list are identical.
+    """
+    return Prefetch(
+        "tags",
+        queryset=Tag.objects.only("id", "name").order_by("id"),
+    )
+
+
 class TagSerializer(serializers.ModelSerializer):
     """
     Serializer for Tag.
@@ -16,6 +32,71 @@ class TagSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id"]
 
+    def validate_name(self, value):
+        """Reject renaming a tag to a name the user already uses."""
+        if self.instance is not None:
+            duplicate = Tag.objects.filter(
+                user=self.instance.user,
+                name=value,
+            ).exclude(pk=self.instance.pk)
+            if duplicate.exists():
+                msg = "A tag with this name already exists."
+                raise serializers.ValidationError(msg, code="unique")
+        return value
+
+
+class TagWithCountSerializer(TagSerializer):
+    """
+    Serializer for Tag annotated with the number of recipes using it.
+    """
+    recipe_count = serializers.IntegerField(read_only=True)
+
+    class Meta(TagSerializer.Meta):
+        fields = TagSerializer.Meta.fields + ["recipe_count"]
+
+
+class RecipeListSerializer(serializers.ListSerializer):
+    """
+    Serializer for creating and updating many recipes at once.
+    """
+
+    def _split_tags(self, validated_data):
+        """Return (attrs, tag names or None) pairs for each item."""
+        items = []
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            tags = attrs.pop("tags", None)
+            names = None if tags is None else [tag["name"] for tag in tags]
+            items.append((attrs, names))
+        return items
+
+    def create(self, validated_data):
+        """
+        Create recipes in bulk while resolving tags for the whole batch.
+        """
+        items = self._split_tags(validated_data)
+        recipes = [self.child.Meta.model(**attrs) for attrs, _ in items]
+        return self.child.Meta.model.objects.bulk_create_with_tags(
+            recipes,
+            [names or [] for _, names in items],
+        )
+
+    def update(self, instances, validated_data):
+        """
+        Update recipes in bulk while handling new or existing tags.
+        """
+        items = self._split_tags(validated_data)
+        fields = set()
+        for instance, (attrs, _) in zip(instances, items):
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+        return self.child.Meta.model.objects.bulk_update_with_tags(
+            instances,
+            sorted(fields),
+            [names for _, names in items],
+        )
+
 
 class RecipeSerializer(serializers.ModelSerializer):
     """
@@ -25,6 +106,7 @@ class RecipeSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True, required=False)
 
     class Meta:
+        list_serializer_class = RecipeListSerializer
         model = Recipe
         fields = [
             "id",
@@ -39,12 +121,11 @@ class RecipeSerializer(serializers.ModelSerializer):
     def _get_or_create_tags(self, tags, recipe):
         """Handle getting or creatig tags as needed."""
         auth_user = self.context.get("request").user
-        for tag in tags:
-            tag_obj, _ = Tag.objects.get_or_create(
-                user=auth_user,
-                **tag,
-            )
-            recipe.tags.add(tag_obj)
+        tag_objs = Tag.objects.get_or_create_many(
+            auth_user,
+            [tag["name"] for tag in tags],
+        )
+        recipe.tags.add(*tag_objs)
 
     def create(self, validated_data):
         """
@@ -78,3 +159,47 @@ class RecipeDetailSerializer(RecipeSerializer):
 
     class Meta(RecipeSerializer.Meta):
         fields = RecipeSerializer.Meta.fields + ["description"]
+
+
+class RecipeRowSerializer:
+    """
+    Read-only fast path for listing recipes.
+
+    Builds the same output as RecipeSerializer(many=True) straight from
+    .values() rows and one grouped query for their tags, skipping the
+    per-row field machinery of ModelSerializer.
+    """
+
+    fields = ["id", "title", "time_in_minutes", "price", "link"]
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def _get_tags(self):
+        """Return a map of recipe id to its serialized tags."""
+        tags = defaultdict(list)
+        through = Recipe.tags.through.objects.filter(
+            recipe_id__in=[row["id"] for row in self.rows],
+        ).order_by("tag_id").values_list("recipe_id", "tag_id", "tag__name")
+        for recipe_id, tag_id, name in through:
+            tags[recipe_id].append({"id": tag_id, "name": name})
+        return tags
+
+    @property
+    def data(self):
+        if not self.rows:
+            return []
+
+        tags = self._get_tags()
+        price = RecipeSerializer().fields["price"].to_representation
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "time_in_minutes": row["time_in_minutes"],
+                "price": price(row["price"]),
+                "link": row["link"],
+                "tags": tags[row["id"]],
+            }
+            for row in self.rows
+        ]
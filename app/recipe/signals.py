@@ -0,0 +1,32 @@
+"""
+Signal handlers for the recipe app.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Recipe, Tag
+from core.signals import recipes_bulk_changed
+from recipe.caching import invalidate_user_data
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def bump_version_on_change(sender, instance, **kwargs):
+    """Invalidate the owner's cached data when a recipe or tag changes."""
+    invalidate_user_data(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def bump_version_on_tags_changed(sender, instance, action, **kwargs):
+    """Invalidate the owner's cached data when recipe tags change."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_user_data(instance.user_id)
+
+
+@receiver(recipes_bulk_changed, sender=Recipe)
+def bump_version_on_bulk_change(sender, user_ids, **kwargs):
+    """Invalidate cached data of users whose recipes changed in bulk."""
+    for user_id in user_ids:
+        invalidate_user_data(user_id)
@@ -0,0 +1,88 @@
+"""
+Benchmark sync and async recipe reads under ASGI at high concurrency.
+
+Run with: python manage.py test recipe --pattern="bench_*.py"
+"""
+import asyncio
+import time
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from core.models import Recipe, Tag
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from user.authentication import get_token_cache
+
+CLIENTS = 200
+REQUESTS_PER_CLIENT = 10
+RECIPES = 100
+
+
+@override_settings(SINGLE_PROCESS=True)
+class AsyncReadBenchmark(TestCase):
+    """Compare requests per second of the sync and async read views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="bench@example.com",
+            password="testpass123",
+        )
+        cls.token = Token.objects.create(user=user)
+        tag = Tag.objects.create(user=user, name="common")
+        for i in range(RECIPES):
+            Recipe.objects.create(
+                user=user,
+                title=f"Recipe {i}",
+                time_in_minutes=10,
+                price=Decimal("1.50"),
+                link="http://example.com/recipe.pdf",
+            ).tags.add(tag)
+
+    def setUp(self):
+        cache.clear()
+        get_token_cache().clear()
+        self.client = AsyncClient()
+
+    def _headers(self, etag=None):
+        """Return raw header names, which Django 3.2's AsyncClient sends."""
+        headers = {"authorization": f"Token {self.token.key}"}
+        if etag:
+            headers["if-none-match"] = etag
+        return headers
+
+    async def _client(self, url, etag):
+        for _ in range(REQUESTS_PER_CLIENT):
+            res = await self.client.get(url, **self._headers(etag))
+            assert res.status_code in (200, 304), res.status_code
+
+    async def _rate(self, url, revalidate):
+        """Return requests per second for CLIENTS concurrent clients."""
+        res = await self.client.get(url, **self._headers())
+        assert res.status_code == 200, res.status_code
+        etag = res["ETag"] if revalidate else None
+
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            self._client(url, etag) for _ in range(CLIENTS)
+        ])
+        return CLIENTS * REQUESTS_PER_CLIENT / (time.perf_counter() - start)
+
+    def test_concurrent_reads(self):
+        for label, revalidate in [("cached", False), ("304", True)]:
+            sync_rate = async_to_sync(self._rate)(
+                reverse("recipe:recipe-list"),
+                revalidate,
+            )
+            async_rate = async_to_sync(self._rate)(
+                reverse("recipe:recipe-list-async"),
+                revalidate,
+            )
+            print(
+                f"\nRecipe list ({label}, {CLIENTS} clients): sync view "
+                f"{sync_rate:.0f} req/s, async view {async_rate:.0f} req/s "
+                f"({async_rate / sync_rate:.1f}x)"
+            )
@@ -0,0 +1,63 @@
+"""
+Benchmark creating recipes through the bulk endpoint.
+
+Run with: python manage.py test recipe --pattern="bench_*.py"
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+RECIPES_URL = reverse("recipe:recipe-list")
+BULK_URL = reverse("recipe:recipe-bulk")
+TOTAL = 10000
+BATCH_SIZE = 1000
+SINGLE_SAMPLE = 200
+TAGS = [f"tag{i}" for i in range(20)]
+
+
+def recipe_payload(i):
+    """Return the payload for the i-th benchmark recipe."""
+    return {
+        "title": f"Recipe {i}",
+        "time_in_minutes": 10,
+        "price": "1.50",
+        "link": "http://example.com/recipe.pdf",
+        "tags": [{"name": TAGS[i % len(TAGS)]}, {"name": "common"}],
+    }
+
+
+class BulkCreateBenchmark(TestCase):
+    """Compare recipes per second of bulk and one-at-a-time creation."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="bench@example.com",
+            password="testpass123",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_bulk_create_throughput(self):
+        start = time.perf_counter()
+        for i in range(SINGLE_SAMPLE):
+            res = self.client.post(RECIPES_URL, recipe_payload(i), "json")
+            self.assertEqual(res.status_code, 201)
+        single_rate = SINGLE_SAMPLE / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for offset in range(0, TOTAL, BATCH_SIZE):
+            payload = [
+                recipe_payload(i)
+                for i in range(offset, offset + BATCH_SIZE)
+            ]
+            res = self.client.post(BULK_URL, payload, "json")
+            self.assertEqual(res.status_code, 201)
+        bulk_rate = TOTAL / (time.perf_counter() - start)
+
+        print(
+            f"\nCreating recipes: one at a time {single_rate:.0f}/s, "
+            f"bulk ({TOTAL} in batches of {BATCH_SIZE}) {bulk_rate:.0f}/s"
+        )
@@ -0,0 +1,95 @@
+"""
+Benchmark peak memory of the streaming recipe export.
+
+Run with: python manage.py test recipe --pattern="bench_*.py"
+"""
+import os
+import time
+import tracemalloc
+from decimal import Decimal
+
+from core.models import Recipe, Tag
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+EXPORT_URL = reverse("recipe:recipe-export")
+ROWS = int(os.environ.get("BENCH_EXPORT_ROWS", 100000))
+# Enough rows for several export chunks, so the baseline is steady state.
+BASELINE_ROWS = 5000
+
+
+class ExportMemoryBenchmark(TestCase):
+    """Check export peak memory stays flat as the collection grows."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="bench@example.com",
+            password="testpass123",
+        )
+        Tag.objects.bulk_create(
+            [Tag(user=self.user, name=f"tag{i}") for i in range(10)]
+        )
+        self.tags = list(Tag.objects.filter(user=self.user))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _add_recipes(self, count):
+        Recipe.objects.bulk_create(
+            [
+                Recipe(
+                    user=self.user,
+                    title=f"Recipe {i}",
+                    description="A description. " * 20,
+                    time_in_minutes=10,
+                    price=Decimal("1.50"),
+                    link="http://example.com/recipe.pdf",
+                )
+                for i in range(count)
+            ],
+            batch_size=5000,
+        )
+        Through = Recipe.tags.through
+        untagged = Recipe.objects.filter(
+            user=self.user,
+            tags__isnull=True,
+        ).values_list("id", flat=True)
+        Through.objects.bulk_create(
+            [
+                Through(recipe_id=recipe_id, tag_id=tag.id)
+                for recipe_id in untagged.iterator()
+                for tag in self.tags[:3]
+            ],
+            batch_size=5000,
+        )
+
+    def _measure_export(self):
+        """Return (rows, bytes, seconds, peak bytes) of one export."""
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            resp = self.client.get(EXPORT_URL)
+            rows = size = 0
+            for line in resp.streaming_content:
+                rows += 1
+                size += len(line)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return rows, size, elapsed, peak
+
+    def test_export_memory_is_constant(self):
+        self._add_recipes(BASELINE_ROWS)
+        small = self._measure_export()
+        self._add_recipes(ROWS - BASELINE_ROWS)
+        large = self._measure_export()
+
+        for rows, size, elapsed, peak in (small, large):
+            print(
+                f"\nExported {rows} recipes ({size / 1e6:.1f} MB) in "
+                f"{elapsed:.1f}s, peak traced memory {peak / 1e6:.1f} MB"
+            )
+        self.assertEqual(large[0], ROWS)
+        self.assertLess(large[3], small[3] * 1.5)
@@ -0,0 +1,110 @@
+"""
+Benchmark filtering the recipe list by tags.
+
+Run with: python manage.py test recipe --pattern="bench_*.py"
+"""
+import os
+import random
+import time
+from decimal import Decimal
+
+from core.models import Recipe, Tag
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+RECIPES_URL = reverse("recipe:recipe-list")
+ROWS = int(os.environ.get("BENCH_FILTER_ROWS", 100000))
+TAGS = 50
+TAGS_PER_RECIPE = 3
+ROUNDS = 20
+
+
+@override_settings(RECIPE_RESPONSE_CACHE_TIMEOUT=0)
+class TagFilterBenchmark(TestCase):
+    """Time tag filtered recipe list pages against a join per tag."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="bench@example.com",
+            password="testpass123",
+        )
+        Tag.objects.bulk_create(
+            [Tag(user=cls.user, name=f"tag{i}") for i in range(TAGS)]
+        )
+        cls.tag_ids = sorted(
+            Tag.objects.filter(user=cls.user).values_list("id", flat=True)
+        )
+        Recipe.objects.bulk_create(
+            [
+                Recipe(
+                    user=cls.user,
+                    title=f"Recipe {i}",
+                    time_in_minutes=10,
+                    price=Decimal("1.50"),
+                )
+                for i in range(ROWS)
+            ],
+            batch_size=5000,
+        )
+        rng = random.Random(14)
+        Through = Recipe.tags.through
+        Through.objects.bulk_create(
+            [
+                Through(recipe_id=recipe_id, tag_id=tag_id)
+                for recipe_id in Recipe.objects.values_list("id", flat=True)
+                for tag_id in rng.sample(cls.tag_ids, TAGS_PER_RECIPE)
+            ],
+            batch_size=5000,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _time(self, func):
+        """Return the mean milliseconds of func over ROUNDS runs."""
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            result = func()
+        return (time.perf_counter() - start) * 1000 / ROUNDS, result
+
+    def test_filter_first_page(self):
+        tags = ",".join(str(tag_id) for tag_id in self.tag_ids[:3])
+        for match in ["any", "all"]:
+            ms, resp = self._time(lambda: self.client.get(
+                RECIPES_URL,
+                {"tags": tags, "tags_match": match},
+            ))
+            self.assertEqual(resp.status_code, 200)
+            print(
+                f"\nFirst page, tags_match={match}: {ms:.1f} ms "
+                f"({len(resp.data['results'])} recipes)"
+            )
+
+    def test_filter_all_against_joins(self):
+        tag_ids = self.tag_ids[:2]
+        view_ms, resp = self._time(lambda: self.client.get(
+            RECIPES_URL,
+            {
+                "tags": ",".join(map(str, tag_ids)),
+                "tags_match": "all",
+                "page_size": 1000,
+            },
+        ))
+
+        queryset = Recipe.objects.filter(user=self.user)
+        for tag_id in tag_ids:
+            queryset = queryset.filter(tags=tag_id)
+        queryset = queryset.order_by("-id").values_list("id", flat=True)
+        join_ms, join_ids = self._time(lambda: list(queryset[:1000]))
+
+        ids = [recipe["id"] for recipe in resp.data["results"]]
+        self.assertEqual(ids, join_ids)
+        print(
+            f"\nAll of {len(tag_ids)} tags ({len(ids)} of {ROWS} recipes): "
+            f"list request {view_ms:.1f} ms, "
+            f"join per tag query alone {join_ms:.1f} ms"
+        )
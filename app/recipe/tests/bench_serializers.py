@@ -0,0 +1,73 @@
+"""
+Benchmark serializing recipe lists.
+
+Run with: python manage.py test recipe --pattern="bench_*.py"
+"""
+import time
+from decimal import Decimal
+
+from core.models import Recipe, Tag
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from recipe.serializers import (
+    RecipeRowSerializer,
+    RecipeSerializer,
+    tags_prefetch,
+)
+
+TOTAL = 1000
+ROUNDS = 20
+
+
+class ListSerializerBenchmark(TestCase):
+    """Compare rows per second of RecipeSerializer and the row fast path."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="bench@example.com",
+            password="testpass123",
+        )
+        Tag.objects.bulk_create(
+            [Tag(user=user, name=f"tag{i}") for i in range(20)]
+        )
+        tag_ids = list(Tag.objects.values_list("id", flat=True))
+        Recipe.objects.bulk_create([
+            Recipe(
+                user=user,
+                title=f"Recipe {i}",
+                time_in_minutes=10,
+                price=Decimal("1.50"),
+                link="http://example.com/recipe.pdf",
+            )
+            for i in range(TOTAL)
+        ])
+        Recipe.tags.through.objects.bulk_create([
+            Recipe.tags.through(recipe_id=recipe_id, tag_id=tag_id)
+            for i, recipe_id in enumerate(
+                Recipe.objects.values_list("id", flat=True)
+            )
+            for tag_id in {tag_ids[0], tag_ids[i % len(tag_ids)]}
+        ])
+        cls.queryset = Recipe.objects.filter(user=user).order_by("-id")
+
+    def _rate(self, serialize):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            self.assertEqual(len(serialize()), TOTAL)
+        return TOTAL * ROUNDS / (time.perf_counter() - start)
+
+    def test_list_serializer_throughput(self):
+        model_rate = self._rate(lambda: RecipeSerializer(
+            self.queryset.prefetch_related(tags_prefetch()),
+            many=True,
+        ).data)
+        row_rate = self._rate(lambda: RecipeRowSerializer(
+            list(self.queryset.values(*RecipeRowSerializer.fields)),
+        ).data)
+
+        print(
+            f"\nSerializing {TOTAL} recipes: RecipeSerializer "
+            f"{model_rate:.0f} rows/s, RecipeRowSerializer "
+            f"{row_rate:.0f} rows/s ({row_rate / model_rate:.1f}x)"
+        )
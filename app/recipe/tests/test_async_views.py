@@ -0,0 +1,206 @@
+"""
+Tests for the async recipe and tag read views.
+"""
+import asyncio
+import tempfile
+from decimal import Decimal
+from unittest.mock import patch
+
+from core.models import Recipe, Tag
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from recipe import async_views
+from user.authentication import get_token_cache
+
+RECIPES_URL = reverse("recipe:recipe-list")
+RECIPES_ASYNC_URL = reverse("recipe:recipe-list-async")
+TAGS_URL = reverse("recipe:tag-list")
+TAGS_ASYNC_URL = reverse("recipe:tag-list-async")
+HEADERS = ["Content-Type", "Vary", "Allow"]
+
+
+def on_event_loop():
+    """Return True if called from a thread running an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def detail_urls(recipe_id):
+    """Return the sync and async recipe detail URLs."""
+    return (
+        reverse("recipe:recipe-detail", args=[recipe_id]),
+        reverse("recipe:recipe-detail-async", args=[recipe_id]),
+    )
+
+
+@override_settings(SINGLE_PROCESS=True)
+class AsyncReadViewTests(TestCase):
+    """Test the async read views behave like the sync views."""
+
+    def setUp(self):
+        cache.clear()
+        get_token_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123",
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        self.recipe = Recipe.objects.create(
+            user=self.user,
+            title="Curry",
+            time_in_minutes=20,
+            price=Decimal("5.50"),
+            link="http://example.com/curry.pdf",
+        )
+        self.recipe.tags.add(tag)
+
+    def assertSameResponse(self, res, sync_res):
+        self.assertEqual(res.status_code, sync_res.status_code)
+        self.assertEqual(res.content, sync_res.content)
+        for header in HEADERS:
+            self.assertEqual(res.get(header), sync_res.get(header), header)
+
+    def _url_pairs(self):
+        return [
+            (RECIPES_URL, RECIPES_ASYNC_URL),
+            detail_urls(self.recipe.id),
+            (TAGS_URL, TAGS_ASYNC_URL),
+        ]
+
+    def test_async_views_match_sync_views(self):
+        """Test cold and cached async reads match the sync views."""
+        for sync_url, async_url in self._url_pairs():
+            with self.subTest(url=async_url):
+                cold = self.client.get(async_url)
+                with self.assertNumQueries(0):
+                    cached = self.client.get(async_url)
+                sync_res = self.client.get(sync_url)
+
+                self.assertEqual(cold.status_code, status.HTTP_200_OK)
+                self.assertSameResponse(cold, sync_res)
+                self.assertSameResponse(cached, sync_res)
+                self.assertEqual(cached["ETag"], cold["ETag"])
+
+    def test_async_views_not_modified(self):
+        """Test a matching ETag is answered with 304 without queries."""
+        for sync_url, async_url in self._url_pairs():
+            with self.subTest(url=async_url):
+                etag = self.client.get(async_url)["ETag"]
+                sync_etag = self.client.get(sync_url)["ETag"]
+
+                with self.assertNumQueries(0):
+                    res = self.client.get(async_url, HTTP_IF_NONE_MATCH=etag)
+                sync_res = self.client.get(
+                    sync_url,
+                    HTTP_IF_NONE_MATCH=sync_etag,
+                )
+
+                self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertSameResponse(res, sync_res)
+
+    def test_async_views_see_changes(self):
+        """Test changed data is not served from stale caches."""
+        self.client.get(RECIPES_ASYNC_URL)
+        self.recipe.title = "Green curry"
+        self.recipe.save()
+
+        res = self.client.get(RECIPES_ASYNC_URL)
+
+        self.assertEqual(res.json()["results"][0]["title"], "Green curry")
+
+    @override_settings(RECIPE_RESPONSE_CACHE_TIMEOUT=0)
+    def test_async_views_cache_disabled(self):
+        """Test reads fall back to the sync view with caching disabled."""
+        self.client.get(RECIPES_ASYNC_URL)
+
+        with patch("recipe.async_views.load_response") as patched_load:
+            res = self.client.get(RECIPES_ASYNC_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        patched_load.assert_not_called()
+
+    def test_async_views_auth_errors(self):
+        """Test authentication errors match the sync views."""
+        for credentials in [{}, {"HTTP_AUTHORIZATION": "Token invalid"}]:
+            self.client.credentials(**credentials)
+            for sync_url, async_url in self._url_pairs():
+                with self.subTest(url=async_url, credentials=credentials):
+                    res = self.client.get(async_url)
+                    sync_res = self.client.get(sync_url)
+
+                    self.assertEqual(
+                        res.status_code,
+                        status.HTTP_401_UNAUTHORIZED,
+                    )
+                    self.assertSameResponse(res, sync_res)
+                    self.assertEqual(
+                        res["WWW-Authenticate"],
+                        sync_res["WWW-Authenticate"],
+                    )
+
+    @override_settings(SINGLE_PROCESS=False)
+    def test_async_views_per_process_cache(self):
+        """Test no ETags or 304s come from a cache private to a process."""
+        self.client.get(RECIPES_ASYNC_URL)
+
+        res = self.client.get(RECIPES_ASYNC_URL, HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", res)
+
+    def test_async_views_network_cache(self):
+        """Test cache calls leave the event loop unless caches are local."""
+        original = async_views.load_response
+
+        def loaded_on_event_loop():
+            loops = []
+
+            def load_response(key):
+                loops.append(on_event_loop())
+                return original(key)
+
+            self.client.get(RECIPES_ASYNC_URL)
+            with patch.object(async_views, "load_response", load_response):
+                res = self.client.get(RECIPES_ASYNC_URL)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            return loops
+
+        self.assertEqual(loaded_on_event_loop(), [True])
+
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(CACHES={"default": {
+                "BACKEND":
+                    "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": directory,
+            }}):
+                self.assertEqual(loaded_on_event_loop(), [False])
+
+    def test_async_views_other_methods(self):
+        """Test non GET requests are handled by the sync views."""
+        payload = {
+            "title": "Dal",
+            "time_in_minutes": 30,
+            "price": "3.00",
+            "link": "http://example.com/dal.pdf",
+        }
+        res = self.client.post(RECIPES_ASYNC_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.delete(detail_urls(res.json()["id"])[1])
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        res = self.client.post(TAGS_ASYNC_URL, {"name": "Spicy"})
+        sync_res = self.client.post(TAGS_URL, {"name": "Spicy"})
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertSameResponse(res, sync_res)
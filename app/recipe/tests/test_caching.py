@@ -0,0 +1,343 @@
+"""
+Test HTTP caching of the Recipe APIs.
+"""
+import tempfile
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+from core.models import Recipe, Tag
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from recipe.caching import (
+    get_cache_stats,
+    get_data_version,
+    reset_cache_stats,
+)
+from recipe.checks import check_shared_cache
+from rest_framework import status
+from rest_framework.test import APIClient
+
+RECIPES_URL = reverse("recipe:recipe-list")
+TAGS_URL = reverse("recipe:tag-list")
+
+
+def recipe_detail_url(recipe_id):
+    """Create and return a recipe detail URL."""
+    return reverse("recipe:recipe-detail", args=[recipe_id])
+
+
+def tag_detail_url(tag_id):
+    """Create and return a tag detail URL."""
+    return reverse("recipe:tag-detail", args=[tag_id])
+
+
+def create_recipe(user, **params):
+    """Create and return a sample recipe."""
+    defaults = {
+        "title": "Sample recipe title.",
+        "time_in_minutes": 20,
+        "price": Decimal("5.25"),
+        "link": "http://example.com/recipe.pdf",
+    }
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+def create_user(email="user@example.com", password="testpass123"):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(email=email, password=password)
+
+
+@override_settings(SINGLE_PROCESS=True)
+class ConditionalGetTests(TestCase):
+    """Test ETag based conditional requests."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+
+    def assertNotModified(self, url):
+        """Assert url answers 304 for its own ETag without any queries."""
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        etag = res["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+        return etag
+
+    def assertModified(self, url, etag):
+        """Assert url answers 200 with a new ETag for an old one."""
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_recipe_list_not_modified(self):
+        """Test the recipe list answers 304 when unchanged."""
+        create_recipe(user=self.user)
+
+        self.assertNotModified(RECIPES_URL)
+
+    @override_settings(SINGLE_PROCESS=False)
+    def test_per_process_cache_no_etags(self):
+        """Test no ETags or 304s come from a cache private to a process."""
+        create_recipe(user=self.user)
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", res)
+
+    def test_recipe_detail_not_modified(self):
+        """Test a recipe detail answers 304 when unchanged."""
+        recipe = create_recipe(user=self.user)
+
+        self.assertNotModified(recipe_detail_url(recipe.id))
+
+    def test_tag_list_and_detail_not_modified(self):
+        """Test the tag list and detail answer 304 when unchanged."""
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+
+        self.assertNotModified(TAGS_URL)
+        self.assertNotModified(tag_detail_url(tag.id))
+
+    def test_etag_differs_by_query(self):
+        """Test different pages of a list get different ETags."""
+        res = self.client.get(RECIPES_URL)
+        paged = self.client.get(RECIPES_URL, {"page_size": 1})
+
+        self.assertNotEqual(res["ETag"], paged["ETag"])
+
+    def test_recipe_changes_invalidate(self):
+        """Test creating, updating and deleting recipes changes the ETag."""
+        etag = self.assertNotModified(RECIPES_URL)
+        recipe = create_recipe(user=self.user)
+        self.assertModified(RECIPES_URL, etag)
+
+        etag = self.assertNotModified(RECIPES_URL)
+        self.client.patch(recipe_detail_url(recipe.id), {"title": "New"})
+        self.assertModified(RECIPES_URL, etag)
+
+        etag = self.assertNotModified(RECIPES_URL)
+        recipe.delete()
+        self.assertModified(RECIPES_URL, etag)
+
+    def test_tag_changes_invalidate_recipes(self):
+        """Test tag changes invalidate recipe responses that embed them."""
+        recipe = create_recipe(user=self.user)
+        url = recipe_detail_url(recipe.id)
+
+        etag = self.assertNotModified(url)
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        recipe.tags.add(tag)
+        self.assertModified(url, etag)
+
+        etag = self.assertNotModified(url)
+        tag.name = "Vegetarian"
+        tag.save()
+        self.assertModified(url, etag)
+
+        etag = self.assertNotModified(url)
+        recipe.tags.clear()
+        self.assertModified(url, etag)
+
+    def test_other_user_changes_do_not_invalidate(self):
+        """Test another user's changes keep the ETag valid."""
+        other_user = create_user(email="other@example.com")
+        etag = self.assertNotModified(RECIPES_URL)
+
+        create_recipe(user=other_user)
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bulk_changes_invalidate(self):
+        """Test bulk writes, which skip model signals, change the ETag."""
+        etag = self.assertNotModified(RECIPES_URL)
+        payload = [{
+            "title": "Bulk recipe",
+            "time_in_minutes": 5,
+            "price": "1.00",
+            "link": "http://example.com/recipe.pdf",
+            "tags": [{"name": "Vegan"}],
+        }]
+        self.client.post(
+            reverse("recipe:recipe-bulk"),
+            payload,
+            format="json",
+        )
+
+        self.assertModified(RECIPES_URL, etag)
+
+    def test_lost_version_invalidates(self):
+        """Test evicted versions never resurrect an old ETag."""
+        etag = self.assertNotModified(RECIPES_URL)
+        cache.clear()
+
+        self.assertModified(RECIPES_URL, etag)
+
+
+@override_settings(SINGLE_PROCESS=True)
+class ResponseCacheTests(TestCase):
+    """Test caching of rendered list and retrieve responses."""
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+
+    def assertCached(self, url, **extra):
+        """Assert a repeat request is served from cache without queries."""
+        res = self.client.get(url, **extra)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, **extra)
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.content, res.content)
+        self.assertEqual(cached["Content-Type"], res["Content-Type"])
+        self.assertEqual(cached["ETag"], res["ETag"])
+        return res
+
+    def test_recipe_list_and_detail_cached(self):
+        """Test recipe responses are served from cache."""
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(Tag.objects.create(user=self.user, name="Vegan"))
+
+        self.assertCached(RECIPES_URL)
+        self.assertCached(recipe_detail_url(recipe.id))
+        self.assertEqual(get_cache_stats(), {"hits": 2, "misses": 2})
+
+    def test_tag_list_cached(self):
+        """Test tag responses are served from cache."""
+        Tag.objects.create(user=self.user, name="Vegan")
+
+        self.assertCached(TAGS_URL)
+
+    def test_cache_keyed_by_renderer(self):
+        """Test responses rendered differently are cached separately."""
+        json_res = self.assertCached(RECIPES_URL)
+        api_res = self.assertCached(RECIPES_URL, HTTP_ACCEPT="text/html")
+
+        self.assertNotEqual(json_res["Content-Type"], api_res["Content-Type"])
+
+    def test_cache_keyed_by_user(self):
+        """Test users never see each other's cached responses."""
+        other_user = create_user(email="other@example.com")
+        create_recipe(user=other_user, title="Other recipe")
+        self.client.get(RECIPES_URL)
+
+        self.client.force_authenticate(other_user)
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(len(res.json()["results"]), 1)
+        self.assertEqual(res.json()["results"][0]["title"], "Other recipe")
+
+    def test_changes_invalidate_cache(self):
+        """Test recipe, tag and recipe tag changes invalidate the cache."""
+        recipe = create_recipe(user=self.user)
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        url = recipe_detail_url(recipe.id)
+        self.client.get(url)
+
+        recipe.tags.add(tag)
+        self.assertEqual(len(self.client.get(url).json()["tags"]), 1)
+
+        tag.name = "Vegetarian"
+        tag.save()
+        self.assertEqual(
+            self.client.get(url).json()["tags"][0]["name"],
+            "Vegetarian",
+        )
+
+        recipe.title = "New title"
+        recipe.save()
+        self.assertEqual(self.client.get(url).json()["title"], "New title")
+
+        tag.delete()
+        self.assertEqual(self.client.get(url).json()["tags"], [])
+        self.assertEqual(get_cache_stats(), {"hits": 0, "misses": 5})
+
+    def test_errors_not_cached(self):
+        """Test only successful responses are cached."""
+        url = recipe_detail_url(999)
+        self.client.get(url)
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(get_cache_stats(), {"hits": 0, "misses": 2})
+
+    @override_settings(RECIPE_RESPONSE_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self):
+        """Test a zero timeout turns the response cache off."""
+        self.client.get(RECIPES_URL)
+        self.client.get(RECIPES_URL)
+
+        self.assertEqual(get_cache_stats(), {"hits": 0, "misses": 0})
+
+    @override_settings(SINGLE_PROCESS=False)
+    def test_per_process_cache_not_used(self):
+        """Test responses are not cached in a cache private to a process."""
+        self.client.get(RECIPES_URL)
+        self.client.get(RECIPES_URL)
+
+        self.assertEqual(get_cache_stats(), {"hits": 0, "misses": 0})
+
+
+class DataVersionTests(SimpleTestCase):
+    """Test the lifetime of the per-user data versions."""
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(RECIPE_DATA_VERSION_TIMEOUT=60)
+    def test_data_version_expires(self):
+        """Test a version missed by other processes' writes expires."""
+        version = get_data_version(1)
+        self.assertEqual(get_data_version(1), version)
+
+        later = time.time() + 61
+        with patch("django.core.cache.backends.locmem.time.time",
+                   return_value=later):
+            self.assertGreater(get_data_version(1), version)
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """Test the warning about caches private to each process."""
+
+    @override_settings(SINGLE_PROCESS=False)
+    def test_per_process_cache_warns(self):
+        """Test the default LocMemCache is reported."""
+        warnings = check_shared_cache(None)
+
+        self.assertEqual([warning.id for warning in warnings],
+                         ["recipe.W001"])
+
+    @override_settings(SINGLE_PROCESS=True)
+    def test_single_process(self):
+        """Test a per-process cache is fine for a single process."""
+        self.assertEqual(check_shared_cache(None), [])
+
+    def test_shared_cache(self):
+        """Test caches shared by processes are not reported."""
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            SINGLE_PROCESS=False,
+            CACHES={"default": {
+                "BACKEND":
+                    "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": directory,
+            }},
+        ):
+            self.assertEqual(check_shared_cache(None), [])
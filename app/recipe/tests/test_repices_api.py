@@ -1,17 +1,34 @@
 """
 Test for recipe APIs.
 """
+import json
+import random
 from decimal import Decimal
+from unittest.mock import patch
 
+from asgiref.sync import async_to_sync
+from core.asgi import ASGIHandler
 from core.models import Recipe, Tag
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from recipe.serializers import RecipeDetailSerializer, RecipeSerializer
+from recipe.serializers import (
+    RecipeDetailSerializer,
+    RecipeRowSerializer,
+    RecipeSerializer,
+    tags_prefetch,
+)
+from recipe.search import SearchBackend, get_search_backend
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
 RECIPES_URL = reverse("recipe:recipe-list")
+BULK_URL = reverse("recipe:recipe-bulk")
+EXPORT_URL = reverse("recipe:recipe-export")
 
 
 def detail_url(recipe_id):
@@ -51,11 +68,19 @@ class PublicRecipeAPITest(TestCase):
 
         self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_export_auth_required(self):
+        """Test authentication is required to export recipes."""
+        resp = self.client.get(EXPORT_URL)
+
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("detail", json.loads(resp.content))
+
 
 class PrivateRecipeAPITests(TestCase):
     """Test authenticated Recipe API tests."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = create_user(
             email="user@example.com",
@@ -74,7 +99,7 @@ class PrivateRecipeAPITests(TestCase):
         serializer = RecipeSerializer(recipes, many=True)
 
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertEqual(resp.data, serializer.data)
+        self.assertEqual(resp.data["results"], serializer.data)
 
     def test_recipe_list_limited_to_user(self):
         """Test list of recipes is limited to authenticated users."""
@@ -91,7 +116,7 @@ class PrivateRecipeAPITests(TestCase):
         serializer = RecipeSerializer(recipes, many=True)
 
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertEqual(resp.data, serializer.data)
+        self.assertEqual(resp.data["results"], serializer.data)
 
     def test_get_recipe_details(self):
         """Test retrieving details of a recipe object."""
@@ -303,3 +328,589 @@ class PrivateRecipeAPITests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(recipe.tags.count(), 0)
+
+    def _count_queries(self, method, url, payload):
+        """Send a request and return the number of queries it ran."""
+        with CaptureQueriesContext(connection) as ctx:
+            res = getattr(self.client, method)(url, payload, format="json")
+        self.assertIn(
+            res.status_code,
+            [status.HTTP_200_OK, status.HTTP_201_CREATED],
+        )
+        return len(ctx.captured_queries)
+
+    def test_create_recipe_tags_fixed_queries(self):
+        """Test creating a recipe uses a fixed number of tag queries."""
+        Tag.objects.create(user=self.user, name="tag0")
+        payload = {
+            "title": "Sample recipe title.",
+            "time_in_minutes": 20,
+            "price": Decimal("5.25"),
+            "link": "http://example.com/recipe.pdf",
+        }
+
+        few = self._count_queries("post", RECIPES_URL, {
+            **payload,
+            "tags": [{"name": "tag0"}, {"name": "new"}],
+        })
+        many = self._count_queries("post", RECIPES_URL, {
+            **payload,
+            "tags": [{"name": f"tag{i}"} for i in range(30)],
+        })
+
+        self.assertEqual(few, many)
+        recipe = Recipe.objects.filter(user=self.user).latest("id")
+        self.assertEqual(recipe.tags.count(), 30)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 31)
+
+    def test_update_recipe_tags_fixed_queries(self):
+        """Test updating recipe tags uses a fixed number of queries."""
+        recipe = create_recipe(user=self.user)
+        url = detail_url(recipe.id)
+
+        few = self._count_queries("patch", url, {
+            "tags": [{"name": "lunch"}],
+        })
+        many = self._count_queries("patch", url, {
+            "tags": [{"name": f"tag{i}"} for i in range(30)],
+        })
+
+        self.assertEqual(few, many)
+        self.assertEqual(recipe.tags.count(), 30)
+
+    def test_create_recipe_duplicate_tag_names(self):
+        """Test duplicate tag names in a payload create a single tag."""
+        payload = {
+            "title": "Sample recipe title.",
+            "time_in_minutes": 20,
+            "price": Decimal("5.25"),
+            "link": "http://example.com/recipe.pdf",
+            "tags": [{"name": "Vegan"}, {"name": "Vegan"}],
+        }
+        res = self.client.post(RECIPES_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=res.data.get("id"))
+        self.assertEqual(recipe.tags.count(), 1)
+        self.assertEqual(
+            Tag.objects.filter(user=self.user, name="Vegan").count(),
+            1,
+        )
+
+    def _list_queries_for(self, count):
+        """Create count recipes with tags and return list query count."""
+        tag = Tag.objects.create(user=self.user, name=f"Tag {count}")
+        Recipe.objects.bulk_create([
+            Recipe(
+                user=self.user,
+                title=f"Recipe {i}",
+                time_in_minutes=10,
+                price=Decimal("1.00"),
+                link="http://example.com/recipe.pdf",
+            )
+            for i in range(count)
+        ])
+        Recipe.tags.through.objects.bulk_create([
+            Recipe.tags.through(recipe_id=recipe.id, tag_id=tag.id)
+            for recipe in Recipe.objects.filter(user=self.user)
+        ])
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(RECIPES_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries)
+
+    def test_list_recipes_fixed_queries(self):
+        """Test listing recipes does not run a query per recipe."""
+        baseline = self._list_queries_for(1)
+        Recipe.objects.all().delete()
+
+        self.assertEqual(self._list_queries_for(1000), baseline)
+
+    def test_list_recipes_defers_description(self):
+        """Test the recipe list does not load descriptions."""
+        create_recipe(user=self.user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(RECIPES_URL)
+
+        recipe_sql = ctx.captured_queries[0]["sql"]
+        self.assertIn('"core_recipe"."title"', recipe_sql)
+        self.assertNotIn('"core_recipe"."description"', recipe_sql)
+
+    def test_get_recipe_details_fixed_queries(self):
+        """Test retrieving a recipe loads its tags in one query."""
+        recipe = create_recipe(user=self.user)
+        Tag.objects.bulk_create(
+            [Tag(user=self.user, name=f"tag{i}") for i in range(10)]
+        )
+        recipe.tags.add(*Tag.objects.filter(user=self.user))
+
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(recipe.id))
+
+        self.assertEqual(len(res.data["tags"]), 10)
+        self.assertEqual(res.data["description"], recipe.description)
+
+    def test_row_serializer_matches_recipe_serializer(self):
+        """Test the list fast path renders the same as RecipeSerializer."""
+        rng = random.Random(12)
+        tags = [
+            Tag.objects.create(user=self.user, name=f"Tag {i}")
+            for i in range(20)
+        ]
+        for i in range(50):
+            recipe = create_recipe(
+                user=self.user,
+                title=f"Recipe {i} \u00e9\u2028",
+                time_in_minutes=rng.randint(0, 500),
+                price=Decimal(rng.randint(0, 99999)) / 100,
+                link=rng.choice(["", "http://example.com/r.pdf"]),
+            )
+            recipe.tags.set(rng.sample(tags, rng.randint(0, 5)))
+
+        queryset = Recipe.objects.filter(user=self.user).order_by("-id")
+        rows = RecipeRowSerializer(
+            list(queryset.values(*RecipeRowSerializer.fields)),
+        ).data
+        expected = RecipeSerializer(
+            queryset.prefetch_related(tags_prefetch()),
+            many=True,
+        ).data
+
+        self.assertEqual(json.dumps(rows), json.dumps(expected))
+
+    def test_list_recipes_paginated_by_cursor(self):
+        """Test recipes are paged with stable cursors."""
+        recipes = [create_recipe(user=self.user) for _ in range(5)]
+        expected = [recipe.id for recipe in reversed(recipes)]
+
+        resp = self.client.get(RECIPES_URL, {"page_size": 2})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIsNone(resp.data["previous"])
+
+        seen = [recipe["id"] for recipe in resp.data["results"]]
+        next_url = resp.data["next"]
+        while next_url:
+            resp = self.client.get(next_url)
+            self.assertIsNotNone(resp.data["previous"])
+            seen += [recipe["id"] for recipe in resp.data["results"]]
+            next_url = resp.data["next"]
+
+        self.assertEqual(seen, expected)
+
+    def test_list_recipes_no_offset_or_count(self):
+        """Test paging recipes never issues OFFSET or COUNT queries."""
+        for _ in range(3):
+            create_recipe(user=self.user)
+        first = self.client.get(RECIPES_URL, {"page_size": 1})
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(first.data["next"])
+
+        self.assertEqual(len(resp.data["results"]), 1)
+        for query in ctx.captured_queries:
+            self.assertNotIn("OFFSET", query["sql"].upper())
+            self.assertNotIn("COUNT(", query["sql"].upper())
+
+    def _filter_recipes(self, params):
+        """Return the ids of listed recipes for the query params."""
+        resp = self.client.get(RECIPES_URL, params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [recipe["id"] for recipe in resp.data["results"]]
+
+    def _create_tagged_recipes(self):
+        """Create recipes tagged with vegan, curry, both or neither."""
+        vegan = Tag.objects.create(user=self.user, name="Vegan")
+        curry = Tag.objects.create(user=self.user, name="Curry")
+        r_vegan = create_recipe(user=self.user, title="Salad")
+        r_vegan.tags.add(vegan)
+        r_curry = create_recipe(user=self.user, title="Fish curry")
+        r_curry.tags.add(curry)
+        r_both = create_recipe(user=self.user, title="Vegetable curry")
+        r_both.tags.add(vegan, curry)
+        create_recipe(user=self.user, title="Steak")
+        return vegan, curry, r_vegan, r_curry, r_both
+
+    def test_filter_by_tags_any(self):
+        """Test filtering recipes with any of the tags."""
+        vegan, curry, r_vegan, r_curry, r_both = self._create_tagged_recipes()
+
+        ids = self._filter_recipes({"tags": f"{vegan.id},{curry.id}"})
+
+        self.assertEqual(ids, [r_both.id, r_curry.id, r_vegan.id])
+
+    def test_filter_by_tags_all(self):
+        """Test filtering recipes with all of the tags."""
+        vegan, curry, r_vegan, r_curry, r_both = self._create_tagged_recipes()
+
+        ids = self._filter_recipes(
+            {"tags": f"{vegan.id},{curry.id}", "tags_match": "all"},
+        )
+        self.assertEqual(ids, [r_both.id])
+
+        ids = self._filter_recipes(
+            {"tags": f"{vegan.id},{vegan.id}", "tags_match": "all"},
+        )
+        self.assertEqual(ids, [r_both.id, r_vegan.id])
+
+    def test_filter_by_tags_all_grouped_query(self):
+        """Test the all filter is one grouped subquery, not a join per tag."""
+        vegan, curry, *_ = self._create_tagged_recipes()
+
+        with CaptureQueriesContext(connection) as ctx:
+            self._filter_recipes(
+                {"tags": f"{vegan.id},{curry.id}", "tags_match": "all"},
+            )
+
+        recipe_sql = ctx.captured_queries[0]["sql"].upper()
+        self.assertIn("HAVING COUNT(", recipe_sql)
+        self.assertEqual(recipe_sql.count("CORE_RECIPE_TAGS"), 1)
+        self.assertNotIn("JOIN", recipe_sql)
+
+    def test_filter_by_tags_paginated_by_cursor(self):
+        """Test filtered recipes are paged with cursors."""
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        recipes = [create_recipe(user=self.user) for _ in range(5)]
+        for recipe in recipes[1:]:
+            recipe.tags.add(tag)
+
+        resp = self.client.get(RECIPES_URL, {"tags": tag.id, "page_size": 3})
+        seen = [recipe["id"] for recipe in resp.data["results"]]
+        resp = self.client.get(resp.data["next"])
+        seen += [recipe["id"] for recipe in resp.data["results"]]
+
+        self.assertEqual(seen, [recipe.id for recipe in recipes[:0:-1]])
+        self.assertIsNone(resp.data["next"])
+
+    def test_filter_by_tags_invalid_params(self):
+        """Test invalid tag filters return errors."""
+        for params in [
+            {"tags": "1,vegan"},
+            {"tags": "1", "tags_match": "some"},
+        ]:
+            with self.subTest(params=params):
+                resp = self.client.get(RECIPES_URL, params)
+                self.assertEqual(
+                    resp.status_code,
+                    status.HTTP_400_BAD_REQUEST,
+                )
+
+    def _search_recipes(self, query, **params):
+        """Return the titles of listed recipes for a search query."""
+        return [
+            recipe["title"]
+            for recipe in self.client.get(
+                RECIPES_URL,
+                {"search": query, **params},
+            ).data["results"]
+        ]
+
+    def test_search_recipes_ranked(self):
+        """Test search matches title and description, titles first."""
+        create_recipe(
+            user=self.user,
+            title="Pasta bake",
+            description="Baked with chicken and cream.",
+        )
+        create_recipe(user=self.user, title="Roast chickens")
+        create_recipe(user=self.user, title="Salad", description="Greens.")
+        other_user = create_user(email="other@example.com", password="pass123")
+        create_recipe(user=other_user, title="Chicken curry")
+
+        self.assertEqual(
+            self._search_recipes("chicken"),
+            ["Roast chickens", "Pasta bake"],
+        )
+        self.assertEqual(self._search_recipes("chicken cream"), ["Pasta bake"])
+        self.assertEqual(self._search_recipes("soup"), [])
+        self.assertEqual(self._search_recipes('"chicken* OR'), [])
+
+    def test_search_recipes_kept_in_sync(self):
+        """Test updated and deleted recipes are reflected in search."""
+        recipe = create_recipe(user=self.user, title="Lentil soup")
+        self.assertEqual(self._search_recipes("lentil"), ["Lentil soup"])
+
+        self.client.patch(detail_url(recipe.id), {"title": "Bean stew"})
+        self.assertEqual(self._search_recipes("lentil"), [])
+        self.assertEqual(self._search_recipes("bean"), ["Bean stew"])
+
+        recipe.delete()
+        self.assertEqual(self._search_recipes("bean"), [])
+
+    def test_search_recipes_paginated_by_cursor(self):
+        """Test ranked search results are paged with cursors."""
+        for i in range(5):
+            create_recipe(
+                user=self.user,
+                title="Soup " + "soup " * i,
+                description=f"Soup number {i}.",
+            )
+        create_recipe(user=self.user, title="Stew")
+        expected = self._search_recipes("soup", page_size=10)
+
+        resp = self.client.get(RECIPES_URL, {"search": "soup", "page_size": 2})
+        seen = [recipe["title"] for recipe in resp.data["results"]]
+        while resp.data["next"]:
+            resp = self.client.get(resp.data["next"])
+            seen += [recipe["title"] for recipe in resp.data["results"]]
+
+        self.assertEqual(len(expected), 5)
+        self.assertEqual(seen, expected)
+
+    def _page_through(self, params, max_pages):
+        """Follow next links and return the ids of every page."""
+        resp = self.client.get(RECIPES_URL, params)
+        ids = [recipe["id"] for recipe in resp.data["results"]]
+        for _ in range(max_pages):
+            if not resp.data["next"]:
+                return ids
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(resp.data["next"])
+            for query in ctx.captured_queries:
+                self.assertNotIn("OFFSET", query["sql"].upper())
+            ids += [recipe["id"] for recipe in resp.data["results"]]
+        self.fail(f"Paging did not end within {max_pages} pages.")
+
+    def test_search_tied_ranks_paginated(self):
+        """Test paging through more equally ranked hits than DRF's cutoff."""
+        Recipe.objects.bulk_create(
+            Recipe(
+                user=self.user,
+                title="Chicken soup",
+                time_in_minutes=10,
+                price=Decimal("2.00"),
+            )
+            for _ in range(1100)
+        )
+        expected = sorted(
+            Recipe.objects.values_list("id", flat=True), reverse=True,
+        )
+
+        for backend in [get_search_backend, lambda using: SearchBackend()]:
+            with self.subTest(backend=backend), patch(
+                "recipe.search.get_search_backend", backend,
+            ):
+                ids = self._page_through(
+                    {"search": "chicken soup", "page_size": 100},
+                    max_pages=20,
+                )
+                self.assertEqual(ids, expected)
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected."""
+        for cursor in ["not-base64!", "WzBd", "WzAsIFsxLCAyXV0="]:
+            resp = self.client.get(RECIPES_URL, {"cursor": cursor})
+            self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_search_with_tag_filter(self):
+        """Test search combines with tag filtering."""
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        create_recipe(user=self.user, title="Tofu curry").tags.add(tag)
+        create_recipe(user=self.user, title="Chicken curry")
+
+        self.assertEqual(
+            self._search_recipes("curry", tags=tag.id),
+            ["Tofu curry"],
+        )
+
+    def _bulk_payload(self, count, tags=()):
+        """Return a bulk create payload of count recipes."""
+        return [
+            {
+                "title": f"Recipe {i}",
+                "time_in_minutes": 10,
+                "price": "1.50",
+                "link": "http://example.com/recipe.pdf",
+                "description": f"Description {i}",
+                "tags": [{"name": name} for name in tags],
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_create_recipes(self):
+        """Test creating many recipes with shared tags in one request."""
+        Tag.objects.create(user=self.user, name="Vegan")
+        payload = self._bulk_payload(3, tags=["Vegan", "Dinner"])
+        payload[0]["tags"] = [{"name": "Lunch"}]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 3)
+        recipes = Recipe.objects.filter(user=self.user).order_by("id")
+        self.assertEqual(
+            [recipe.id for recipe in recipes],
+            [item["id"] for item in res.data],
+        )
+        for item, recipe in zip(payload, recipes):
+            self.assertEqual(recipe.title, item["title"])
+            self.assertEqual(recipe.description, item["description"])
+            self.assertEqual(
+                sorted(tag.name for tag in recipe.tags.all()),
+                sorted(tag["name"] for tag in item["tags"]),
+            )
+        self.assertEqual(
+            sorted(tag["name"] for tag in res.data[1]["tags"]),
+            ["Dinner", "Vegan"],
+        )
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 3)
+
+    @skipUnlessDBFeature("can_return_rows_from_bulk_insert")
+    def test_bulk_create_fixed_queries(self):
+        """Test bulk create queries do not grow with the batch size."""
+        few = self._count_queries(
+            "post", BULK_URL, self._bulk_payload(2, tags=["a", "b"]),
+        )
+        many = self._count_queries(
+            "post", BULK_URL, self._bulk_payload(50, tags=["a", "c", "d"]),
+        )
+
+        self.assertEqual(few, many)
+
+    def test_bulk_create_invalid_item(self):
+        """Test nothing is created when any item is invalid."""
+        payload = self._bulk_payload(3)
+        del payload[1]["title"]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("title", res.data[1])
+        self.assertFalse(Recipe.objects.filter(user=self.user).exists())
+
+    def test_bulk_requires_list(self):
+        """Test the bulk endpoint rejects a single object."""
+        payload = self._bulk_payload(1)[0]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_recipes(self):
+        """Test updating many recipes and their tags in one request."""
+        tag = Tag.objects.create(user=self.user, name="Breakfast")
+        first = create_recipe(user=self.user, title="First")
+        second = create_recipe(user=self.user, title="Second")
+        first.tags.add(tag)
+        second.tags.add(tag)
+        payload = [
+            {"id": first.id, "title": "New first", "tags": []},
+            {"id": second.id, "tags": [{"name": "Lunch"}]},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.title, "New first")
+        self.assertEqual(list(first.tags.all()), [])
+        self.assertEqual(second.title, "Second")
+        self.assertEqual(
+            [tag.name for tag in second.tags.all()],
+            ["Lunch"],
+        )
+        self.assertEqual(res.data[1]["tags"][0]["name"], "Lunch")
+
+    def test_bulk_full_update_requires_fields(self):
+        """Test PUT validates every item as a full update."""
+        recipe = create_recipe(user=self.user)
+        payload = [{"id": recipe.id, "title": "New title"}]
+
+        res = self.client.put(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("price", res.data[0])
+
+    def test_bulk_update_other_user_recipe_error(self):
+        """Test bulk updates cannot touch another user's recipes."""
+        other_user = create_user(
+            email="other@example.com",
+            password="testpass123",
+        )
+        own = create_recipe(user=self.user)
+        other = create_recipe(user=other_user, title="Other")
+        payload = [
+            {"id": own.id, "title": "Mine"},
+            {"id": other.id, "title": "Stolen"},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("id", res.data[1])
+        other.refresh_from_db()
+        self.assertEqual(other.title, "Other")
+
+    def _export(self):
+        """Request an export and return the decoded lines."""
+        resp = self.client.get(EXPORT_URL)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        content = b"".join(resp.streaming_content)
+        self.assertTrue(content == b"" or content.endswith(b"\n"))
+        return [json.loads(line) for line in content.splitlines()]
+
+    @patch("recipe.views.RecipeViewSet.export_chunk_size", 2)
+    def test_export_recipes(self):
+        """Test exporting streams every recipe of the user across chunks."""
+        other_user = create_user(
+            email="other@example.com",
+            password="testpass123",
+        )
+        create_recipe(user=other_user)
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        for _ in range(5):
+            create_recipe(user=self.user).tags.add(tag)
+
+        lines = self._export()
+
+        recipes = Recipe.objects.filter(user=self.user).order_by("-id")
+        serializer = RecipeDetailSerializer(recipes, many=True)
+        self.assertEqual(lines, json.loads(json.dumps(serializer.data)))
+        self.assertEqual(lines[0]["tags"], [{"id": tag.id, "name": "Vegan"}])
+
+    def test_export_no_recipes(self):
+        """Test exporting an empty collection returns no lines."""
+        self.assertEqual(self._export(), [])
+
+    @patch("recipe.views.RecipeViewSet.export_chunk_size", 2)
+    def test_export_asgi(self):
+        """Test the export streams through the ASGI handler."""
+        for _ in range(5):
+            create_recipe(user=self.user)
+        token = Token.objects.create(user=self.user)
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(ASGIHandler())({
+            "type": "http",
+            "method": "GET",
+            "path": EXPORT_URL,
+            "query_string": b"",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"authorization", f"Token {token.key}".encode()),
+            ],
+        }, receive, send)
+
+        self.assertEqual(messages[0]["status"], status.HTTP_200_OK)
+        self.assertEqual(messages[-1], {"type": "http.response.body"})
+        content = b"".join(
+            message.get("body", b"") for message in messages[1:]
+        )
+        recipes = Recipe.objects.filter(user=self.user).order_by("-id")
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            json.loads(json.dumps(
+                RecipeDetailSerializer(recipes, many=True).data,
+            )),
+        )
@@ -1,8 +1,11 @@
 """
 Test for the Tags API.
 """
-from core.models import Tag
+from decimal import Decimal
+
+from core.models import Recipe, Tag
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from recipe.serializers import TagSerializer
@@ -49,6 +52,7 @@ class PrivateTagsAPITests(TestCase):
     """Test authenticated Tags API tests."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = create_user()
         self.client.force_authenticate(self.user)
@@ -64,7 +68,7 @@ class PrivateTagsAPITests(TestCase):
         serializer = TagSerializer(tags, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_tag_list_limited_to_user(self):
         """Test list of tags is limited to logged in user."""
@@ -82,8 +86,8 @@ class PrivateTagsAPITests(TestCase):
         serializer = TagSerializer(tags, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertTrue(len(res.data), 1)
-        self.assertEqual(res.data, serializer.data)
+        self.assertTrue(len(res.data["results"]), 1)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_update_tag(self):
         """Test updating a tab object."""
@@ -102,6 +106,17 @@ class PrivateTagsAPITests(TestCase):
         self.assertEqual(res.data.get("name"), payload.get("name"))
         self.assertEqual(tag.name, payload.get("name"))
 
+    def test_update_tag_duplicate_name_error(self):
+        """Test renaming a tag to an existing tag name returns an error."""
+        Tag.objects.create(user=self.user, name="Dessert")
+        tag = Tag.objects.create(user=self.user, name="After Dinner")
+
+        res = self.client.patch(detail_url(tag.id), {"name": "Dessert"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        tag.refresh_from_db()
+        self.assertEqual(tag.name, "After Dinner")
+
     def test_delete_tag(self):
         """Test deleting a tag is successful."""
         tag = create_tag(user=self.user)
@@ -112,6 +127,87 @@ class PrivateTagsAPITests(TestCase):
         tag_exists = Tag.objects.filter(id=tag.id).exists()
         self.assertFalse(tag_exists)
 
+    def test_list_tags_paginated_by_cursor(self):
+        """Test tags are paged by name with stable cursors."""
+        for name in ["Apple", "Cherry", "Banana", "Date"]:
+            Tag.objects.create(user=self.user, name=name)
+
+        res = self.client.get(TAGS_URL, {"page_size": 3})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        names = [tag["name"] for tag in res.data["results"]]
+
+        res = self.client.get(res.data["next"])
+        names += [tag["name"] for tag in res.data["results"]]
+
+        self.assertIsNone(res.data["next"])
+        self.assertEqual(names, ["Date", "Cherry", "Banana", "Apple"])
+
+    def _create_tags_with_recipes(self, count):
+        """Create count tags used by 0..count-1 recipes respectively."""
+        for i in range(count):
+            tag = Tag.objects.create(user=self.user, name=f"Tag {i:03}")
+            for _ in range(i):
+                recipe = Recipe.objects.create(
+                    user=self.user,
+                    title="Recipe",
+                    time_in_minutes=5,
+                    price=Decimal("1.00"),
+                )
+                recipe.tags.add(tag)
+
+    def test_list_tags_with_counts(self):
+        """Test listing tags with the number of recipes using each."""
+        self._create_tags_with_recipes(3)
+        other = create_user(email="other@example.com")
+        Recipe.objects.create(
+            user=other,
+            title="Other",
+            time_in_minutes=5,
+            price=Decimal("1.00"),
+        ).tags.add(Tag.objects.get(name="Tag 001"))
+
+        res = self.client.get(TAGS_URL, {"with_counts": 1})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        counts = [
+            (tag["name"], tag["recipe_count"]) for tag in res.data["results"]
+        ]
+        self.assertEqual(
+            counts,
+            [("Tag 002", 2), ("Tag 001", 2), ("Tag 000", 0)],
+        )
+
+    def test_filter_tags_assigned_only(self):
+        """Test listing only tags assigned to recipes."""
+        self._create_tags_with_recipes(3)
+
+        for params in [{}, {"with_counts": 1}]:
+            with self.subTest(params=params):
+                res = self.client.get(TAGS_URL, {"assigned_only": 1, **params})
+                names = [tag["name"] for tag in res.data["results"]]
+                self.assertEqual(names, ["Tag 002", "Tag 001"])
+
+    def test_list_tags_with_counts_single_query(self):
+        """Test counts and assigned_only do not run a query per tag."""
+        self._create_tags_with_recipes(10)
+
+        for params in [
+            {"with_counts": 1},
+            {"assigned_only": 1},
+            {"with_counts": 1, "assigned_only": 1},
+        ]:
+            with self.subTest(params=params):
+                cache.clear()
+                with self.assertNumQueries(1):
+                    res = self.client.get(TAGS_URL, params)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_tags_invalid_flag(self):
+        """Test an invalid flag value returns an error."""
+        res = self.client.get(TAGS_URL, {"assigned_only": "yes"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     # def test_create_tag(self):
     #     """Test creating a new tag is successful."""
     #     payload = {
@@ -7,7 +7,7 @@ from django.urls import (
 )
 from rest_framework.routers import DefaultRouter
 
-from recipe import views
+from recipe import async_views, views
 
 router = DefaultRouter()
 router.register('recipes', views.RecipeViewSet)
@@ -16,5 +16,16 @@ router.register('tags', views.TagViewSet)
 app_name = 'recipe'
 
 urlpatterns = [
+    path(
+        'recipes/async/',
+        async_views.recipe_list,
+        name='recipe-list-async',
+    ),
+    path(
+        'recipes/<int:pk>/async/',
+        async_views.recipe_detail,
+        name='recipe-detail-async',
+    ),
+    path('tags/async/', async_views.tag_list, name='tag-list-async'),
     path('', include(router.urls)),
 ]
@@ -1,30 +1,163 @@
 """
 Views for the Recipe APIs.
 """
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import (
+    Count,
+    Exists,
+    OuterRef,
+    prefetch_related_objects,
+)
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    extend_schema,
+    extend_schema_view,
+)
 from rest_framework import (
     viewsets,
     mixins,
+    status,
 )
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from core.asgi import AsyncStreamingHttpResponse
 from core.models import (
     Recipe,
     Tag,
 )
+from core.renderers import NDJSONRenderer
 from recipe import serializers
+from recipe.search import search_recipes
+from recipe.caching import CachedResponseMixin, ConditionalGetMixin
+from recipe.pagination import (
+    RecipeCursorPagination,
+    TagCursorPagination,
+)
+from user.authentication import CachedTokenAuthentication
+
+
+class RowListModelMixin:
+    """
+    List objects by passing value rows to row_serializer_class.
+
+    get_queryset() is expected to return a .values() queryset for the list
+    action.
+    """
+    row_serializer_class = None
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.row_serializer_class(page)
+            return self.get_paginated_response(serializer.data)
 
-class RecipeViewSet(viewsets.ModelViewSet):
+        serializer = self.row_serializer_class(list(queryset))
+        return Response(serializer.data)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'tags',
+                OpenApiTypes.STR,
+                description='Comma separated list of tag IDs to filter',
+            ),
+            OpenApiParameter(
+                'tags_match',
+                OpenApiTypes.STR,
+                enum=['any', 'all'],
+                description='Return recipes with any (default) or all of '
+                            'the tags.',
+            ),
+            OpenApiParameter(
+                'search',
+                OpenApiTypes.STR,
+                description='Full-text search over title and description. '
+                            'Results are ordered by relevance.',
+            ),
+        ]
+    )
+)
+class RecipeViewSet(ConditionalGetMixin,
+                    CachedResponseMixin,
+                    RowListModelMixin,
+                    viewsets.ModelViewSet):
     """View for managing recipe APIs."""
     serializer_class = serializers.RecipeDetailSerializer
+    row_serializer_class = serializers.RecipeRowSerializer
     queryset = Recipe.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecipeCursorPagination
+    bulk_max_items = 1000
+    export_chunk_size = 1000
+
+    def _params_to_ints(self, name, qs):
+        """Convert a list of comma separated ids to integers."""
+        try:
+            return {int(str_id) for str_id in qs.split(',')}
+        except ValueError:
+            raise ValidationError(
+                {name: ['Expected a comma separated list of ids.']}
+            )
+
+    def _filter_tags(self, queryset):
+        """
+        Filter recipes by the tags and tags_match query parameters.
+
+        Both modes filter on a subquery over the recipe/tag through table,
+        so the outer query keeps walking the (user, -id) index used for
+        cursor pagination. "all" groups the matching rows by recipe and
+        keeps the recipes that matched every tag.
+        """
+        tags = self.request.query_params.get('tags')
+        match = self.request.query_params.get('tags_match', 'any')
+        if match not in ('any', 'all'):
+            raise ValidationError({'tags_match': ['Expected any or all.']})
+        if not tags:
+            return queryset
+
+        tag_ids = self._params_to_ints('tags', tags)
+        recipe_tags = Recipe.tags.through.objects.filter(tag_id__in=tag_ids)
+        if match == 'all':
+            recipe_tags = recipe_tags.values('recipe_id').annotate(
+                tag_count=Count('tag_id'),
+            ).filter(tag_count=len(tag_ids))
+        return queryset.filter(id__in=recipe_tags.values('recipe_id'))
+
+    def _search(self, queryset):
+        """Filter and rank recipes by the search query parameter."""
+        query = self.request.query_params.get('search', '').strip()
+        if not query:
+            return queryset
+        return search_recipes(queryset, query)
 
     def get_queryset(self):
         """Retrieve recipes for an authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by('-id')
+        queryset = self.queryset.filter(
+            user=self.request.user,
+        ).order_by('-id')
+
+        if self.action == 'list':
+            queryset = self._filter_tags(queryset)
+            queryset = queryset.values(*self.row_serializer_class.fields)
+            return self._search(queryset)
+
+        if self.action == 'retrieve':
+            fields = self.get_serializer_class().Meta.fields
+            queryset = queryset.only(
+                *[field for field in fields if field != 'tags'],
+            )
+
+        return queryset.prefetch_related(serializers.tags_prefetch())
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
@@ -37,17 +170,208 @@ class RecipeViewSet(viewsets.ModelViewSet):
         """Create a new recipe."""
         serializer.save(user=self.request.user)
 
+    def _get_bulk_instances(self, items):
+        """Return the user's recipes for each item's id and per-item errors."""
+        ids = [item.get('id') if isinstance(item, dict) else None
+               for item in items]
+        found = Recipe.objects.filter(
+            user=self.request.user,
+            id__in=[pk for pk in ids if isinstance(pk, int)],
+        ).in_bulk()
+
+        instances, errors, seen = [], [], set()
+        for pk in ids:
+            if pk in seen:
+                errors.append({'id': ['Duplicate id.']})
+            elif pk not in found:
+                errors.append({'id': ['Recipe not found.']})
+            else:
+                errors.append({})
+                instances.append(found[pk])
+            seen.add(pk)
+        return instances, errors
+
+    @action(detail=False, methods=['post', 'put', 'patch'])
+    def bulk(self, request):
+        """
+        Create (POST) or update (PUT/PATCH, by id) many recipes at once.
+
+        All items are validated first and written in one transaction. The
+        response lists the resulting recipe, or the errors, for each item.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {'non_field_errors': ['Expected a list of items.']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {'non_field_errors': [
+                    f'Ensure there are no more than '
+                    f'{self.bulk_max_items} items.'
+                ]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-class TagViewSet(mixins.DestroyModelMixin,
+        if request.method == 'POST':
+            serializer = self.get_serializer(data=items, many=True)
+            serializer.is_valid(raise_exception=True)
+            recipes = serializer.save(user=request.user)
+            response_status = status.HTTP_201_CREATED
+        else:
+            instances, errors = self._get_bulk_instances(items)
+            if any(errors):
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            serializer = self.get_serializer(
+                instances,
+                data=items,
+                many=True,
+                partial=request.method == 'PATCH',
+            )
+            serializer.is_valid(raise_exception=True)
+            recipes = serializer.save()
+            response_status = status.HTTP_200_OK
+
+        prefetch_related_objects(
+            recipes,
+            serializers.tags_prefetch(),
+        )
+        serializer = self.get_serializer(recipes, many=True)
+        return Response(serializer.data, status=response_status)
+
+    def _export_chunk(self, renderer, last_id):
+        """
+        Return the JSON lines of the recipes after last_id, and the id of
+        the last of them.
+
+        Each chunk is a keyset range on the (user, -id) index with its tags
+        prefetched, so memory use is bounded by the chunk size rather than
+        the size of the collection.
+        """
+        queryset = Recipe.objects.filter(user=self.request.user).order_by(
+            '-id',
+        ).prefetch_related(
+            serializers.tags_prefetch(),
+        )
+        if last_id is not None:
+            queryset = queryset.filter(id__lt=last_id)
+        chunk = list(queryset[:self.export_chunk_size])
+        if not chunk:
+            return [], None
+
+        serializer = serializers.RecipeDetailSerializer(chunk, many=True)
+        lines = [renderer.render_line(data) for data in serializer.data]
+        return lines, chunk[-1].id
+
+    def _export_lines(self, renderer):
+        """Yield one JSON line per recipe, fetching recipes in chunks."""
+        last_id = None
+        while True:
+            lines, last_id = self._export_chunk(renderer, last_id)
+            if not lines:
+                return
+            yield from lines
+
+    async def _export_lines_async(self, renderer):
+        """Yield the export lines, querying each chunk in a thread."""
+        export_chunk = sync_to_async(self._export_chunk)
+        last_id = None
+        while True:
+            lines, last_id = await export_chunk(renderer, last_id)
+            if not lines:
+                return
+            for line in lines:
+                yield line
+
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer])
+    def export(self, request):
+        """
+        Stream all of the user's recipes as newline-delimited JSON.
+
+        Under ASGI the stream is an async iterator, since Django iterates
+        streaming content on the event loop (see core.asgi).
+        """
+        if isinstance(request._request, ASGIRequest):
+            response = AsyncStreamingHttpResponse(
+                self._export_lines_async(request.accepted_renderer),
+                content_type=NDJSONRenderer.media_type,
+            )
+        else:
+            response = StreamingHttpResponse(
+                self._export_lines(request.accepted_renderer),
+                content_type=NDJSONRenderer.media_type,
+            )
+        response['Content-Disposition'] = (
+            'attachment; filename="recipes.ndjson"'
+        )
+        return response
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'assigned_only',
+                OpenApiTypes.INT,
+                enum=[0, 1],
+                description='Filter by tags assigned to recipes.',
+            ),
+            OpenApiParameter(
+                'with_counts',
+                OpenApiTypes.INT,
+                enum=[0, 1],
+                description='Include the number of recipes using each tag.',
+            ),
+        ]
+    )
+)
+class TagViewSet(ConditionalGetMixin,
+                 CachedResponseMixin,
+                 mixins.DestroyModelMixin,
                  mixins.UpdateModelMixin,
+                 mixins.RetrieveModelMixin,
                  mixins.ListModelMixin,
                  viewsets.GenericViewSet):
     """View for managing tag APIs."""
     serializer_class = serializers.TagSerializer
     queryset = Tag.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = TagCursorPagination
+
+    def _flag(self, name):
+        """Return a 0/1 query parameter as a bool."""
+        value = self.request.query_params.get(name, '0')
+        if value not in ('0', '1'):
+            raise ValidationError({name: ['Expected 0 or 1.']})
+        return value == '1'
 
     def get_queryset(self):
-        """Retrieve tags for an authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by('-name')
+        """
+        Retrieve tags for an authenticated user.
+
+        The list counts recipes per tag in the same grouped query when
+        with_counts is set; otherwise assigned_only is an EXISTS check.
+        """
+        queryset = self.queryset.filter(user=self.request.user)
+
+        if self.action == 'list':
+            assigned_only = self._flag('assigned_only')
+            if self._flag('with_counts'):
+                queryset = queryset.annotate(recipe_count=Count('recipe'))
+                if assigned_only:
+                    queryset = queryset.filter(recipe_count__gt=0)
+            elif assigned_only:
+                queryset = queryset.filter(Exists(
+                    Recipe.tags.through.objects.filter(tag_id=OuterRef('pk'))
+                ))
+
+        return queryset.order_by('-name')
+
+    def get_serializer_class(self):
+        """Return the serializer class for request."""
+        if self.action == 'list' and self._flag('with_counts'):
+            return serializers.TagWithCountSerializer
+
+        return self.serializer_class
@@ -0,0 +1,145 @@
+"""
+Async views for the User API.
+
+These mirror CreateUserView and CreateTokenView but await password hashing
+in a process pool (see user.hashing), so under ASGI the event loop keeps
+serving other requests while a login or signup is being hashed. The me view
+serves reads for cached tokens from the event loop.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from core.async_views import async_read_view
+from django.contrib.auth import get_user_model
+from django.http import HttpResponseNotAllowed, JsonResponse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from user.hashing import hash_password, verify_password
+from user.serializers import AuthCredentialsSerializer, UserSerializer
+from user.views import ManageUserView
+
+
+class _ParseError(Exception):
+    pass
+
+
+def _parse_body(request):
+    """Return request data from a JSON or form encoded body."""
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError as exc:
+            raise _ParseError(f"JSON parse error - {exc}")
+    return request.POST
+
+
+def _get_user(email):
+    """Return the user for email, or None if there isn't one."""
+    try:
+        return get_user_model().objects.get(email=email)
+    except get_user_model().DoesNotExist:
+        return None
+
+
+def _save_password(user, encoded):
+    user.password = encoded
+    user.save(update_fields=["password"])
+
+
+def _create_user(validated_data, encoded):
+    """Create a user with an already hashed password."""
+    User = get_user_model()
+    data = dict(validated_data)
+    data.pop("password")
+    data["email"] = User.objects.normalize_email(data["email"])
+    user = User(**data)
+    user.password = encoded
+    user.save()
+    return user
+
+
+def _read_data(request, allowed):
+    if request.method not in allowed:
+        return None, HttpResponseNotAllowed(allowed)
+    try:
+        return _parse_body(request), None
+    except _ParseError as exc:
+        return None, JsonResponse(
+            {"detail": str(exc)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+async def create_token(request):
+    """Create auth token for user."""
+    data, error = _read_data(request, ["POST"])
+    if error:
+        return error
+
+    serializer = AuthCredentialsSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(
+            serializer.errors,
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    email = serializer.validated_data["email"]
+    password = serializer.validated_data["password"]
+    user = await sync_to_async(_get_user)(email)
+    if user is None or not user.is_active:
+        # Hash anyway so unknown and known emails take the same time.
+        await hash_password(password)
+        return JsonResponse(
+            {"non_field_errors": [AuthCredentialsSerializer.error_message]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    is_correct, upgraded = await verify_password(password, user.password)
+    if not is_correct:
+        return JsonResponse(
+            {"non_field_errors": [AuthCredentialsSerializer.error_message]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if upgraded:
+        await sync_to_async(_save_password)(user, upgraded)
+
+    token, _ = await sync_to_async(Token.objects.get_or_create)(user=user)
+    return JsonResponse({"token": token.key})
+
+
+async def create_user(request):
+    """Create a new user in the system."""
+    data, error = _read_data(request, ["POST"])
+    if error:
+        return error
+
+    serializer = UserSerializer(data=data)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(
+            serializer.errors,
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    encoded = await hash_password(serializer.validated_data["password"])
+    user = await sync_to_async(_create_user)(
+        serializer.validated_data,
+        encoded,
+    )
+    return JsonResponse(
+        UserSerializer(user).data,
+        status=status.HTTP_201_CREATED,
+    )
+
+
+def _retrieve_me(view, request):
+    """Serialize the user authenticated from the token cache."""
+    return view.retrieve(request)
+
+
+me = async_read_view(ManageUserView, _retrieve_me)
+
+
+# Token clients do not send CSRF tokens, matching the DRF views. Set the
+# flag directly because csrf_exempt() would hide that these are coroutines.
+create_token.csrf_exempt = True
+create_user.csrf_exempt = True
@@ -0,0 +1,172 @@
+"""
+Authentication classes for the APIs.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+
+CACHE_KEY_PREFIX = "auth-token:"
+
+
+class LRUCache:
+    """Thread-safe LRU cache with a bounded size and a per-entry TTL."""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Cache value under key, evicting the least recently used entry."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._data.clear()
+
+
+class TokenCache:
+    """
+    Cache of token key to (user, token) lookups.
+
+    Entries live in an in-process LRU unless settings.TOKEN_AUTH_CACHE names
+    a Django cache alias, in which case that (shared) cache is used instead.
+    """
+
+    def __init__(self):
+        options = getattr(settings, "TOKEN_AUTH_CACHE", {})
+        self.ttl = options.get("TTL", 60)
+        self.alias = options.get("CACHE_ALIAS")
+        self.local = LRUCache(options.get("MAX_SIZE", 10000), self.ttl)
+
+    def get(self, key):
+        if self.alias:
+            return caches[self.alias].get(CACHE_KEY_PREFIX + key)
+        return self.local.get(key)
+
+    def set(self, key, value):
+        if self.alias:
+            caches[self.alias].set(CACHE_KEY_PREFIX + key, value, self.ttl)
+        else:
+            self.local.set(key, value)
+
+    def delete(self, key):
+        if self.alias:
+            caches[self.alias].delete(CACHE_KEY_PREFIX + key)
+        else:
+            self.local.delete(key)
+
+    def clear(self):
+        if not self.alias:
+            self.local.clear()
+
+
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    """Return the process-wide token cache, creating it on first use."""
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = TokenCache()
+    return _token_cache
+
+
+def invalidate_token(key):
+    """Drop a token key from the authentication cache."""
+    get_token_cache().delete(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication that caches lookups.
+
+    Each token key is resolved to its user with a database query at most
+    once per TTL. Entries are invalidated when the token or its user
+    changes (see user.signals). The in-process LRU can only be invalidated
+    within the process that saw the change, so other processes may serve a
+    stale entry until its TTL expires; configure a shared cache alias when
+    that matters.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cached = cache.get(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(key, (user, token))
+            return (user, token)
+
+        user, token = cached
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _("User inactive or deleted.")
+            )
+        return self._copy(user, token)
+
+    def authenticate_from_cache(self, request):
+        """
+        Return (user, token) for a cached token, or None.
+
+        Never touches the database, so async views can call it on the event
+        loop. None means the request must be authenticated the normal way.
+        """
+        auth = get_authorization_header(request).split()
+        if len(auth) != 2 or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            return None
+
+        cached = get_token_cache().get(key)
+        if cached is None or not cached[0].is_active:
+            return None
+        return self._copy(*cached)
+
+    def _copy(self, user, token):
+        # Hand out copies so a request mutating its user cannot leak
+        # changes into the cache shared with other requests.
+        user = copy.copy(user)
+        token = copy.copy(token)
+        token.user = user
+        return (user, token)
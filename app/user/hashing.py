@@ -0,0 +1,106 @@
+"""
+Password hashing off the event loop.
+
+PBKDF2 pins a CPU for the whole hash, so async views hand the work to a
+bounded process pool and await the result instead of hashing inline.
+
+Workers are started from a fork server rather than forked from the server
+process, which by then runs threads. start_workers() starts them all up
+front; otherwise they start with the first hashes.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker():
+    """Configure Django in pool workers, which start without it."""
+    django.setup()
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        'forkserver' if 'forkserver' in methods else 'spawn',
+    )
+
+
+def get_executor():
+    """
+    Return the process pool used for hashing, creating it on first use.
+
+    Returns None when settings.PASSWORD_HASHING_WORKERS is 0, in which case
+    hashing runs in a worker thread instead.
+    """
+    global _executor
+    workers = settings.PASSWORD_HASHING_WORKERS
+    if not workers:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=_mp_context(),
+                    initializer=_init_worker,
+                )
+    return _executor
+
+
+def start_workers():
+    """
+    Start every worker of the hashing pool and wait until they are ready.
+
+    The pool only starts a worker when a task needs one, so without this
+    the first logins would wait for workers to start and set up Django.
+    """
+    executor = get_executor()
+    if executor is not None:
+        wait([
+            executor.submit(os.getpid)
+            for _ in range(settings.PASSWORD_HASHING_WORKERS)
+        ])
+
+
+def verify(password, encoded):
+    """
+    Check password against encoded.
+
+    Return (is_correct, new_encoded) where new_encoded is a fresh hash when
+    the stored one uses outdated hasher parameters, otherwise None.
+    """
+    upgraded = []
+    is_correct = check_password(
+        password,
+        encoded,
+        setter=lambda raw: upgraded.append(make_password(raw)),
+    )
+    return is_correct, upgraded[0] if upgraded else None
+
+
+async def _run(func, *args):
+    executor = get_executor()
+    if executor is None:
+        return await sync_to_async(func, thread_sensitive=False)(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
+
+
+async def verify_password(password, encoded):
+    """Awaitable version of verify() that runs off the event loop."""
+    return await _run(verify, password, encoded)
+
+
+async def hash_password(password):
+    """Awaitable version of make_password() that runs off the event loop."""
+    return await _run(make_password, password)
@@ -27,8 +27,10 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class AuthTokenSerializer(serializers.Serializer):
-    """Serializer for the user auth token."""
+class AuthCredentialsSerializer(serializers.Serializer):
+    """Serializer for the credentials used to obtain a token."""
+
+    error_message = "Unable to authenticate with provided credentials."
 
     email = serializers.EmailField()
     password = serializers.CharField(
@@ -36,6 +38,10 @@ class AuthTokenSerializer(serializers.Serializer):
         trim_whitespace=False,
     )
 
+
+class AuthTokenSerializer(AuthCredentialsSerializer):
+    """Serializer for the user auth token."""
+
     def validate(self, attrs):
         """Validate and authenticate the user."""
         email = attrs.get("email")
@@ -46,8 +52,10 @@ class AuthTokenSerializer(serializers.Serializer):
             password=password,
         )
         if not user:
-            msg = "Unable to authenticate with provided credentials."
-            raise serializers.ValidationError(msg, code="authorization")
+            raise serializers.ValidationError(
+                self.error_message,
+                code="authorization",
+            )
 
         attrs["user"] = user
         return attrs
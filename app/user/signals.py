@@ -0,0 +1,24 @@
+"""
+Signal handlers for the user app.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user.authentication import invalidate_token
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """Drop a saved, regenerated or deleted token from the auth cache."""
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_cached_user_tokens(sender, instance, **kwargs):
+    """Drop the tokens of a changed or deactivated user from the cache."""
+    keys = Token.objects.filter(user=instance).values_list("key", flat=True)
+    for key in keys:
+        invalidate_token(key)
@@ -0,0 +1,56 @@
+"""
+Benchmark database hits of cached versus uncached token authentication.
+
+Run with: python manage.py test user --pattern="bench_*.py"
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from user.authentication import get_token_cache
+from user.views import ManageUserView
+
+ME_URL = reverse("user:me")
+REQUESTS = 1000
+
+
+class TokenAuthenticationBenchmark(TestCase):
+    """Compare queries per request with and without the token cache."""
+
+    def setUp(self):
+        get_token_cache().clear()
+        user = get_user_model().objects.create_user(
+            email="bench@example.com",
+            password="testpass123",
+        )
+        token = Token.objects.create(user=user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def _queries_per_request(self):
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(REQUESTS):
+                self.client.get(ME_URL)
+        return len(ctx.captured_queries) / REQUESTS
+
+    def test_db_hit_rate(self):
+        with patch.object(
+            ManageUserView,
+            "authentication_classes",
+            [TokenAuthentication],
+        ):
+            before = self._queries_per_request()
+        after = self._queries_per_request()
+
+        print(
+            f"\nToken auth over {REQUESTS} requests: "
+            f"{before:.3f} queries/request uncached, "
+            f"{after:.3f} queries/request cached"
+        )
+        self.assertLess(after, before)
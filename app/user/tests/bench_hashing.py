@@ -0,0 +1,60 @@
+"""
+Benchmark concurrent logins on the sync and async token endpoints.
+
+Both endpoints are driven through Django's ASGI request handling, where sync
+views share a single thread while the async view hashes in a process pool.
+
+Run with: python manage.py test user --pattern="bench_*.py"
+"""
+import asyncio
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from user.hashing import start_workers
+
+TOKEN_URL = reverse("user:token")
+TOKEN_ASYNC_URL = reverse("user:token-async")
+CONCURRENCY = 32
+
+
+class LoginConcurrencyBenchmark(TestCase):
+    """Compare logins per second of the sync and async token views."""
+
+    def setUp(self):
+        get_user_model().objects.create_user(
+            email="bench@example.com",
+            password="testpass123",
+        )
+        self.payload = {
+            "email": "bench@example.com",
+            "password": "testpass123",
+        }
+        start_workers()
+
+    async def _logins_per_second(self, url):
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            self.async_client.post(
+                url,
+                self.payload,
+                content_type="application/json",
+            )
+            for _ in range(CONCURRENCY)
+        ])
+        elapsed = time.perf_counter() - start
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+        return CONCURRENCY / elapsed
+
+    async def test_login_throughput(self):
+        await self._logins_per_second(TOKEN_ASYNC_URL)
+
+        sync_rate = await self._logins_per_second(TOKEN_URL)
+        async_rate = await self._logins_per_second(TOKEN_ASYNC_URL)
+
+        print(
+            f"\n{CONCURRENCY} concurrent logins: "
+            f"sync {sync_rate:.1f}/s, async {async_rate:.1f}/s"
+        )
@@ -0,0 +1,135 @@
+"""
+Tests for the cached token authentication.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from user.authentication import LRUCache, get_token_cache
+
+ME_URL = reverse("user:me")
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Test the bounded LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry is evicted when full."""
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    @patch("user.authentication.time.monotonic")
+    def test_entries_expire(self, patched_monotonic):
+        """Test entries are not returned after their TTL."""
+        patched_monotonic.return_value = 100
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+
+        patched_monotonic.return_value = 159
+        self.assertEqual(cache.get("a"), 1)
+        patched_monotonic.return_value = 160
+        self.assertIsNone(cache.get("a"))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating API requests with cached tokens."""
+
+    def setUp(self):
+        get_token_cache().clear()
+        self.user = create_user(
+            email="test@example.com",
+            password="testpass123",
+            name="Test Name",
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_token_lookup_cached(self):
+        """Test the token is only looked up on the first request."""
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_invalid_token_rejected(self):
+        """Test an unknown token is rejected."""
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_rejected(self):
+        """Test a cached token stops working once deleted."""
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_regenerated_token(self):
+        """Test the old key is rejected after regenerating a token."""
+        self.client.get(ME_URL)
+        old_key = self.token.key
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {new_token.key}")
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(old_key, new_token.key)
+
+    def test_deactivated_user_rejected(self):
+        """Test a cached token stops working once its user is inactive."""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_changed_user_refreshed(self):
+        """Test changes to the user are visible on the next request."""
+        self.client.get(ME_URL)
+        self.user.name = "New Name"
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data["name"], "New Name")
+
+    def test_update_profile_does_not_leak_into_cache(self):
+        """Test a rejected update leaves the cached user untouched."""
+        self.client.get(ME_URL)
+
+        res = self.client.patch(ME_URL, {"name": "New", "password": "x"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.data["name"], "Test Name")
@@ -0,0 +1,38 @@
+"""
+Tests for the password hashing pool.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import check_password
+from django.test import SimpleTestCase, override_settings
+from user import hashing
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=2)
+class HashingPoolTests(SimpleTestCase):
+    """Test starting and using the hashing pool."""
+
+    def setUp(self):
+        patcher = patch("user.hashing._executor", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_start_workers(self):
+        """Test every worker is started up front, without forking."""
+        hashing.start_workers()
+        executor = hashing.get_executor()
+        self.addCleanup(executor.shutdown)
+
+        self.assertEqual(len(executor._processes), 2)
+        self.assertNotEqual(
+            executor._mp_context.get_start_method(), "fork",
+        )
+        encoded = executor.submit(hashing.make_password, "pass").result()
+        self.assertTrue(check_password("pass", encoded))
+
+    @override_settings(PASSWORD_HASHING_WORKERS=0)
+    def test_no_workers(self):
+        """Test nothing is started when hashing runs in threads."""
+        hashing.start_workers()
+
+        self.assertIsNone(hashing.get_executor())
@@ -5,11 +5,16 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
+from user.authentication import get_token_cache
 
 CREATE_USER_URL = reverse("user:create")
 TOKEN_URL = reverse("user:token")
 ME_URL = reverse("user:me")
+CREATE_USER_ASYNC_URL = reverse("user:create-async")
+TOKEN_ASYNC_URL = reverse("user:token-async")
+ME_ASYNC_URL = reverse("user:me-async")
 
 
 def create_user(**params):
@@ -156,3 +161,141 @@ class PrivateUserApiTest(TestCase):
         self.assertEqual(self.user.name, payload.get("name"))
         self.assertTrue(self.user.check_password(payload.get("password")))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class CachedUserUpdateTests(TestCase):
+    """Test updates through token authentication served from its cache."""
+
+    def test_update_does_not_save_cached_user(self):
+        """Test columns changed elsewhere are not overwritten by an update."""
+        user = create_user(email="test@example.com", password="testpass123")
+        token = Token.objects.create(user=user)
+        get_token_cache().clear()
+        self.addCleanup(get_token_cache().clear)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        client.get(ME_URL)
+
+        # Another process changes the password; this one's cache is stale.
+        user.set_password("changedpass123")
+        get_user_model().objects.filter(pk=user.pk).update(
+            password=user.password,
+        )
+        res = client.patch(ME_URL, {"name": "New Name"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertEqual(user.name, "New Name")
+        self.assertTrue(user.check_password("changedpass123"))
+
+
+class AsyncUserAPITests(TestCase):
+    """Test the async signup and token endpoints."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_create_user_success(self):
+        """Test creating user is successful."""
+        payload = {
+            "email": "test@EXAMPLE.com",
+            "password": "testpass123",
+            "name": "Test Name",
+        }
+        res = self.client.post(CREATE_USER_ASYNC_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        user = get_user_model().objects.get(email="test@example.com")
+        self.assertTrue(user.check_password(payload.get("password")))
+        self.assertEqual(
+            res.json(),
+            {"email": "test@example.com", "name": "Test Name"},
+        )
+
+    def test_create_user_invalid(self):
+        """Test signup validation matches the sync endpoint."""
+        create_user(email="test@example.com", password="testpass123")
+        for payload in [
+            {"email": "test@example.com", "password": "testpass123"},
+            {"email": "new@example.com", "password": "test"},
+        ]:
+            res = self.client.post(CREATE_USER_ASYNC_URL, payload)
+            sync_res = self.client.post(CREATE_USER_URL, payload)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(res.json(), sync_res.json())
+
+    def test_create_token_for_user(self):
+        """Test a token is returned for valid credentials."""
+        user = create_user(email="user@example.com", password="testpass123")
+        payload = {"email": "user@example.com", "password": "testpass123"}
+
+        res = self.client.post(TOKEN_ASYNC_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {"token": user.auth_token.key})
+        self.assertEqual(
+            self.client.post(TOKEN_URL, payload).json(),
+            res.json(),
+        )
+
+    def test_create_token_bad_credentials(self):
+        """Test errors match the sync endpoint for bad credentials."""
+        create_user(email="user@example.com", password="goodpass")
+        for payload in [
+            {"email": "user@example.com", "password": "badpass"},
+            {"email": "unknown@example.com", "password": "goodpass"},
+            {"email": "user@example.com", "password": ""},
+        ]:
+            res = self.client.post(TOKEN_ASYNC_URL, payload)
+            sync_res = self.client.post(TOKEN_URL, payload)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(res.json(), sync_res.json())
+
+    def test_create_token_inactive_user(self):
+        """Test inactive users cannot obtain a token."""
+        create_user(
+            email="user@example.com",
+            password="testpass123",
+            is_active=False,
+        )
+        payload = {"email": "user@example.com", "password": "testpass123"}
+
+        res = self.client.post(TOKEN_ASYNC_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_not_allowed(self):
+        """Test only POST is accepted."""
+        res = self.client.get(TOKEN_ASYNC_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_me_async(self):
+        """Test the async me view matches the sync view without queries."""
+        user = create_user(
+            email="user@example.com",
+            password="testpass123",
+            name="Test Name",
+        )
+        token = Token.objects.create(user=user)
+        get_token_cache().clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        cold = self.client.get(ME_ASYNC_URL)
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_ASYNC_URL)
+        sync_res = self.client.get(ME_URL)
+
+        for response in [cold, res]:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.content, sync_res.content)
+            self.assertEqual(response["Allow"], sync_res["Allow"])
+
+        res = self.client.patch(ME_ASYNC_URL, {"name": "New Name"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.get(ME_ASYNC_URL).json()["name"],
+            "New Name",
+        )
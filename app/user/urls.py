@@ -3,7 +3,7 @@ URL mappings for the User API.
 """
 from django.urls import path
 
-from user import views
+from user import async_views, views
 
 app_name = 'user'
 
@@ -12,4 +12,7 @@ urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
     path('token/', views.CreateTokenView.as_view(), name='token'),
     path('me/', views.ManageUserView.as_view(), name='me'),
+    path('create/async/', async_views.create_user, name='create-async'),
+    path('token/async/', async_views.create_token, name='token-async'),
+    path('me/async/', async_views.me, name='me-async'),
 ]
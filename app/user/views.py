@@ -1,9 +1,11 @@
 """
 Views for the User API.
 """
-from rest_framework import authentication, generics, permissions
+from django.contrib.auth import get_user_model
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
+from user.authentication import CachedTokenAuthentication
 from user.serializers import AuthTokenSerializer, UserSerializer
 
 
@@ -24,9 +26,13 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     """Manage the authenticated user."""
 
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
         """Retrieve and return the authenticated user."""
-        return self.request.user
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.request.user
+        # The authenticated user can be a cached copy that misses changes
+        # made by other processes, so updates start from the stored row.
+        return get_user_model().objects.get(pk=self.request.user.pk)